@@ -9,6 +9,12 @@ def tests(session):
     session.run("coverage", "report")
 
 
+@nox.session(python=["3.8"])
+def perftests(session):
+    args = session.posargs or ["./tests/azure-ml/perftests/"]
+    session.run("pytest", *args)
+
+
 @nox.session(python=["3.8", "3.7", "3.6"])
 def mypy(session):
     session.run("python", "./scripts/run_mypy.py", "-s", "src/azure-ml/azure/")
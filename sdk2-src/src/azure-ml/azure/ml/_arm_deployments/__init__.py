@@ -4,9 +4,22 @@
 
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)  # type: ignore
 
+from typing import TYPE_CHECKING
 
-from .arm_deployment_executor import ArmDeploymentExecutor
-from .online_endpoint_arm_generator import OnlineEndpointArmGenerator
+from azure.ml._utils._lazy_import import lazy_exports
 
+# the same names, for type checkers and IDEs
+if TYPE_CHECKING:
+    from .arm_deployment_executor import ArmDeploymentExecutor
+    from .online_endpoint_arm_generator import OnlineEndpointArmGenerator
+
+# the resource management client is imported when a deployment is first made
+lazy_exports(
+    __name__,
+    {
+        "ArmDeploymentExecutor": ".arm_deployment_executor",
+        "OnlineEndpointArmGenerator": ".online_endpoint_arm_generator",
+    },
+)
 
 __all__ = ["ArmDeploymentExecutor", "OnlineEndpointArmGenerator"]
@@ -4,11 +4,12 @@
 
 from typing import Dict, Any
 from azure.ml._vendor.azure_resources._resource_management_client import ResourceManagementClient
-from azure.identity import ChainedTokenCredential
+from azure.core.credentials import TokenCredential
 import logging
 from azure.ml._vendor.azure_resources.models import DeploymentProperties, Deployment
 import time
 from azure.ml.constants import ArmConstants
+from azure.ml._utils._http_utils import get_shared_transport
 
 
 module_logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ module_logger = logging.getLogger(__name__)
 
 class ArmDeploymentExecutor(object):
     def __init__(
-        self, credentials: ChainedTokenCredential, resource_group_name: str, subscription_id: str, deployment_name: str
+        self, credentials: TokenCredential, resource_group_name: str, subscription_id: str, deployment_name: str
     ):
         self._credentials = credentials
         self._subscription_id = subscription_id
@@ -26,6 +27,7 @@ class ArmDeploymentExecutor(object):
             credential=self._credentials,
             subscription_id=self._subscription_id,
             api_version=ArmConstants.AZURE_MGMT_RESOURCE_API_VERSION,
+            transport=get_shared_transport(),
         )
         self._deployment_operations_client = self._client.deployment_operations
         self._deployments_client = self._client.deployments
@@ -24,7 +24,6 @@ from azure.ml._workspace_dependent_operations import OperationsContainer, Worksp
 from azure.ml._operations.operation_orchestrator import OperationOrchestrator
 from azure.ml.constants import ArmConstants, OperationTypes
 from azure.ml._restclient.machinelearningservices.models import AssetPath
-import uuid
 
 
 class OnlineEndpointArmGenerator(object):
@@ -65,8 +64,6 @@ class OnlineEndpointArmGenerator(object):
             code = deployment.code_configuration.code
             if isinstance(code, InternalCodeAsset):
                 code_obj = {}
-                if not code.name:
-                    code.name = str(uuid.uuid4())
                 code_obj[ArmConstants.NAME] = code.name
                 if not code.version:
                     code.version = default_code_version
@@ -7,19 +7,32 @@ from typing import Optional, Dict, Union, Tuple
 from pathlib import Path
 
 from azure.ml._utils._storage_utils import get_storage_client
-from azure.ml._restclient.machinelearningservices.models import AssetPath
+from azure.ml._restclient.machinelearningservices.models import AssetPath, DatastorePropertiesResource
 from azure.ml._operations import DatastoreOperations
 from azure.ml._utils._arm_id_utils import get_datastore_arm_id
 from azure.ml._utils._asset_utils import _validate_path, get_object_hash, AssetNotChangedError
+from azure.ml._utils._ignore_file import IgnoreFile
 from azure.ml._workspace_dependent_operations import WorkspaceScope
+from azure.ml._artifacts.constants import DEDUPE_ENV_VAR, MAX_CONCURRENCY
+from azure.ml._artifacts._transfer_metrics import TransferMetrics
+
+
+def use_upload_dedupe(dedupe: Optional[bool] = None) -> bool:
+    """Returns whether unchanged directory files are copied on the service side, defaulting to AZUREML_UPLOAD_DEDUPE"""
+    if dedupe is None:
+        return os.environ.get(DEDUPE_ENV_VAR, "").lower() in ("1", "true")
+    return dedupe
 
 
 def get_datastore_info(operations: DatastoreOperations, name: str) -> Dict[str, str]:
     """
     Get datastore account, type, and auth information
     """
+    return _get_datastore_info(operations.show(name, include_secrets=True))
+
+
+def _get_datastore_info(datastore_resource: DatastorePropertiesResource) -> Dict[str, str]:
     datastore_info = {}
-    datastore_resource = operations.show(name, include_secrets=True)
     storage_section = datastore_resource.properties.contents.azure_storage
     credentials = storage_section.credentials
     datastore_info["storage_type"] = str(datastore_resource.properties.contents.type)
@@ -32,22 +45,36 @@ def get_datastore_info(operations: DatastoreOperations, name: str) -> Dict[str,
 
 def upload_artifact(local_path: str, datastore_operation: DatastoreOperations,
                     datastore_name: Optional[str], asset_hash: str = None, show_progress: bool = True,
-                    include_container_in_asset_path: bool = True) -> AssetPath:
+                    include_container_in_asset_path: bool = True,
+                    max_concurrency: int = MAX_CONCURRENCY, snapshot: bool = False,
+                    metrics: Optional[TransferMetrics] = None, ignore_file: Optional[IgnoreFile] = None,
+                    dedupe: Optional[bool] = None) -> AssetPath:
     """
     Upload local file or directory to datastore
+
+    With `snapshot`, a directory is uploaded as a single compressed archive and the returned asset
+    path points at that archive. With `metrics`, the bytes, duration and retries of every uploaded
+    file are recorded, see TransferMetrics. Files of a directory excluded by `ignore_file`, which
+    defaults to its .amlignore file, are not uploaded. With `dedupe` (it defaults to the
+    AZUREML_UPLOAD_DEDUPE environment variable), files of a directory whose content the blob container
+    already holds are copied on the service side instead of being uploaded again.
     """
     datastore_info = get_datastore_info(datastore_operation, datastore_name)
     storage_client = get_storage_client(**datastore_info)
-    uploaded_asset_id = storage_client.upload(local_path, asset_hash=asset_hash, show_progress=show_progress)
+    uploaded_asset_id = storage_client.upload(local_path, asset_hash=asset_hash, show_progress=show_progress,
+                                              max_concurrency=max_concurrency, snapshot=snapshot,
+                                              metrics=metrics, ignore_file=ignore_file,
+                                              dedupe=use_upload_dedupe(dedupe))
+    is_directory = os.path.isdir(local_path) and not snapshot
 
     # work around a bug in MFE that requires some asset paths to include the container name
     # and others to exclude it
     if include_container_in_asset_path:
         asset_path = AssetPath(
-            path=f'{datastore_info["container_name"]}/{uploaded_asset_id}', is_directory=os.path.isdir(local_path)
+            path=f'{datastore_info["container_name"]}/{uploaded_asset_id}', is_directory=is_directory
         )
     else:
-        asset_path = AssetPath(path=f"{uploaded_asset_id}", is_directory=os.path.isdir(local_path))
+        asset_path = AssetPath(path=f"{uploaded_asset_id}", is_directory=is_directory)
 
     return asset_path
 
@@ -55,13 +82,40 @@ def upload_artifact(local_path: str, datastore_operation: DatastoreOperations,
 def _upload_to_datastore(workspace_scope: WorkspaceScope, datastore_operation: DatastoreOperations,
                          path: Union[str, Path, os.PathLike], datastore_name: str = None,
                          show_progress: bool = True,
-                         include_container_in_asset_path: bool = False) -> Tuple[AssetPath, str]:
+                         include_container_in_asset_path: bool = False,
+                         max_concurrency: int = MAX_CONCURRENCY, snapshot: bool = False,
+                         asset_hash: Optional[str] = None,
+                         ignore_file: Optional[IgnoreFile] = None,
+                         dedupe: Optional[bool] = None) -> Tuple[AssetPath, str]:
+    """
+    Upload local file or directory to datastore, once per content for the lifetime of the datastore operations
+
+    The result is remembered by resolved local path and content hash, so another upload of the same
+    unchanged path to the same datastore returns the first asset path without uploading again.
+    """
     _validate_path(path)
     datastore_name = datastore_name or datastore_operation.get_default().name
-    asset_hash = get_object_hash(path)
-    asset_path = upload_artifact(str(path), datastore_operation, datastore_name,
-                                 show_progress=show_progress,
-                                 asset_hash=asset_hash,
-                                 include_container_in_asset_path=include_container_in_asset_path)
-    datastore_resource_id = get_datastore_arm_id(datastore_name, workspace_scope)
-    return asset_path, datastore_resource_id
+    asset_hash = asset_hash or get_object_hash(path, ignore_file=ignore_file)
+
+    def upload() -> Tuple[AssetPath, str]:
+        asset_path = upload_artifact(str(path), datastore_operation, datastore_name,
+                                     show_progress=show_progress,
+                                     asset_hash=asset_hash,
+                                     include_container_in_asset_path=include_container_in_asset_path,
+                                     max_concurrency=max_concurrency,
+                                     snapshot=snapshot,
+                                     ignore_file=ignore_file,
+                                     dedupe=dedupe)
+        return asset_path, get_datastore_arm_id(datastore_name, workspace_scope)
+
+    memo_key = (
+        workspace_scope.subscription_id,
+        workspace_scope.resource_group_name,
+        workspace_scope.workspace_name,
+        datastore_name,
+        str(Path(path).resolve()),
+        asset_hash,
+        include_container_in_asset_path,
+        snapshot,
+    )
+    return datastore_operation._upload_memo.get_or_load(memo_key, upload)
@@ -0,0 +1,247 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import IO, Any, Callable, Optional, cast
+
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline import PipelineResponse
+from azure.core.pipeline.transport import HttpResponse
+
+from azure.ml._artifacts.constants import (
+    ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR,
+    ADAPTIVE_CONCURRENCY_MAX,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_SIZE_FLOOR,
+    LATENCY_SPIKE_FACTOR,
+    THROTTLE_BACKOFF_MAX_SECONDS,
+    THROTTLE_BACKOFF_SECONDS,
+    THROTTLE_MAX_ATTEMPTS,
+    THROTTLE_STATUS_CODES,
+    THROUGHPUT_TOLERANCE,
+    UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR,
+)
+
+module_logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyController(object):
+    """Additive-increase/multiplicative-decrease limit on the number of concurrent storage requests.
+
+    The limit grows by one each time a window of `limit` requests completes without the throughput
+    dropping compared to the previous window. It is halved, at most once per backoff period, when
+    the service throttles (429/503) or when a request takes LATENCY_SPIKE_FACTOR times longer per
+    byte than the recent average. While throttled, no new request starts until the Retry-After
+    time of the response, or an exponential backoff if there is none, has passed.
+
+    With `max_bytes_per_second`, the bytes sent through `consume` or a `throttled_reader` are
+    additionally capped to that rate.
+    """
+
+    def __init__(self, initial_limit: int, min_limit: int = 1, max_limit: int = ADAPTIVE_CONCURRENCY_MAX,
+                 max_bytes_per_second: Optional[int] = None, max_attempts: int = THROTTLE_MAX_ATTEMPTS):
+        self._min_limit = max(1, min_limit)
+        self._max_limit = max(self._min_limit, max_limit)
+        self._limit = float(min(max(initial_limit, self._min_limit), self._max_limit))
+        self._max_attempts = max_attempts
+        self._rate_limiter = RateLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._decrease_allowed_at = 0.0
+        self._consecutive_throttles = 0
+        self._cost_average = None  # type: Optional[float]
+        self._cost_samples = 0
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_completions = 0
+        self._last_window_throughput = None  # type: Optional[float]
+        self.throttle_count = 0
+
+    @classmethod
+    def from_environment(cls, initial_limit: int) -> "AdaptiveConcurrencyController":
+        """Returns a controller configured by AZUREML_DISABLE_ADAPTIVE_CONCURRENCY and
+        AZUREML_UPLOAD_MAX_BYTES_PER_SECOND. A disabled controller keeps the limit at `initial_limit`.
+        """
+        max_bytes_per_second = int(os.environ.get(UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR) or 0) or None
+        if os.environ.get(ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR, "").lower() in ("1", "true"):
+            return cls(initial_limit, min_limit=initial_limit, max_limit=initial_limit,
+                       max_bytes_per_second=max_bytes_per_second)
+        return cls(initial_limit, max_bytes_per_second=max_bytes_per_second)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def max_limit(self) -> int:
+        return self._max_limit
+
+    def acquire(self) -> None:
+        """Blocks until a request may start"""
+        with self._condition:
+            while True:
+                wait_time = self._resume_at - time.monotonic()
+                if wait_time > 0:
+                    self._condition.wait(wait_time)
+                elif self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                else:
+                    self._condition.wait()
+
+    def release(self, nbytes: int = 0, duration: Optional[float] = None, throttled: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """Ends a request started with acquire and feeds its outcome back into the limit
+
+        :param duration: Duration of a successful request. Failed requests pass None and only free their slot.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                self._on_throttled(retry_after)
+            elif duration is not None:
+                self._on_success(nbytes, duration)
+            self._condition.notify_all()
+
+    def run(self, func: Callable[[], Any], nbytes: int = 0) -> Any:
+        """Runs func in a request slot, retrying it after a backoff when the service throttles it"""
+        for attempt in range(1, self._max_attempts + 1):
+            self.acquire()
+            start = time.monotonic()
+            try:
+                result = func()
+            except HttpResponseError as e:
+                if e.status_code in THROTTLE_STATUS_CODES and attempt < self._max_attempts:
+                    self.release(throttled=True, retry_after=get_retry_after(cast(Optional[HttpResponse], e.response)))
+                    module_logger.debug("Storage request throttled (%s), retrying: %s", e.status_code, e)
+                    continue
+                self.release()
+                raise
+            except BaseException:
+                self.release()
+                raise
+            self.release(nbytes, time.monotonic() - start)
+            return result
+
+    def on_response(self, pipeline_response: PipelineResponse) -> None:
+        """Response hook for storage SDK calls (raw_response_hook), called for every attempt of a request"""
+        http_response = pipeline_response.http_response
+        if http_response.status_code in THROTTLE_STATUS_CODES:
+            with self._condition:
+                self._on_throttled(get_retry_after(http_response))
+                self._condition.notify_all()
+
+    def consume(self, nbytes: int) -> None:
+        """Waits until nbytes may be sent under the bytes per second cap"""
+        if self._rate_limiter is not None:
+            self._rate_limiter.consume(nbytes)
+
+    def throttled_reader(self, stream: IO[bytes]) -> IO[bytes]:
+        """Wraps a binary stream so that reading from it counts against the bytes per second cap"""
+        if self._rate_limiter is None:
+            return stream
+        # the storage SDKs only read, seek and tell on the streams they upload
+        return cast(IO[bytes], _ThrottledReader(stream, self._rate_limiter))
+
+    def _on_throttled(self, retry_after: Optional[float]) -> None:
+        now = time.monotonic()
+        self.throttle_count += 1
+        self._consecutive_throttles += 1
+        if retry_after is None:
+            retry_after = min(THROTTLE_BACKOFF_SECONDS * 2 ** (self._consecutive_throttles - 1),
+                              THROTTLE_BACKOFF_MAX_SECONDS)
+        self._resume_at = max(self._resume_at, now + retry_after)
+        self._decrease(now, retry_after)
+
+    def _on_success(self, nbytes: int, duration: float) -> None:
+        now = time.monotonic()
+        self._consecutive_throttles = 0
+
+        cost = duration / max(nbytes, LATENCY_SIZE_FLOOR)
+        if self._cost_average is not None and self._cost_samples >= LATENCY_MIN_SAMPLES \
+                and cost > LATENCY_SPIKE_FACTOR * self._cost_average:
+            self._decrease(now, THROTTLE_BACKOFF_SECONDS)
+        self._cost_average = cost if self._cost_average is None else 0.8 * self._cost_average + 0.2 * cost
+        self._cost_samples += 1
+
+        self._window_bytes += nbytes
+        self._window_completions += 1
+        if self._window_completions >= int(self._limit):
+            throughput = self._window_bytes / max(now - self._window_start, 1e-6)
+            last_throughput = self._last_window_throughput
+            if last_throughput is None or throughput >= last_throughput * (1 - THROUGHPUT_TOLERANCE):
+                self._limit = min(self._limit + 1, self._max_limit)
+            self._last_window_throughput = throughput
+            self._window_start = now
+            self._window_bytes = 0
+            self._window_completions = 0
+
+    def _decrease(self, now: float, backoff: float) -> None:
+        # the requests in flight when the service pushed back all see it, so only the first one counts
+        if now < self._decrease_allowed_at:
+            return
+        self._limit = max(self._limit / 2, self._min_limit)
+        self._decrease_allowed_at = now + max(backoff, THROTTLE_BACKOFF_SECONDS)
+        self._last_window_throughput = None
+        module_logger.debug("Reduced storage request concurrency to %d", int(self._limit))
+
+
+class RateLimiter(object):
+    """Token bucket capping a byte rate, with up to one second worth of burst"""
+
+    def __init__(self, bytes_per_second: int):
+        self._rate = float(bytes_per_second)
+        self._tokens = self._rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= nbytes
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / self._rate)
+
+
+class _ThrottledReader(object):
+    def __init__(self, stream: IO[bytes], rate_limiter: RateLimiter):
+        self._stream = stream
+        self._rate_limiter = rate_limiter
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._rate_limiter.consume(len(data))
+        return data
+
+    def seekable(self) -> bool:
+        return self._stream.seekable()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._stream.tell()
+
+
+def get_retry_after(response: Optional[HttpResponse]) -> Optional[float]:
+    """Returns the delay requested by the Retry-After header of a response, in seconds"""
+    value = response.headers.get("Retry-After") if response is not None and response.headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -2,35 +2,99 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
-import time
+import json
+import logging
+import math
 import os
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, Iterator, Optional, Set
 from tqdm import tqdm
 from pathlib import PurePosixPath, Path
 
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import (
+    BlobServiceClient,
+    BlobClient,
+    BlobBlock,
+    BlobProperties,
+    BlobSasPermissions,
+    ContentSettings,
+    generate_blob_sas,
+)
 from azure.core.exceptions import ResourceNotFoundError
-from azure.ml._utils._asset_utils import generate_asset_id, traverse_directory, AssetNotChangedError
-from azure.ml._artifacts.constants import UPLOAD_CONFIRMATION
+from azure.ml._utils._asset_utils import (
+    generate_asset_id,
+    get_directory_upload_paths,
+    AssetNotChangedError,
+    _get_file_digest,
+)
+from azure.ml._utils._hash_index import get_hash_index
+from azure.ml._utils._ignore_file import IgnoreFile
+from azure.ml._artifacts._concurrency_controller import AdaptiveConcurrencyController
+from azure.ml._artifacts._snapshot import SnapshotArchive, get_snapshot_path
+from azure.ml._artifacts._transfer_metrics import DOWNLOAD, UPLOAD, FileTransfer, TransferMetrics
+from azure.ml._artifacts._upload_journal import UploadJournal
+from azure.ml._artifacts.constants import (
+    UPLOAD_CONFIRMATION,
+    MAX_CONCURRENCY,
+    BLOCK_UPLOAD_THRESHOLD,
+    BLOB_BLOCK_SIZE,
+    AZ_ML_ARTIFACT_DIRECTORY,
+    CONTENT_DIRECTORY,
+    MANIFEST_DIRECTORY,
+    CONTENT_POINTER_METADATA_KEY,
+    DEDUPE_MIN_FILE_SIZE,
+    SYNC_COPY_MAX_SIZE,
+    COPY_POLL_INTERVAL_SECONDS,
+    COPY_SOURCE_SAS_EXPIRY_SECONDS,
+)
+
+module_logger = logging.getLogger(__name__)
 
 
 class DefaultStorageClient:
-    def __init__(self, credential: str, container_name: str, account_url: str):
-        self.service_client = BlobServiceClient(account_url=account_url, credential=credential)
+    def __init__(self, credential: str, container_name: str, account_url: str,
+                 service_client: Optional[BlobServiceClient] = None):
+        self.service_client = service_client or BlobServiceClient(account_url=account_url, credential=credential)
         self.container_client = self.service_client.get_container_client(container=container_name)
         self.container = container_name
         self.total_file_count = 1
         self.uploaded_file_count = 0
         self.overwrite = False
         self.indicator_file = None
+        self._count_lock = threading.Lock()
+        self._manifest = {}  # type: Dict[str, Dict[str, object]]
+        self._new_contents = {}  # type: Dict[str, str]
+        self._controller = None  # type: Optional[AdaptiveConcurrencyController]
+        self._metrics = None  # type: Optional[TransferMetrics]
 
-    def upload(self, source: str, asset_hash: str = None, show_progress: bool = True) -> str:
+    def upload(self, source: str, asset_hash: str = None, show_progress: bool = True,
+               max_concurrency: int = MAX_CONCURRENCY, dedupe: bool = False, snapshot: bool = False,
+               metrics: Optional[TransferMetrics] = None, ignore_file: Optional[IgnoreFile] = None) -> str:
         """
         Upload a file or directory to a path inside the container
+
+        :param max_concurrency: Number of parallel connections used to upload. Files of a directory are
+            uploaded by a pool of this many workers; a single file is uploaded in this many chunks at a time.
+        :param dedupe: Copy files of a directory whose content the container already holds on the service side
+            instead of uploading them again, and record a manifest of the uploaded directory.
+        :param snapshot: Upload a directory as a single compressed archive, see SnapshotArchive.
+            The returned path is then the path of the archive blob.
+        :param metrics: Records the bytes, duration and retries of every file that is uploaded.
+        :param ignore_file: Files of a directory excluded from the upload, defaults to its .amlignore file.
+
+        The number of files or blocks uploaded at once starts at `max_concurrency` and is then adapted
+        to the throughput and throttling of the storage account, see AdaptiveConcurrencyController.
         """
         asset_id = generate_asset_id(asset_hash, include_directory=True)
         source_name = Path(source).name
-        dest = str(PurePosixPath(asset_id, source_name))
+        snapshot = snapshot and os.path.isdir(source)
+        self._controller = AdaptiveConcurrencyController.from_environment(max_concurrency)
+        self._metrics = metrics
+        dest = get_snapshot_path(asset_id, source_name) if snapshot else str(PurePosixPath(asset_id, source_name))
 
         try:
             # truncate path longer than 50 chars for terminal display
@@ -40,73 +104,345 @@ class DefaultStorageClient:
                 formatted_path = source_name
             msg = f"Uploading {formatted_path}"
 
-            if os.path.isdir(source):
-                self.upload_dir(source, asset_id, msg, show_progress)
+            if snapshot:
+                self.indicator_file = dest
+                self.check_blob_exists()
+                self.upload_snapshot(source, dest, msg, show_progress, max_concurrency=max_concurrency,
+                                     ignore_file=ignore_file)
+            elif os.path.isdir(source):
+                self.upload_dir(source, asset_id, msg, show_progress, max_concurrency=max_concurrency, dedupe=dedupe,
+                                ignore_file=ignore_file)
             else:
                 self.indicator_file = dest
                 self.check_blob_exists()
-                self.upload_file(source, dest, msg, show_progress)
+                self.upload_file(source, dest, msg, show_progress, max_concurrency=max_concurrency)
 
             # upload must be completed before we try to generate confirmation file
-            while self.uploaded_file_count < self.total_file_count:
-                time.sleep(0.5)
+            if self.uploaded_file_count < self.total_file_count:
+                raise Exception(
+                    f"Upload of {source} did not complete: {self.uploaded_file_count} of "
+                    f"{self.total_file_count} files uploaded."
+                )
+            if self._manifest:
+                self._write_manifest(asset_id)
             self._set_confirmation_metadata()
+            # pointers are only published once the blobs they point to are confirmed
+            self._write_content_pointers()
         except AssetNotChangedError:
             pass
 
         return dest
 
     def upload_file(self, source: str, dest: str, msg: Optional[str] = None, show_progress: Optional[bool] = None,
-                    in_directory: bool = False) -> None:
+                    in_directory: bool = False, max_concurrency: int = 1, transfer: Optional[FileTransfer] = None,
+                    content_settings: Optional[ContentSettings] = None) -> None:
         """ "
         Upload a single file to a path inside the container
+
+        Files of at least BLOCK_UPLOAD_THRESHOLD bytes are uploaded as separately staged blocks,
+        so an interrupted upload resumes from the blocks that were already staged.
+
+        :param transfer: Measurements shared by every attempt of the upload, recorded by the caller.
+            Without it, the upload is measured and recorded on its own.
+        :param content_settings: Properties of the blob, such as the content MD5 of its whole content.
         """
-        validate_content = os.stat(source).st_size > 0  # don't do checksum for empty files
+        file_size = os.stat(source).st_size
+        validate_content = file_size > 0  # don't do checksum for empty files
 
-        with open(source, "rb") as data:
-            if in_directory:
-                self.container_client.upload_blob(name=dest, data=data, validate_content=validate_content,
-                                                  overwrite=self.overwrite)
-            else:
-                iterable = tqdm(range(1), desc=msg) if show_progress else range(1)
-                for i in iterable:
+        controller = self._get_controller(max_concurrency)
+        record_transfer = transfer is None
+        transfer = transfer or FileTransfer(source, dest, UPLOAD, response_hook=controller.on_response)
+        transfer.start()
+        if file_size >= BLOCK_UPLOAD_THRESHOLD:
+            self.upload_file_in_blocks(source, dest, msg, show_progress and not in_directory, max_concurrency,
+                                       transfer=transfer, content_settings=content_settings)
+        else:
+            with open(source, "rb") as f:
+                data = controller.throttled_reader(f)
+                if in_directory:
                     self.container_client.upload_blob(name=dest, data=data, validate_content=validate_content,
-                                                      overwrite=self.overwrite)
-        self.uploaded_file_count = self.uploaded_file_count + 1
+                                                      overwrite=self.overwrite, max_concurrency=max_concurrency,
+                                                      content_settings=content_settings,
+                                                      raw_response_hook=transfer.on_response)
+                else:
+                    iterable = tqdm(range(1), desc=msg) if show_progress else range(1)
+                    for i in iterable:
+                        self.container_client.upload_blob(name=dest, data=data, validate_content=validate_content,
+                                                          overwrite=self.overwrite, max_concurrency=max_concurrency,
+                                                          content_settings=content_settings,
+                                                          raw_response_hook=transfer.on_response)
+        transfer.finish(file_size)
+        if record_transfer:
+            self._record_transfer(transfer)
+        with self._count_lock:
+            self.uploaded_file_count = self.uploaded_file_count + 1
+
+    def upload_snapshot(self, source: str, dest: str, msg: Optional[str] = None,
+                        show_progress: Optional[bool] = None, max_concurrency: int = 1,
+                        ignore_file: Optional[IgnoreFile] = None) -> None:
+        """
+        Upload a directory as a single compressed archive blob
 
-    def upload_dir(self, source: str, dest: str, msg: str, show_progress: bool) -> None:
+        The archive is streamed into the blob while it is being written, so a directory of many small
+        files costs a handful of block uploads instead of one request per file.
+        """
+        archive = SnapshotArchive(source, ignore_file)
+        self.total_file_count = 1
+        progress_bar = tqdm(total=archive.total_size, desc=msg, unit="B", unit_scale=True) if show_progress else None
+        chunks = archive.chunks(progress_callback=progress_bar.update if progress_bar else None)
+        transfer = FileTransfer(source, dest, UPLOAD)
+
+        def counted_chunks() -> Iterator[bytes]:
+            for chunk in chunks:
+                transfer.add_bytes(len(chunk))
+                yield chunk
+
+        transfer.start()
+        try:
+            self.container_client.upload_blob(name=dest, data=counted_chunks(), overwrite=self.overwrite,
+                                              max_concurrency=max_concurrency, raw_response_hook=transfer.on_response)
+        finally:
+            chunks.close()
+            if progress_bar:
+                progress_bar.close()
+        transfer.finish()
+        self._record_transfer(transfer)
+        with self._count_lock:
+            self.uploaded_file_count = self.uploaded_file_count + 1
+
+    def upload_file_in_blocks(self, source: str, dest: str, msg: Optional[str] = None,
+                              show_progress: Optional[bool] = None, max_concurrency: int = 1,
+                              transfer: Optional[FileTransfer] = None,
+                              content_settings: Optional[ContentSettings] = None) -> None:
+        """
+        Upload a single file as a list of blocks staged in parallel
+
+        Staged block ids are recorded in a local upload journal. When the upload of the same,
+        unmodified file to the same blob is retried, blocks that are both in the journal and still
+        uncommitted on the service are not uploaded again. The journal is removed once the block
+        list is committed.
+
+        Every block is staged in a slot of the adaptive concurrency controller, so the blocks of a large
+        file in a directory share the slots with the other files of the directory.
+        """
+        controller = self._get_controller(max_concurrency)
+        response_hook = transfer.on_response if transfer else controller.on_response
+        blob_client = self.container_client.get_blob_client(blob=dest)
+        journal = UploadJournal(self.service_client.url, self.container, dest, source, BLOB_BLOCK_SIZE)
+        block_count = max(1, math.ceil(os.stat(source).st_size / BLOB_BLOCK_SIZE))
+        block_ids = [journal.get_block_id(i) for i in range(block_count)]
+
+        staged_block_ids = journal.staged_block_ids & self._get_uncommitted_block_ids(blob_client)
+        pending_blocks = [i for i in range(block_count) if block_ids[i] not in staged_block_ids]
+        progress_bar = None
+        if show_progress:
+            progress_bar = tqdm(total=block_count, initial=block_count - len(pending_blocks), desc=msg)
+
+        def stage_block(index: int) -> None:
+            with open(source, "rb") as f:
+                f.seek(index * BLOB_BLOCK_SIZE)
+                data = f.read(BLOB_BLOCK_SIZE)
+            controller.consume(len(data))
+            blob_client.stage_block(block_id=block_ids[index], data=data, validate_content=len(data) > 0,
+                                    raw_response_hook=response_hook)
+            journal.mark_staged(block_ids[index])
+
+        def scheduled_stage_block(index: int) -> None:
+            controller.run(partial(stage_block, index), BLOB_BLOCK_SIZE)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(controller.max_limit, len(pending_blocks)))) as executor:
+            futures = [executor.submit(scheduled_stage_block, i) for i in pending_blocks]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if progress_bar:
+                        progress_bar.update(1)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                if progress_bar:
+                    progress_bar.close()
+
+        blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids],
+                                      content_settings=content_settings, raw_response_hook=response_hook)
+        journal.delete()
+
+    def _get_controller(self, max_concurrency: int) -> AdaptiveConcurrencyController:
+        if self._controller is None:
+            self._controller = AdaptiveConcurrencyController.from_environment(max_concurrency)
+        return self._controller
+
+    def _record_transfer(self, transfer: FileTransfer) -> None:
+        if self._metrics is not None:
+            self._metrics.record(transfer)
+
+    @staticmethod
+    def _get_uncommitted_block_ids(blob_client: BlobClient) -> Set[str]:
+        try:
+            _, uncommitted_blocks = blob_client.get_block_list("uncommitted")
+            return set(block.id for block in uncommitted_blocks)
+        except ResourceNotFoundError:
+            return set()
+
+    def upload_dir(self, source: str, dest: str, msg: str, show_progress: bool,
+                   max_concurrency: int = MAX_CONCURRENCY, dedupe: bool = False,
+                   ignore_file: Optional[IgnoreFile] = None) -> None:
         """
         Upload a directory to a path inside the container
 
         Azure Blob doesn't allow metadata setting at the directory level, so the first
         file in the directory is designated as the file where the confirmation metadata
         will be added at the end of the upload.
+
+        Files are uploaded in the request slots of the adaptive concurrency controller, which starts
+        with `max_concurrency` slots. Files of at least BLOCK_UPLOAD_THRESHOLD bytes don't take a slot
+        themselves, each of their blocks is staged in one instead. This method only returns once every
+        worker has finished, and re-raises the first upload failure after cancelling the files that have
+        not started yet.
+
+        With `dedupe`, every file is recorded in the asset manifest by content digest, and files of
+        at least DEDUPE_MIN_FILE_SIZE bytes whose content is already stored in the container are
+        copied on the service side instead of uploaded.
         """
 
         source_path = Path(source).resolve()
         prefix = "" if dest == "" else dest + "/"
         prefix += os.path.basename(source_path) + "/"
 
-        upload_paths = [list(traverse_directory(root, files, source_path, prefix)) for root, dirs, files
-                        in sorted(os.walk(source_path))]
-        upload_paths = sorted([x for x in upload_paths if x != []])
-        self.indicator_file = upload_paths[0][0][1]
+        upload_paths = get_directory_upload_paths(source_path, prefix, ignore_file)
+        self.indicator_file = upload_paths[0][1]
         self.check_blob_exists()
 
         self.total_file_count = len(upload_paths)
-        progress_bar = None
+        progress_bar = tqdm(total=self.total_file_count, desc=msg) if show_progress else None
+
+        controller = self._get_controller(max_concurrency)
+        upload_file = self._upload_file_deduplicated if dedupe else self.upload_file
+
+        def scheduled_upload_file(src: str, blob: str) -> None:
+            transfer = FileTransfer(src, blob, UPLOAD, response_hook=controller.on_response)
+            file_size = os.stat(src).st_size
+            upload = partial(upload_file, src, blob, in_directory=True, transfer=transfer)
+            if file_size >= BLOCK_UPLOAD_THRESHOLD:
+                upload()
+            else:
+                controller.run(upload, file_size)
+            # files copied on the service side are never started
+            if transfer.end_time is not None:
+                self._record_transfer(transfer)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(controller.max_limit, len(upload_paths)))) as executor:
+            futures = [executor.submit(scheduled_upload_file, src, blob) for src, blob in upload_paths]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if progress_bar:
+                        progress_bar.update(1)
+                        progress_bar.refresh()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                if progress_bar:
+                    progress_bar.close()
+
+    def _upload_file_deduplicated(self, source: str, dest: str, in_directory: bool = True,
+                                  transfer: Optional[FileTransfer] = None) -> None:
+        """
+        Upload a single file of a directory unless the container already holds its content
+
+        Content already stored in the container is located through a pointer blob named after the
+        content digest, and copied from the blob the pointer refers to. Uploaded content carries its
+        MD5 as the blob's content MD5, and a copy is only kept if it carries the expected one. Any
+        failure to locate, copy or verify the existing content falls back to a regular upload.
+        """
+        file_size = os.stat(source).st_size
+        digest = _get_file_digest(source, get_hash_index())
+        with self._count_lock:
+            self._manifest[dest] = {"md5": digest, "size": file_size}
+        if file_size < DEDUPE_MIN_FILE_SIZE:
+            self.upload_file(source, dest, in_directory=in_directory, transfer=transfer)
+            return
+
+        pointer_client = self.container_client.get_blob_client(blob=self._get_content_pointer_name(digest))
+        try:
+            existing_blob = pointer_client.get_blob_properties().metadata.get(CONTENT_POINTER_METADATA_KEY)
+            if existing_blob and existing_blob != dest:
+                self._copy_blob(existing_blob, dest, file_size, digest)
+                with self._count_lock:
+                    self.uploaded_file_count = self.uploaded_file_count + 1
+                return
+        except Exception as e:
+            if not isinstance(e, ResourceNotFoundError):
+                module_logger.debug("Unable to reuse stored content for %s, uploading it: %s", source, e)
+
+        self.upload_file(source, dest, in_directory=in_directory, transfer=transfer,
+                         content_settings=ContentSettings(content_md5=bytearray.fromhex(digest)))
+        with self._count_lock:
+            self._new_contents[digest] = dest
+
+    def _copy_blob(self, source_blob: str, dest: str, size: int, digest: str) -> None:
+        source_url = self._get_readable_url(self.container_client.get_blob_client(blob=source_blob))
+        dest_client = self.container_client.get_blob_client(blob=dest)
+        # explicit metadata keeps the copy from inheriting the upload confirmation of the source
+        copy = dest_client.start_copy_from_url(source_url, metadata={"content_md5": digest},
+                                               requires_sync=size <= SYNC_COPY_MAX_SIZE)
+        status = copy["copy_status"]
+        while status == "pending":
+            time.sleep(COPY_POLL_INTERVAL_SECONDS)
+            status = dest_client.get_blob_properties().copy.status
+        if status != "success":
+            raise Exception(f"Copy of {source_blob} to {dest} finished with status {status}.")
+
+        # the pointer may be stale, e.g. if its blob was overwritten since
+        content_md5 = dest_client.get_blob_properties().content_settings.content_md5
+        if not content_md5 or bytes(content_md5).hex() != digest:
+            dest_client.delete_blob()
+            raise Exception(f"Copy of {source_blob} to {dest} does not have the content MD5 {digest}.")
+
+    def _get_readable_url(self, blob_client: BlobClient) -> str:
+        """
+        Returns the url of a blob that a service side copy can read
+
+        The url of a client authorized by an account key carries no authorization, so a short-lived
+        read SAS is added to it. The url of a client authorized by a SAS token already carries it.
+        """
+        credential = self.service_client.credential
+        account_key = getattr(credential, "account_key", None)
+        if not account_key:
+            return blob_client.url
+        sas_token = generate_blob_sas(
+            account_name=credential.account_name,
+            container_name=self.container,
+            blob_name=blob_client.blob_name,
+            account_key=account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.utcnow() + timedelta(seconds=COPY_SOURCE_SAS_EXPIRY_SECONDS),
+        )
+        return f"{blob_client.url}?{sas_token}"
+
+    @staticmethod
+    def _get_content_pointer_name(digest: str) -> str:
+        return "/".join((AZ_ML_ARTIFACT_DIRECTORY, CONTENT_DIRECTORY, digest))
+
+    def _write_manifest(self, asset_id: str) -> None:
+        prefix = asset_id + "/"
+        files = {blob[len(prefix):]: entry for blob, entry in sorted(self._manifest.items())}
+        manifest_name = "/".join((AZ_ML_ARTIFACT_DIRECTORY, MANIFEST_DIRECTORY, asset_id.split("/")[-1] + ".json"))
+        self.container_client.upload_blob(name=manifest_name, data=json.dumps({"files": files}), overwrite=True)
+
+    def _write_content_pointers(self) -> None:
+        for digest, blob in self._new_contents.items():
+            try:
+                self.container_client.upload_blob(name=self._get_content_pointer_name(digest), data=b"",
+                                                  metadata={CONTENT_POINTER_METADATA_KEY: blob}, overwrite=True)
+            except Exception as e:
+                module_logger.debug("Unable to record stored content %s: %s", digest, e)
+        self._new_contents = {}
 
-        for f in upload_paths:
-            src, dest = f[0][0], f[0][1]
-            self.upload_file(src, dest, in_directory=True)
-            if show_progress:
-                if not progress_bar:
-                    progress_bar = tqdm(total=self.total_file_count, desc=msg)
-                progress_bar.update(1)
-                progress_bar.refresh()
-        if show_progress and progress_bar:
-            progress_bar.close()
-            
     def check_blob_exists(self) -> None:
         """
         Throw error if blob already exists.
@@ -132,25 +468,52 @@ class DefaultStorageClient:
         blob_client = self.container_client.get_blob_client(blob=self.indicator_file)
         blob_client.set_blob_metadata(UPLOAD_CONFIRMATION)
 
-    def download(self, starts_with: str, destination: str = Path.home(), max_concurrency: int = 4) -> None:
+    def download(self, starts_with: str, destination: str = Path.home(), max_concurrency: int = 4,
+                 max_workers: int = MAX_CONCURRENCY, metrics: Optional[TransferMetrics] = None) -> None:
         """
         Downloads all blobs inside a specified container
         :param starts_with: Indicates the blob name starts with to search.
         :param destination: Indicates path to download in local
         :param max_concurrency: Indicates concurrent connections to download a blob.
+        :param max_workers: Indicates how many blobs are downloaded at the same time.
+        :param metrics: Records the bytes, duration and retries of every blob that is downloaded.
         :return: The status object.
+
+        Blob content is streamed to disk, so memory use stays bounded by the download chunk
+        size for each connection regardless of the blob size.
         """
         try:
             mylist = self.container_client.list_blobs(name_starts_with=starts_with)
             dir_name = starts_with.split("dcid.")[1]
-            for item in mylist:
+
+            def download_blob(item: BlobProperties) -> None:
                 blob_name = item.name.replace(starts_with, "").lstrip("//")
-                blob_content = self.container_client.download_blob(item)
-                blob_content = blob_content.content_as_bytes(max_concurrency)
                 target_path = os.path.join(Path(destination, dir_name), Path(blob_name))
                 os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                with open(target_path, "wb") as file:
-                    file.write(blob_content)
+                transfer = FileTransfer(target_path, item.name, DOWNLOAD)
+                transfer.start()
+                blob_content = self.container_client.download_blob(item, max_concurrency=max_concurrency,
+                                                                   raw_response_hook=transfer.on_response)
+                try:
+                    with open(target_path, "wb") as file:
+                        transfer.finish(blob_content.readinto(file))
+                except BaseException:
+                    # don't leave a truncated file behind
+                    if os.path.exists(target_path):
+                        os.remove(target_path)
+                    raise
+                if metrics is not None:
+                    metrics.record(transfer)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(download_blob, item) for item in mylist]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
         except OSError as ex:
             raise ex
         except Exception:
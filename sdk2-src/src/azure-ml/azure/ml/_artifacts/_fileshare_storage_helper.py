@@ -2,22 +2,42 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
+import logging
 import os
+import tempfile
 import time
-import sys
-from typing import Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Dict, List, Optional, Set, Tuple, Union
 from tqdm import tqdm
 from pathlib import PurePosixPath, Path
 
-from azure.ml._artifacts.constants import AZ_ML_ARTIFACT_DIRECTORY, UPLOAD_CONFIRMATION
-from azure.ml._utils._asset_utils import traverse_directory, generate_asset_id
-from azure.storage.fileshare import ShareDirectoryClient, ShareFileClient
-from azure.core.exceptions import ResourceExistsError
+from azure.ml._artifacts._concurrency_controller import AdaptiveConcurrencyController
+from azure.ml._artifacts._snapshot import SnapshotArchive, get_snapshot_path
+from azure.ml._artifacts._transfer_metrics import DOWNLOAD, UPLOAD, FileTransfer, TransferMetrics
+from azure.ml._artifacts.constants import (
+    AZ_ML_ARTIFACT_DIRECTORY,
+    UPLOAD_CONFIRMATION,
+    MAX_CONCURRENCY,
+)
+from azure.ml._utils._asset_utils import generate_asset_id, get_directory_upload_paths
+from azure.ml._utils._ignore_file import IgnoreFile, get_ignore_file, walk_directory
+from azure.storage.fileshare import DirectoryProperties, FileProperties, ShareDirectoryClient, ShareFileClient
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+module_logger = logging.getLogger(__name__)
+
+
+# (artifact directory url, asset id) of every asset this process has seen confirmed
+_confirmed_assets = set()  # type: Set[Tuple[str, str]]
+_confirmed_assets_lock = threading.Lock()
 
 
 class FileStorageClient:
-    def __init__(self, credential: str, file_share_name: str, account_url: str):
-        self.directory_client = ShareDirectoryClient(
+    def __init__(self, credential: str, file_share_name: str, account_url: str, use_existence_cache: bool = True,
+                 directory_client: Optional[ShareDirectoryClient] = None):
+        self.directory_client = directory_client or ShareDirectoryClient(
             account_url=account_url,
             credential=credential,
             share_name=file_share_name,
@@ -26,6 +46,10 @@ class FileStorageClient:
         self.file_share = file_share_name
         self.total_file_count = 1
         self.uploaded_file_count = 0
+        self.use_existence_cache = use_existence_cache
+        self._count_lock = threading.Lock()
+        self._controller = None  # type: Optional[AdaptiveConcurrencyController]
+        self._metrics = None  # type: Optional[TransferMetrics]
 
         try:
             self.directory_client.create_directory()
@@ -34,15 +58,31 @@ class FileStorageClient:
 
         self.subdirectory_client = None
 
-    def upload(self, source: str, asset_hash: str = None, show_progress: bool = True) -> str:
+    def upload(self, source: str, asset_hash: str = None, show_progress: bool = True,
+               max_concurrency: int = MAX_CONCURRENCY, snapshot: bool = False,
+               metrics: Optional[TransferMetrics] = None, ignore_file: Optional[IgnoreFile] = None,
+               dedupe: bool = False) -> str:
         """
         Upload a file or directory to a path inside the file system
+
+        :param max_concurrency: Number of files of a directory uploaded in parallel, or of parallel
+            connections used to upload the ranges of a single file.
+        :param snapshot: Upload a directory as a single compressed archive, see SnapshotArchive.
+            The returned path is then the path of the archive file.
+        :param metrics: Records the bytes, duration and retries of every file that is uploaded.
+        :param ignore_file: Files of a directory excluded from the upload, defaults to its .amlignore file.
+        :param dedupe: Not supported by file shares, every file of a directory is uploaded.
         """
         asset_id = generate_asset_id(asset_hash, include_directory=False)
         source_name = Path(source).name
-        dest = str(PurePosixPath(asset_id, source_name))
+        snapshot = snapshot and os.path.isdir(source)
+        dest = get_snapshot_path(asset_id, source_name) if snapshot else str(PurePosixPath(asset_id, source_name))
+        self._controller = AdaptiveConcurrencyController.from_environment(max_concurrency)
+        self._metrics = metrics
+        # an archive is confirmed as a file of its own, outside the directory of a regular upload of the same asset
+        indicator = dest if snapshot else asset_id
 
-        if not self.exists(asset_id):
+        if not self.exists(indicator):
             # truncate path longer than 50 chars for terminal display
             if show_progress and len(source_name) >= 50:
                 formatted_path = '{:.47}'.format(source_name) + "..."
@@ -50,15 +90,23 @@ class FileStorageClient:
                 formatted_path = source_name
             msg = f"Uploading {formatted_path}"
 
-            if os.path.isdir(source):
-                self.upload_dir(source, asset_id, msg=msg, show_progress=show_progress)
+            if snapshot:
+                self.upload_snapshot(source, dest, msg=msg, show_progress=show_progress,
+                                     max_concurrency=max_concurrency, ignore_file=ignore_file)
+            elif os.path.isdir(source):
+                self.upload_dir(source, asset_id, msg=msg, show_progress=show_progress,
+                                max_concurrency=max_concurrency, ignore_file=ignore_file)
             else:
-                self.upload_file(source, asset_id, msg=msg, show_progress=show_progress)
+                self.upload_file(source, asset_id, msg=msg, show_progress=show_progress,
+                                 max_concurrency=max_concurrency)
 
             # upload must be completed before we try to generate confirmation file
-            while self.uploaded_file_count < self.total_file_count:
-                time.sleep(0.5)
-            self._set_confirmation_metadata(source, asset_id)
+            if self.uploaded_file_count < self.total_file_count:
+                raise Exception(
+                    f"Upload of {source} did not complete: {self.uploaded_file_count} of "
+                    f"{self.total_file_count} files uploaded."
+                )
+            self._set_confirmation_metadata(source, indicator, snapshot=snapshot)
 
         return dest
 
@@ -70,90 +118,221 @@ class FileStorageClient:
         msg: Optional[str] = None,
         in_directory: bool = False,
         subdirectory_client: Optional[ShareDirectoryClient] = None,
+        max_concurrency: int = 1,
+        transfer: Optional[FileTransfer] = None,
     ) -> None:
         """ "
         Upload a single file to a path inside the file system directory
+
+        :param transfer: Measurements shared by every attempt of the upload, recorded by the caller.
+            Without it, the upload is measured and recorded on its own.
         """
-        validate_content = os.stat(source).st_size > 0  # don't do checksum for empty files
+        file_size = os.stat(source).st_size
+        validate_content = file_size > 0  # don't do checksum for empty files
+        controller = self._get_controller(max_concurrency)
+        record_transfer = transfer is None
+        transfer = transfer or FileTransfer(source, dest, UPLOAD, response_hook=controller.on_response)
+        transfer.start()
 
-        with open(source, "rb") as data:
+        with open(source, "rb") as f:
+            data = controller.throttled_reader(f)
             if in_directory:
                 file_name = dest.rsplit("/")[-1]
-                subdirectory_client.upload_file(file_name=file_name, data=data, validate_content=validate_content)
+                subdirectory_client.upload_file(file_name=file_name, data=data, validate_content=validate_content,
+                                                raw_response_hook=transfer.on_response)
             else:
                 iterable = tqdm(range(1), desc=msg) if show_progress else range(1)
                 for i in iterable:
                     self.directory_client.upload_file(file_name=dest, data=data,
-                                                      validate_content=validate_content)
-        self.uploaded_file_count = self.uploaded_file_count + 1
+                                                      validate_content=validate_content,
+                                                      max_concurrency=max_concurrency,
+                                                      raw_response_hook=transfer.on_response)
+        transfer.finish(file_size)
+        if record_transfer:
+            self._record_transfer(transfer)
+        with self._count_lock:
+            self.uploaded_file_count = self.uploaded_file_count + 1
+
+    def upload_snapshot(self, source: str, dest: str, msg: Optional[str] = None,
+                        show_progress: Optional[bool] = None, max_concurrency: int = 1,
+                        ignore_file: Optional[IgnoreFile] = None) -> None:
+        """
+        Upload a directory as a single compressed archive file
+
+        Azure File shares need the size of a file when it is created, so unlike on blob storage the
+        archive is first written to a temporary file.
+        """
+        archive = SnapshotArchive(source, ignore_file)
+        self.total_file_count = 1
+        self._create_directory(str(PurePosixPath(dest).parent))
+        transfer = FileTransfer(source, dest, UPLOAD)
+        with tempfile.TemporaryFile() as archive_file:
+            archive.write_to(archive_file)
+            size = archive_file.tell()
+            archive_file.seek(0)
+            transfer.start()
+            iterable = tqdm(range(1), desc=msg) if show_progress else range(1)
+            for i in iterable:
+                self.directory_client.get_file_client(dest).upload_file(
+                    archive_file, length=size, max_concurrency=max_concurrency, raw_response_hook=transfer.on_response
+                )
+        transfer.finish(size)
+        self._record_transfer(transfer)
+        with self._count_lock:
+            self.uploaded_file_count = self.uploaded_file_count + 1
 
-    def upload_dir(self, source: str, dest: str, msg: str, show_progress: bool) -> None:
+    def upload_dir(self, source: str, dest: str, msg: str, show_progress: bool,
+                   max_concurrency: int = MAX_CONCURRENCY, ignore_file: Optional[IgnoreFile] = None) -> None:
         """
         Upload a directory to a path inside the fileshare directory
+
+        Azure File shares need every parent directory to exist before a file can be created in it,
+        so the whole remote tree is planned first and created one level at a time, each level in
+        parallel. The files are then uploaded in the request slots of the adaptive concurrency
+        controller, which starts with `max_concurrency` slots.
+        The first upload failure is re-raised after cancelling the files that have not started yet.
         """
-        subdir = self.directory_client.create_subdirectory(dest)
+        source_path = Path(source).resolve()
         prefix = "" if dest == "" else dest + "/"
-        prefix += os.path.basename(source) + "/"
+        prefix += os.path.basename(source_path) + "/"
 
-        self.total_file_count = sum(len(files) for _, _, files in os.walk(source))
-        if show_progress:
-            progress_bar = tqdm(total=self.total_file_count, desc=msg)
+        if ignore_file is None:
+            ignore_file = get_ignore_file(source_path)
+        upload_paths = get_directory_upload_paths(source_path, prefix, ignore_file)
+        self.total_file_count = len(upload_paths)
 
-        for root, dirs, files in os.walk(source):
-            if sys.platform.startswith(("win32", "cygwin")):
-                split_char = "\\"
-            else:
-                split_char = "/"
-            trunc_root = root.rsplit(split_char)[-1]
-            subdir = subdir.create_subdirectory(trunc_root)
-
-            upload_paths = traverse_directory(root, files, source, prefix)
-            for f, b in upload_paths:
-                self.upload_file(f, b, in_directory=True, subdirectory_client=subdir)
-                if show_progress:
-                    progress_bar.update(1)
-                    progress_bar.refresh()
-        
-        if show_progress:
-            progress_bar.close()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for level in plan_directory_tree(source_path, dest, prefix, ignore_file):
+                list(executor.map(self._create_directory, level))
+
+        controller = self._get_controller(max_concurrency)
+
+        def scheduled_upload_file(src: str, remote: str) -> None:
+            subdirectory_client = self.directory_client.get_subdirectory_client(remote.rsplit("/", 1)[0])
+            transfer = FileTransfer(src, remote, UPLOAD, response_hook=controller.on_response)
+            upload = partial(self.upload_file, src, remote, in_directory=True, subdirectory_client=subdirectory_client,
+                             transfer=transfer)
+            controller.run(upload, os.stat(src).st_size)
+            self._record_transfer(transfer)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(controller.max_limit, len(upload_paths)))) as executor:
+            progress_bar = tqdm(total=self.total_file_count, desc=msg) if show_progress else None
+            futures = [executor.submit(scheduled_upload_file, src, remote) for src, remote in upload_paths]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    if progress_bar:
+                        progress_bar.update(1)
+                        progress_bar.refresh()
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                if progress_bar:
+                    progress_bar.close()
+
+    def _get_controller(self, max_concurrency: int) -> AdaptiveConcurrencyController:
+        if self._controller is None:
+            self._controller = AdaptiveConcurrencyController.from_environment(max_concurrency)
+        return self._controller
+
+    def _record_transfer(self, transfer: FileTransfer) -> None:
+        if self._metrics is not None:
+            self._metrics.record(transfer)
+
+    def _create_directory(self, path: str) -> None:
+        try:
+            self.directory_client.get_subdirectory_client(path).create_directory()
+        except ResourceExistsError:
+            pass
 
     def exists(self, asset_id: str) -> bool:
         """
         Check if file or directory already exists in fileshare directory
+
+        The asset path is looked up directly rather than by listing the artifact directory, so the
+        cost does not grow with the number of assets in the share. Confirmed assets are immutable
+        and are remembered for the lifetime of the process when `use_existence_cache` is set.
         """
-        existing_items = {item["name"]: item["is_directory"] for item in
-                          self.directory_client.list_directories_and_files()}
-        if asset_id in existing_items:
-            if existing_items[asset_id]:
-                client = self.directory_client.get_subdirectory_client(asset_id)
-                properties = client.get_directory_properties()
-            else:
-                client = self.directory_client.get_file_client(asset_id)
+        cache_key = (self.directory_client.url, asset_id)
+        if self.use_existence_cache and cache_key in _confirmed_assets:
+            return True
+
+        client = self.directory_client.get_subdirectory_client(asset_id)
+        try:
+            properties = client.get_directory_properties()
+        except ResourceNotFoundError:
+            client = self.directory_client.get_file_client(asset_id)
+            try:
                 properties = client.get_file_properties()
-            if properties["metadata"] == UPLOAD_CONFIRMATION:
-                return True
-            else:
-                delete(client)
+            except ResourceNotFoundError:
+                return False
+
+        if properties["metadata"] == UPLOAD_CONFIRMATION:
+            self._remember_confirmed(asset_id)
+            return True
+        delete(client)
         return False
 
-    def download(self, starts_with: str = "", destination: str = Path.home(), max_concurrency: int = 4) -> None:
+    def download(
+        self,
+        starts_with: str = "",
+        destination: str = Path.home(),
+        max_concurrency: int = 4,
+        max_workers: int = MAX_CONCURRENCY,
+        metrics: Optional[TransferMetrics] = None,
+    ) -> None:
         """
         Downloads all contents inside a specified fileshare directory
+
+        :param metrics: Records the bytes, duration and retries of every file that is downloaded.
         """
         recursive_download(
             client=self.directory_client,
             starts_with=starts_with,
             destination=destination,
             max_concurrency=max_concurrency,
+            max_workers=max_workers,
+            metrics=metrics,
         )
 
-    def _set_confirmation_metadata(self, source: str, dest: str):
-        if os.path.isdir(source):
+    def _set_confirmation_metadata(self, source: str, dest: str, snapshot: bool = False):
+        if os.path.isdir(source) and not snapshot:
             properties = self.directory_client.get_subdirectory_client(dest)
             properties.set_directory_metadata(UPLOAD_CONFIRMATION)
         else:
             properties = self.directory_client.get_file_client(dest)
             properties.set_file_metadata(UPLOAD_CONFIRMATION)
+        self._remember_confirmed(dest)
+
+    def _remember_confirmed(self, asset_id: str) -> None:
+        if self.use_existence_cache:
+            with _confirmed_assets_lock:
+                _confirmed_assets.add((self.directory_client.url, asset_id))
+
+
+def plan_directory_tree(
+    source: Union[str, os.PathLike], dest: str, prefix: str, ignore_file: Optional[IgnoreFile] = None
+) -> List[List[str]]:
+    """
+    Returns the remote directories needed to upload a local directory, grouped by depth
+
+    Every directory of a group has its parent in an earlier group, so the groups can be created in
+    order with the directories of each group created concurrently. Directories excluded by
+    `ignore_file`, which defaults to the .amlignore file of the source directory, are left out.
+    """
+    if ignore_file is None:
+        ignore_file = get_ignore_file(source)
+    directories = {dest} if dest else set()
+    for root, _, _ in walk_directory(source, ignore_file):
+        relative_root = Path(os.path.relpath(root, str(source))).as_posix()
+        directories.add(prefix.rstrip("/") if relative_root == "." else prefix + relative_root)
+
+    levels = {}  # type: Dict[int, List[str]]
+    for directory in sorted(directories):
+        levels.setdefault(directory.count("/"), []).append(directory)
+    return [levels[depth] for depth in sorted(levels)]
 
 
 def delete(root_client: Union[ShareDirectoryClient, ShareFileClient]) -> None:
@@ -179,28 +358,92 @@ def delete(root_client: Union[ShareDirectoryClient, ShareFileClient]) -> None:
 
 
 def recursive_download(
-    client: ShareDirectoryClient, destination: str, max_concurrency: int, starts_with: str = ""
+    client: ShareDirectoryClient,
+    destination: str,
+    max_concurrency: int,
+    starts_with: str = "",
+    max_workers: int = MAX_CONCURRENCY,
+    metrics: Optional[TransferMetrics] = None,
 ) -> None:
     """
     Helper function for `download`. Recursively downloads remote fileshare directory locally
+
+    Directories are listed level by level, all directories of a level at once, and every file
+    found is handed to a pool of `max_workers` downloads that stream the file content to disk.
+    The overall throughput is logged once the download completes.
     """
     try:
-        items = list(client.list_directories_and_files(name_starts_with=starts_with))
-        files = [item for item in items if not item["is_directory"]]
-        folders = [item for item in items if item["is_directory"]]
-
-        for f in files:
-            Path(destination).mkdir(parents=True, exist_ok=True)
-            file_name = f["name"]
-            file_client = client.get_file_client(file_name)
-            file_content = file_client.download_file(max_concurrency=max_concurrency)
-            local_path = Path(destination, file_name)
-            with open(local_path, "wb") as file_data:
-                file_data.write(file_content.readall())
-
-        for f in folders:
-            sub_client = client.get_subdirectory_client(f["name"])
-            destination = "/".join((destination, f["name"]))
-            recursive_download(sub_client, destination=destination, max_concurrency=max_concurrency)
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=max_workers) as list_executor, ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as download_executor:
+            download_futures = []
+            directories = [(client, Path(destination), starts_with)]
+            while directories:
+                listings = list(list_executor.map(lambda d: _list_directory(d[0], d[2]), directories))
+                next_directories = []
+                for (dir_client, dir_destination, _), (files, folders) in zip(directories, listings):
+                    dir_destination.mkdir(parents=True, exist_ok=True)
+                    for f in files:
+                        download_futures.append(
+                            download_executor.submit(
+                                _download_file, dir_client, f["name"], dir_destination, max_concurrency, metrics
+                            )
+                        )
+                    for f in folders:
+                        sub_client = dir_client.get_subdirectory_client(f["name"])
+                        next_directories.append((sub_client, dir_destination / f["name"], ""))
+                directories = next_directories
+
+            total_bytes = 0
+            try:
+                for future in as_completed(download_futures):
+                    total_bytes += future.result()
+            except BaseException:
+                for future in download_futures:
+                    future.cancel()
+                raise
+
+        duration = max(time.time() - start_time, 1e-6)
+        module_logger.info(
+            "Downloaded %d files (%.2f MB) from fileshare directory in %.2f seconds (%.2f MB/s)",
+            len(download_futures),
+            total_bytes / 2 ** 20,
+            duration,
+            total_bytes / 2 ** 20 / duration,
+        )
     except Exception:
         raise Exception(f"Saving fileshare directory with prefix {starts_with} was unsuccessful.")
+
+
+def _list_directory(
+    client: ShareDirectoryClient, starts_with: str = ""
+) -> Tuple[List[Union[DirectoryProperties, FileProperties]], List[Union[DirectoryProperties, FileProperties]]]:
+    items = list(client.list_directories_and_files(name_starts_with=starts_with))
+    files = [item for item in items if not item["is_directory"]]
+    folders = [item for item in items if item["is_directory"]]
+    return files, folders
+
+
+def _download_file(client: ShareDirectoryClient, file_name: str, destination: Path, max_concurrency: int,
+                   metrics: Optional[TransferMetrics] = None) -> int:
+    """
+    Streams a single file to disk and returns the number of bytes written
+    """
+    local_path = Path(destination, file_name)
+    transfer = FileTransfer(str(local_path), f"{client.directory_path}/{file_name}".lstrip("/"), DOWNLOAD)
+    transfer.start()
+    file_content = client.get_file_client(file_name).download_file(
+        max_concurrency=max_concurrency, raw_response_hook=transfer.on_response
+    )
+    try:
+        with open(local_path, "wb") as file_data:
+            transfer.finish(file_content.readinto(file_data))
+    except BaseException:
+        # don't leave a truncated file behind
+        if local_path.exists():
+            local_path.unlink()
+        raise
+    if metrics is not None:
+        metrics.record(transfer)
+    return transfer.bytes
@@ -0,0 +1,176 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import gzip
+import io
+import json
+import os
+import queue
+import tarfile
+import threading
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Callable, Dict, Generator, Optional, Union
+
+from azure.ml._artifacts.constants import (
+    CHUNK_SIZE,
+    SNAPSHOT_ARCHIVE_EXTENSION,
+    SNAPSHOT_COMPRESS_LEVEL,
+    SNAPSHOT_DIRECTORY_SUFFIX,
+    SNAPSHOT_ENV_VAR,
+    SNAPSHOT_MANIFEST_NAME,
+    SNAPSHOT_MANIFEST_VERSION,
+    SNAPSHOT_QUEUE_SIZE,
+)
+from azure.ml._utils._asset_utils import get_directory_upload_paths
+from azure.ml._utils._ignore_file import IgnoreFile
+
+
+def use_snapshot_archive(snapshot: Optional[bool] = None) -> bool:
+    """Returns whether directories are uploaded as a single archive, defaulting to AZUREML_CODE_SNAPSHOT_ARCHIVE"""
+    if snapshot is None:
+        return os.environ.get(SNAPSHOT_ENV_VAR, "").lower() in ("1", "true")
+    return snapshot
+
+
+def get_snapshot_path(asset_id: str, source_name: str) -> str:
+    """Returns the path of the archive of a directory asset
+
+    Archives live in a directory of their own next to the asset directory, so the existence check and
+    cleanup of a regular upload of the same content never reach an archive, and the other way around.
+    """
+    return str(PurePosixPath(asset_id + SNAPSHOT_DIRECTORY_SUFFIX, source_name + SNAPSHOT_ARCHIVE_EXTENSION))
+
+
+class SnapshotArchive(object):
+    """A directory packed into a single gzip compressed tar archive.
+
+    The archive holds the files that a regular directory upload would upload, at their paths
+    relative to the directory, preceded by a manifest member (SNAPSHOT_MANIFEST_NAME) that lists
+    the path and size of every file. The archive is produced as it is read, so it is never held in
+    memory or on disk as a whole.
+    """
+
+    def __init__(self, source: Union[str, os.PathLike], ignore_file: Optional[IgnoreFile] = None):
+        self._source = Path(source)
+        self._upload_paths = get_directory_upload_paths(self._source, "", ignore_file)
+        files = [{"path": relative_path, "size": os.stat(path).st_size} for path, relative_path in self._upload_paths]
+        self._manifest = {
+            "version": SNAPSHOT_MANIFEST_VERSION,
+            "source": self._source.name,
+            "files": files,
+        }  # type: Dict[str, Any]
+
+    @property
+    def manifest(self) -> Dict:
+        return self._manifest
+
+    @property
+    def file_count(self) -> int:
+        return len(self._upload_paths)
+
+    @property
+    def total_size(self) -> int:
+        """Uncompressed size of the archived files"""
+        return sum(f["size"] for f in self._manifest["files"])
+
+    def write_to(
+        self, fileobj: Union[IO[bytes], "_QueueWriter"], progress_callback: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """Writes the whole archive to a binary file object
+
+        :param progress_callback: Called with the uncompressed size of every archived file.
+        """
+        # mtime=0 keeps the gzip header identical across runs, _normalize_member does the same for the tar headers
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=SNAPSHOT_COMPRESS_LEVEL, mtime=0) as gz:
+            with tarfile.open(fileobj=gz, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+                manifest = json.dumps(self._manifest, indent=2).encode()
+                info = tarfile.TarInfo(SNAPSHOT_MANIFEST_NAME)
+                info.size = len(manifest)
+                tar.addfile(info, io.BytesIO(manifest))
+                for path, relative_path in self._upload_paths:
+                    tar.add(path, arcname=relative_path, recursive=False, filter=_normalize_member)
+                    if progress_callback:
+                        progress_callback(os.stat(path).st_size)
+
+    def chunks(self, progress_callback: Optional[Callable[[int], None]] = None) -> Generator[bytes, None, None]:
+        """Yields the archive in CHUNK_SIZE chunks while a background thread writes it
+
+        At most SNAPSHOT_QUEUE_SIZE chunks are buffered. Closing the iterator early stops the writer.
+        """
+        chunk_queue = queue.Queue(maxsize=SNAPSHOT_QUEUE_SIZE)  # type: queue.Queue
+        cancelled = threading.Event()
+        writer = _QueueWriter(chunk_queue, cancelled)
+
+        def write_archive() -> None:
+            try:
+                self.write_to(writer, progress_callback)
+                writer.close()
+            except _WriterCancelled:
+                pass
+            except BaseException as e:  # pylint: disable=broad-except
+                try:
+                    writer.put(e)
+                except _WriterCancelled:
+                    pass
+
+        thread = threading.Thread(target=write_archive, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = chunk_queue.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+            thread.join()
+
+
+def _normalize_member(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Drops the file times and ownership from an archive member, so the archive only depends on the content"""
+    info.mtime = 0
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+class _WriterCancelled(Exception):
+    pass
+
+
+class _QueueWriter(object):
+    """Write-only file object that hands the written bytes to a queue in CHUNK_SIZE chunks"""
+
+    def __init__(self, chunk_queue: queue.Queue, cancelled: threading.Event):
+        self._queue = chunk_queue
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self.put(bytes(self._buffer[:CHUNK_SIZE]))
+            del self._buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._buffer:
+            self.put(bytes(self._buffer))
+            self._buffer = bytearray()
+        self.put(None)
+
+    def put(self, item: Union[bytes, BaseException, None]) -> None:
+        while True:
+            if self._cancelled.is_set():
+                raise _WriterCancelled()
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
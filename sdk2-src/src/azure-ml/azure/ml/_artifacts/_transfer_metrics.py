@@ -0,0 +1,135 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from azure.core.pipeline import PipelineResponse
+from azure.ml._artifacts.constants import RETRYABLE_STATUS_CODES
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+
+
+class FileTransfer(object):
+    """Measurements of the transfer of a single file
+
+    Storage responses are passed through `on_response`, which counts every retryable error
+    response as a retry, whether the storage SDK or the caller retries the request.
+    """
+
+    def __init__(self, local_path: str, remote_path: str, direction: str,
+                 response_hook: Optional[Callable] = None):
+        self.local_path = local_path
+        self.remote_path = remote_path
+        self.direction = direction
+        self.bytes = 0
+        self.retries = 0
+        self.start_time = None  # type: Optional[float]
+        self.end_time = None  # type: Optional[float]
+        self._response_hook = response_hook
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.monotonic()) - self.start_time
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / max(self.duration, 1e-6)
+
+    def start(self) -> None:
+        """Starts the clock, unless an earlier attempt of the transfer already did"""
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+
+    def add_bytes(self, nbytes: int) -> None:
+        with self._lock:
+            self.bytes += nbytes
+
+    def finish(self, nbytes: Optional[int] = None) -> None:
+        if nbytes is not None:
+            self.bytes = nbytes
+        self.start()
+        self.end_time = time.monotonic()
+
+    def on_response(self, pipeline_response: PipelineResponse) -> None:
+        """Response hook for storage SDK calls (raw_response_hook)"""
+        if self._response_hook is not None:
+            self._response_hook(pipeline_response)
+        if pipeline_response.http_response.status_code in RETRYABLE_STATUS_CODES:
+            with self._lock:
+                self.retries += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "local_path": self.local_path,
+            "remote_path": self.remote_path,
+            "direction": self.direction,
+            "bytes": self.bytes,
+            "duration": self.duration,
+            "retries": self.retries,
+            "bytes_per_second": self.bytes_per_second,
+        }
+
+
+class TransferMetrics(object):
+    """Collects the FileTransfer of every file uploaded or downloaded by a storage operation
+
+    The optional callback is invoked with each FileTransfer as soon as the file is transferred,
+    from the worker thread that transferred it. Totals cover the files recorded so far; the
+    duration is the wall-clock time from the start of the first transfer to the end of the last.
+    Files whose content was copied on the service side instead of transferred are not recorded.
+    """
+
+    def __init__(self, callback: Optional[Callable[[FileTransfer], None]] = None):
+        self._callback = callback
+        self._files = []  # type: List[FileTransfer]
+        self._lock = threading.Lock()
+
+    def record(self, transfer: FileTransfer) -> None:
+        with self._lock:
+            self._files.append(transfer)
+        if self._callback is not None:
+            self._callback(transfer)
+
+    @property
+    def files(self) -> List[FileTransfer]:
+        with self._lock:
+            return list(self._files)
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.bytes for f in self.files)
+
+    @property
+    def retries(self) -> int:
+        return sum(f.retries for f in self.files)
+
+    @property
+    def duration(self) -> float:
+        spans = [(f.start_time, f.end_time) for f in self.files if f.start_time is not None and f.end_time is not None]
+        if not spans:
+            return 0.0
+        return max(end for _, end in spans) - min(start for start, _ in spans)
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.total_bytes / max(self.duration, 1e-6)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "file_count": self.file_count,
+            "bytes": self.total_bytes,
+            "duration": self.duration,
+            "retries": self.retries,
+            "bytes_per_second": self.bytes_per_second,
+        }
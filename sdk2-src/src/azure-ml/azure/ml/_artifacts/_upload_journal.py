@@ -0,0 +1,90 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Set, Union
+
+from azure.ml._artifacts.constants import UPLOAD_JOURNAL_DIRECTORY_ENV_VAR
+
+module_logger = logging.getLogger(__name__)
+
+
+def get_upload_journal_directory() -> Path:
+    return Path(os.environ.get(UPLOAD_JOURNAL_DIRECTORY_ENV_VAR) or Path.home() / ".azureml" / "upload_journals")
+
+
+class UploadJournal(object):
+    """Local record of the blocks of a blob that have already been staged.
+
+    The first line of the journal file describes the source file (size, mtime_ns, inode) and the
+    block size; each following line is a staged block id. Block ids are derived from that
+    description, so blocks staged for an older version of the file never match the current one,
+    and a journal written for a different version or block size is discarded.
+    """
+
+    def __init__(self, account_url: str, container: str, blob_name: str, source: Union[str, os.PathLike],
+                 block_size: int):
+        stat_result = os.stat(str(source))
+        blob_url = f"{account_url.rstrip('/')}/{container}/{blob_name}"
+        self._header = {
+            "blob": blob_url,
+            "file_signature": f"{stat_result.st_size}:{stat_result.st_mtime_ns}:{stat_result.st_ino}",
+            "block_size": block_size,
+        }  # type: Dict[str, Any]
+        journal_name = hashlib.md5(blob_url.encode()).hexdigest() + ".journal"
+        self._path = get_upload_journal_directory() / journal_name
+        self._block_id_prefix = hashlib.md5(json.dumps(self._header, sort_keys=True).encode()).hexdigest()[:16]
+        self._lock = threading.Lock()
+        self._staged_block_ids = self._load()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def staged_block_ids(self) -> Set[str]:
+        return set(self._staged_block_ids)
+
+    def get_block_id(self, index: int) -> str:
+        # all block ids of a blob must have the same length
+        return base64.b64encode(f"{self._block_id_prefix}-{index:06d}".encode()).decode()
+
+    def mark_staged(self, block_id: str) -> None:
+        with self._lock:
+            self._staged_block_ids.add(block_id)
+            try:
+                with open(str(self._path), "a") as f:
+                    f.write(block_id + "\n")
+            except OSError as e:
+                module_logger.debug("Unable to update upload journal %s: %s", self._path, e)
+
+    def delete(self) -> None:
+        try:
+            self._path.unlink()
+        except OSError:
+            pass
+
+    def _load(self) -> Set[str]:
+        try:
+            with open(str(self._path), "r") as f:
+                lines = f.read().splitlines()
+            if lines and json.loads(lines[0]) == self._header:
+                return set(line for line in lines[1:] if line)
+        except (OSError, ValueError):
+            pass
+
+        # start a new journal for this version of the file
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(str(self._path), "w") as f:
+                f.write(json.dumps(self._header, sort_keys=True) + "\n")
+        except OSError as e:
+            module_logger.debug("Unable to create upload journal %s: %s", self._path, e)
+        return set()
@@ -0,0 +1,8 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+from ._default_storage_helper import DefaultStorageClient
+from ._artifact_utilities import upload_artifact
+
+__all__ = ["DefaultStorageClient", "upload_artifact"]
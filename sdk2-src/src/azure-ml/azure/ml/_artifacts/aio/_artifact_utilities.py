@@ -0,0 +1,108 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import asyncio
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Union, Tuple
+from pathlib import Path
+
+from azure.ml._restclient.machinelearningservices.models import AssetPath
+from azure.ml._utils._arm_id_utils import get_datastore_arm_id
+from azure.ml._utils._asset_utils import _validate_path, get_object_hash
+from azure.ml._utils._ignore_file import IgnoreFile
+from azure.ml._utils._storage_utils import STORAGE_ACCOUNT_URLS
+from azure.ml._workspace_dependent_operations import WorkspaceScope
+from azure.ml._artifacts._artifact_utilities import _get_datastore_info
+from azure.ml._artifacts.constants import MAX_CONCURRENCY
+from ._default_storage_helper import DefaultStorageClient
+
+if TYPE_CHECKING:
+    # azure.ml.aio imports this module
+    from azure.ml.aio._operations import DatastoreOperations
+
+ASYNC_SUPPORTED_STORAGE_TYPES = ["AzureBlob", "AzureDataLakeGen2"]
+
+
+def get_storage_client(credential: str, container_name: str, storage_account: str,
+                       storage_type: str) -> DefaultStorageClient:
+    """
+    Return an asynchronous storage client class instance based on the storage account type
+    """
+    if storage_type not in ASYNC_SUPPORTED_STORAGE_TYPES:
+        raise Exception(
+            f"Datastore type {storage_type} is not supported. Supported storage"
+            f"types for asynchronous artifact upload include: {*ASYNC_SUPPORTED_STORAGE_TYPES,}"
+        )
+    account_url = STORAGE_ACCOUNT_URLS[storage_type].format(storage_account)
+    return DefaultStorageClient(credential=credential, container_name=container_name, account_url=account_url)
+
+
+async def upload_artifact(local_path: str, datastore_operation: "DatastoreOperations",
+                          datastore_name: Optional[str], asset_hash: str = None, show_progress: bool = True,
+                          include_container_in_asset_path: bool = True,
+                          max_concurrency: int = MAX_CONCURRENCY,
+                          ignore_file: Optional[IgnoreFile] = None) -> AssetPath:
+    """
+    Upload local file or directory to datastore without blocking the event loop
+    """
+    datastore_info = _get_datastore_info(await datastore_operation.show(datastore_name, include_secrets=True))
+    async with get_storage_client(**datastore_info) as storage_client:
+        uploaded_asset_id = await storage_client.upload(local_path, asset_hash=asset_hash,
+                                                        show_progress=show_progress,
+                                                        max_concurrency=max_concurrency,
+                                                        ignore_file=ignore_file)
+
+    # work around a bug in MFE that requires some asset paths to include the container name
+    # and others to exclude it
+    if include_container_in_asset_path:
+        asset_path = AssetPath(
+            path=f'{datastore_info["container_name"]}/{uploaded_asset_id}', is_directory=os.path.isdir(local_path)
+        )
+    else:
+        asset_path = AssetPath(path=f"{uploaded_asset_id}", is_directory=os.path.isdir(local_path))
+
+    return asset_path
+
+
+async def _upload_to_datastore(workspace_scope: WorkspaceScope, datastore_operation: "DatastoreOperations",
+                               path: Union[str, Path, os.PathLike], datastore_name: str = None,
+                               show_progress: bool = True,
+                               include_container_in_asset_path: bool = False,
+                               max_concurrency: int = MAX_CONCURRENCY,
+                               asset_hash: Optional[str] = None,
+                               ignore_file: Optional[IgnoreFile] = None) -> Tuple[AssetPath, str]:
+    """
+    Upload local file or directory to datastore, once per content for the lifetime of the datastore operations
+
+    Asynchronous counterpart of azure.ml._artifacts._artifact_utilities._upload_to_datastore.
+    """
+    _validate_path(path)
+    if not datastore_name:
+        datastore_name = (await datastore_operation.get_default()).name
+    if not asset_hash:
+        # hashing is blocking, so it runs on the default executor
+        asset_hash = await asyncio.get_event_loop().run_in_executor(
+            None, partial(get_object_hash, path, ignore_file=ignore_file)
+        )
+
+    async def upload() -> Tuple[AssetPath, str]:
+        asset_path = await upload_artifact(str(path), datastore_operation, datastore_name,
+                                           show_progress=show_progress,
+                                           asset_hash=asset_hash,
+                                           include_container_in_asset_path=include_container_in_asset_path,
+                                           max_concurrency=max_concurrency,
+                                           ignore_file=ignore_file)
+        return asset_path, get_datastore_arm_id(datastore_name, workspace_scope)
+
+    memo_key = (
+        workspace_scope.subscription_id,
+        workspace_scope.resource_group_name,
+        workspace_scope.workspace_name,
+        datastore_name,
+        str(Path(path).resolve()),
+        asset_hash,
+        include_container_in_asset_path,
+    )
+    return await datastore_operation._upload_memo.get_or_load_async(memo_key, upload)
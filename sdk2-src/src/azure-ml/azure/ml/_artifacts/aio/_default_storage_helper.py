@@ -0,0 +1,206 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import asyncio
+import base64
+import math
+import os
+from typing import Any, List, Optional
+from tqdm import tqdm
+from pathlib import PurePosixPath, Path
+
+from azure.storage.blob import BlobBlock
+from azure.storage.blob.aio import BlobServiceClient
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ml._utils._asset_utils import generate_asset_id, get_directory_upload_paths, AssetNotChangedError
+from azure.ml._utils._ignore_file import IgnoreFile
+from azure.ml._artifacts.constants import UPLOAD_CONFIRMATION, MAX_CONCURRENCY, BLOB_BLOCK_SIZE
+
+
+class DefaultStorageClient:
+    """Asynchronous counterpart of azure.ml._artifacts._default_storage_helper.DefaultStorageClient
+
+    All files of a directory are uploaded from a single event loop, with a semaphore bounding
+    the number of requests in flight instead of one thread per file. The directory walk and the
+    file reads run on the default executor, so they never block the event loop.
+    """
+
+    def __init__(self, credential: str, container_name: str, account_url: str):
+        self.service_client = BlobServiceClient(account_url=account_url, credential=credential)
+        self.container_client = self.service_client.get_container_client(container=container_name)
+        self.container = container_name
+        self.total_file_count = 1
+        self.uploaded_file_count = 0
+        self.overwrite = False
+        self.indicator_file = None
+
+    async def __aenter__(self) -> "DefaultStorageClient":
+        await self.service_client.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.service_client.__aexit__(*args)
+
+    async def close(self) -> None:
+        await self.service_client.close()
+
+    async def upload(self, source: str, asset_hash: str = None, show_progress: bool = True,
+                     max_concurrency: int = MAX_CONCURRENCY, ignore_file: Optional[IgnoreFile] = None) -> str:
+        """
+        Upload a file or directory to a path inside the container
+
+        :param max_concurrency: Maximum number of blob uploads in flight at once for a directory,
+            or number of chunks uploaded in parallel for a single file.
+        :param ignore_file: Files of a directory excluded from the upload, defaults to its .amlignore file.
+        """
+        asset_id = generate_asset_id(asset_hash, include_directory=True)
+        source_name = Path(source).name
+        dest = str(PurePosixPath(asset_id, source_name))
+
+        try:
+            # truncate path longer than 50 chars for terminal display
+            if show_progress and len(source_name) >= 50:
+                formatted_path = '{:.47}'.format(source_name) + "..."
+            else:
+                formatted_path = source_name
+            msg = f"Uploading {formatted_path}"
+
+            if os.path.isdir(source):
+                await self.upload_dir(source, asset_id, msg, show_progress, max_concurrency=max_concurrency,
+                                      ignore_file=ignore_file)
+            else:
+                self.indicator_file = dest
+                await self.check_blob_exists()
+                await self.upload_file(source, dest, msg, show_progress, max_concurrency=max_concurrency)
+
+            # upload must be completed before we try to generate confirmation file
+            if self.uploaded_file_count < self.total_file_count:
+                raise Exception(
+                    f"Upload of {source} did not complete: {self.uploaded_file_count} of "
+                    f"{self.total_file_count} files uploaded."
+                )
+            await self._set_confirmation_metadata()
+        except AssetNotChangedError:
+            pass
+
+        return dest
+
+    async def upload_file(self, source: str, dest: str, msg: Optional[str] = None,
+                          show_progress: Optional[bool] = None, in_directory: bool = False,
+                          max_concurrency: int = 1) -> None:
+        """
+        Upload a single file to a path inside the container
+
+        Files larger than BLOB_BLOCK_SIZE are read and staged one block at a time, at most
+        `max_concurrency` blocks at once, so a large file is never held in memory as a whole.
+        """
+        loop = asyncio.get_event_loop()
+        file_size = (await loop.run_in_executor(None, os.stat, source)).st_size
+        validate_content = file_size > 0  # don't do checksum for empty files
+
+        progress_bar = tqdm(total=1, desc=msg) if show_progress and not in_directory else None
+        if file_size > BLOB_BLOCK_SIZE:
+            await self._upload_file_in_blocks(source, dest, file_size, max_concurrency)
+        else:
+            data = await loop.run_in_executor(None, _read_range, source, 0, file_size)
+            await self.container_client.upload_blob(name=dest, data=data, validate_content=validate_content,
+                                                    overwrite=self.overwrite, max_concurrency=max_concurrency)
+        if progress_bar:
+            progress_bar.update(1)
+            progress_bar.close()
+        self.uploaded_file_count = self.uploaded_file_count + 1
+
+    async def _upload_file_in_blocks(self, source: str, dest: str, file_size: int, max_concurrency: int) -> None:
+        loop = asyncio.get_event_loop()
+        blob_client = self.container_client.get_blob_client(blob=dest)
+        block_count = math.ceil(file_size / BLOB_BLOCK_SIZE)
+        # all block ids of a blob must have the same length
+        block_ids = [base64.b64encode(f"{index:06d}".encode()).decode() for index in range(block_count)]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def stage_block(index: int) -> None:
+            async with semaphore:
+                data = await loop.run_in_executor(None, _read_range, source, index * BLOB_BLOCK_SIZE, BLOB_BLOCK_SIZE)
+                await blob_client.stage_block(block_id=block_ids[index], data=data, validate_content=True)
+
+        await _gather_or_cancel([asyncio.ensure_future(stage_block(index)) for index in range(len(block_ids))])
+        await blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids])
+
+    async def upload_dir(self, source: str, dest: str, msg: str, show_progress: bool,
+                         max_concurrency: int = MAX_CONCURRENCY, ignore_file: Optional[IgnoreFile] = None) -> None:
+        """
+        Upload a directory to a path inside the container
+
+        Azure Blob doesn't allow metadata setting at the directory level, so the first
+        file in the directory is designated as the file where the confirmation metadata
+        will be added at the end of the upload.
+
+        At most `max_concurrency` uploads are in flight at once. If any upload fails, the
+        remaining uploads are cancelled and the first error is re-raised.
+        """
+        source_path = Path(source).resolve()
+        prefix = "" if dest == "" else dest + "/"
+        prefix += os.path.basename(source_path) + "/"
+
+        upload_paths = await asyncio.get_event_loop().run_in_executor(
+            None, get_directory_upload_paths, source_path, prefix, ignore_file
+        )
+        self.indicator_file = upload_paths[0][1]
+        await self.check_blob_exists()
+
+        self.total_file_count = len(upload_paths)
+        progress_bar = tqdm(total=self.total_file_count, desc=msg) if show_progress else None
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _upload(src: str, blob: str) -> None:
+            async with semaphore:
+                await self.upload_file(src, blob, in_directory=True)
+            if progress_bar:
+                progress_bar.update(1)
+
+        try:
+            await _gather_or_cancel([asyncio.ensure_future(_upload(src, blob)) for src, blob in upload_paths])
+        finally:
+            if progress_bar:
+                progress_bar.close()
+
+    async def check_blob_exists(self) -> None:
+        """
+        Throw error if blob already exists.
+
+        Check if blob already exists in container by checking the indicator file metadata for
+        existence and confirmation data. If confirmation data is missing, blob does not exist
+        or was only partially uploaded and the partial upload will be overwritten with a complete
+        upload.
+        """
+        blob_client = self.container_client.get_blob_client(blob=self.indicator_file)
+        try:
+            properties = await blob_client.get_blob_properties()
+            if properties.get("metadata") == UPLOAD_CONFIRMATION:
+                raise AssetNotChangedError
+            else:
+                self.overwrite = True
+        except ResourceNotFoundError:
+            pass
+
+    async def _set_confirmation_metadata(self) -> None:
+        blob_client = self.container_client.get_blob_client(blob=self.indicator_file)
+        await blob_client.set_blob_metadata(UPLOAD_CONFIRMATION)
+
+
+def _read_range(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+async def _gather_or_cancel(tasks: List["asyncio.Future[None]"]) -> None:
+    """Awaits every task; if one fails, the others are cancelled and the first error is re-raised"""
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
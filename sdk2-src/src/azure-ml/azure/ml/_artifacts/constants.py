@@ -3,7 +3,28 @@
 # ---------------------------------------------------------
 
 
-CHUNK_SIZE = 1024
+CHUNK_SIZE = 1024 * 1024
+MAX_CONCURRENCY = 10
+BLOCK_UPLOAD_THRESHOLD = 256 * 1024 * 1024
+BLOB_BLOCK_SIZE = 16 * 1024 * 1024
+UPLOAD_JOURNAL_DIRECTORY_ENV_VAR = "AZUREML_UPLOAD_JOURNAL_DIRECTORY"
+CONTENT_DIRECTORY = "content"
+MANIFEST_DIRECTORY = "manifests"
+CONTENT_POINTER_METADATA_KEY = "path"
+DEDUPE_MIN_FILE_SIZE = 1024 * 1024
+DEDUPE_ENV_VAR = "AZUREML_UPLOAD_DEDUPE"
+SYNC_COPY_MAX_SIZE = 256 * 1024 * 1024
+COPY_POLL_INTERVAL_SECONDS = 1
+COPY_SOURCE_SAS_EXPIRY_SECONDS = 60 * 60
+HASH_INDEX_FILE_NAME = "asset_hash_index.json"
+HASH_INDEX_VERSION = 2
+HASH_INDEX_MAX_ENTRIES = 10000
+HASH_INDEX_MAX_FILE_ENTRIES = 100000
+HASH_INDEX_RACY_WINDOW_SECONDS = 2
+HASH_INDEX_PATH_ENV_VAR = "AZUREML_ASSET_HASH_INDEX_PATH"
+HASH_INDEX_DISABLE_ENV_VAR = "AZUREML_DISABLE_ASSET_HASH_INDEX"
+HASH_MAX_WORKERS = 8
+LEGACY_HASH_ENV_VAR = "AZUREML_LEGACY_ASSET_HASH"
 AZ_ML_ARTIFACT_DIRECTORY = "az-ml-artifacts"
 UPLOAD_CONFIRMATION = {'upload_status': 'COMPLETED'}
 ASSET_PATH_ERROR = "(UserError) Asset paths cannot be updated."
@@ -11,3 +32,25 @@ CHANGED_ASSET_PATH_MSG = "The code asset {name}:{version} is already linked to a
                          "in your datastore that does not match the content from your `directory` param " \
                          "and cannot be overwritten. Please provide a unique name or version " \
                          "to successfully create a new code asset."
+STORAGE_CLIENT_POOL_MAX_SIZE = 16
+AML_IGNORE_FILE_NAME = ".amlignore"
+GIT_IGNORE_FILE_NAME = ".gitignore"
+SNAPSHOT_ARCHIVE_EXTENSION = ".tar.gz"
+SNAPSHOT_DIRECTORY_SUFFIX = ".snapshot"
+SNAPSHOT_MANIFEST_NAME = ".amlsnapshot.json"
+SNAPSHOT_MANIFEST_VERSION = 1
+SNAPSHOT_COMPRESS_LEVEL = 6
+SNAPSHOT_QUEUE_SIZE = 8
+SNAPSHOT_ENV_VAR = "AZUREML_CODE_SNAPSHOT_ARCHIVE"
+ADAPTIVE_CONCURRENCY_MAX = 64
+ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR = "AZUREML_DISABLE_ADAPTIVE_CONCURRENCY"
+UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR = "AZUREML_UPLOAD_MAX_BYTES_PER_SECOND"
+THROTTLE_STATUS_CODES = (429, 503)
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+THROTTLE_MAX_ATTEMPTS = 5
+THROTTLE_BACKOFF_SECONDS = 1
+THROTTLE_BACKOFF_MAX_SECONDS = 30
+THROUGHPUT_TOLERANCE = 0.1
+LATENCY_SPIKE_FACTOR = 4
+LATENCY_MIN_SAMPLES = 10
+LATENCY_SIZE_FLOOR = 256 * 1024
@@ -4,16 +4,39 @@
 
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)  # type: ignore
 
-from .compute_operations import ComputeOperations
-from .datastore_operations import DatastoreOperations
-from .job_operations import JobOperations
-from .workspace_operations import WorkspaceOperations
-from .model_operations import ModelOperations
-from .endpoint_operations import EndpointOperations
-from .data_operations import DataOperations
-from .code_operations import CodeOperations
-from .run_operations import RunOperations
-from .environment_operations import EnvironmentOperations
+from typing import TYPE_CHECKING
+
+from azure.ml._utils._lazy_import import lazy_exports
+
+# the same names, for type checkers and IDEs
+if TYPE_CHECKING:
+    from .compute_operations import ComputeOperations
+    from .datastore_operations import DatastoreOperations
+    from .job_operations import JobOperations
+    from .workspace_operations import WorkspaceOperations
+    from .model_operations import ModelOperations
+    from .endpoint_operations import EndpointOperations
+    from .data_operations import DataOperations
+    from .code_operations import CodeOperations
+    from .run_operations import RunOperations
+    from .environment_operations import EnvironmentOperations
+
+# each operation group is imported when it is first used
+lazy_exports(
+    __name__,
+    {
+        "ComputeOperations": ".compute_operations",
+        "DatastoreOperations": ".datastore_operations",
+        "JobOperations": ".job_operations",
+        "WorkspaceOperations": ".workspace_operations",
+        "ModelOperations": ".model_operations",
+        "EndpointOperations": ".endpoint_operations",
+        "DataOperations": ".data_operations",
+        "CodeOperations": ".code_operations",
+        "RunOperations": ".run_operations",
+        "EnvironmentOperations": ".environment_operations",
+    },
+)
 
 __all__ = [
     "ComputeOperations",
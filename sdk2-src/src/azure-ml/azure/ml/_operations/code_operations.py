@@ -2,8 +2,12 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
+import math
 import os
+import uuid
+from pathlib import Path
 from typing import Union, Optional, Dict
+from azure.core.exceptions import ResourceNotFoundError
 from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope
 from azure.ml._restclient.machinelearningservices._azure_machine_learning_workspaces import (
     AzureMachineLearningWorkspaces,
@@ -15,17 +19,35 @@ from azure.ml._restclient.machinelearningservices.models import (
     CodeContainerResource,
 )
 from azure.ml._operations.datastore_operations import DatastoreOperations
-from azure.ml._utils._asset_utils import _parse_name_version
+from azure.ml._utils._asset_utils import _parse_name_version, get_object_hash
+from azure.ml._utils._ignore_file import get_ignore_file
+from azure.ml._utils._ttl_cache import TTLCache
 from azure.ml._artifacts._artifact_utilities import _upload_to_datastore
+from azure.ml._artifacts._snapshot import use_snapshot_archive
 from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
 from azure.ml._artifacts.constants import ASSET_PATH_ERROR, CHANGED_ASSET_PATH_MSG
 
+_CODE_ASSET_NAMESPACE = uuid.UUID("b458ac4a-b43d-41b5-9543-ebeda1589da9")
+
+
+def _code_asset_name(asset_hash: str, path: Path, snapshot: bool) -> str:
+    """Returns the guid naming code registered on behalf of jobs and deployments, the same for the same content
+
+    The name is derived from the content hash, the file or directory name and whether the code is
+    uploaded as a snapshot archive, which together determine its asset path.
+    """
+    return str(uuid.uuid5(_CODE_ASSET_NAMESPACE, f"{asset_hash}/{path.name}/{snapshot}"))
+
 
 class CodeOperations(_WorkspaceDependentOperations):
     """Represents a client for performing operations on code assets
 
     You should not instantiate this class directly. Instead, you should create MLClient and
     use this client via the property MLClient.code
+
+    Code registered on behalf of jobs and deployments is named after its content, so submitting the
+    same code again reuses the existing code asset instead of uploading and registering a new one.
+    The lookup is remembered for the lifetime of the client.
     """
 
     def __init__(
@@ -41,6 +63,7 @@ class CodeOperations(_WorkspaceDependentOperations):
         self._container_operation = service_client.code_containers
         self._datastore_operation = datastore_operations
         self._init_kwargs = kwargs
+        self._registration_memo = TTLCache(math.inf)
 
     def create(
         self,
@@ -49,12 +72,30 @@ class CodeOperations(_WorkspaceDependentOperations):
         version: str = None,
         datastore_name: Optional[str] = None,
         show_progress: bool = True,
+        snapshot: Optional[bool] = None,
+        dedupe: Optional[bool] = None,
     ) -> CodeVersionResource:
         """Creates a versioned code asset from the given file or directory and uploads it to a datastore.
 
         If no datastore is provided, the code asset will be uploaded to the MLClient's workspace default datastore.
+        If snapshot is set (it defaults to the AZUREML_CODE_SNAPSHOT_ARCHIVE environment variable), a directory is
+        uploaded as a single compressed archive and the asset path of the code asset points at that archive.
+        If dedupe is set (it defaults to the AZUREML_UPLOAD_DEDUPE environment variable), files of a directory whose
+        content the blob datastore already holds are copied on the service side instead of being uploaded again.
         """
+        return self._create(name, directory, version, datastore_name, show_progress, snapshot, dedupe=dedupe)
 
+    def _create(
+        self,
+        name: str,
+        directory: Union[str, os.PathLike],
+        version: str = None,
+        datastore_name: Optional[str] = None,
+        show_progress: bool = True,
+        snapshot: Optional[bool] = None,
+        asset_hash: Optional[str] = None,
+        dedupe: Optional[bool] = None,
+    ) -> CodeVersionResource:
         asset_path, datastore_resource_id = _upload_to_datastore(
             self._workspace_scope,
             self._datastore_operation,
@@ -62,6 +103,10 @@ class CodeOperations(_WorkspaceDependentOperations):
             datastore_name=datastore_name,
             show_progress=show_progress,
             include_container_in_asset_path=False,
+            snapshot=use_snapshot_archive(snapshot),
+            asset_hash=asset_hash,
+            ignore_file=get_ignore_file(directory, use_gitignore=True),
+            dedupe=dedupe,
         )
 
         code_version = CodeVersion(asset_path=asset_path, datastore_id=datastore_resource_id)
@@ -109,6 +154,24 @@ class CodeOperations(_WorkspaceDependentOperations):
                 **self._init_kwargs,
             )
 
+    def _get_or_create(self, path: Union[str, os.PathLike]) -> CodeVersionResource:
+        """Returns the code asset registered for the content at path, registering it if there is none"""
+        path = Path(path).resolve()
+        asset_hash = get_object_hash(path, ignore_file=get_ignore_file(path, use_gitignore=True))
+        snapshot = use_snapshot_archive(None)
+        # Code resource IDs must be guids
+        name = _code_asset_name(asset_hash, path, snapshot)
+        key = (self._subscription_id, self._resource_group_name, self._workspace_name, name)
+
+        def load() -> CodeVersionResource:
+            version = str(self._version_gen())
+            try:
+                return self.show(f"{name}:{version}")
+            except ResourceNotFoundError:
+                return self._create(name, str(path), version, snapshot=snapshot, asset_hash=asset_hash)
+
+        return self._registration_memo.get_or_load(key, load)
+
     @staticmethod  # will likely become instance method once an actual generator is designed
     def _version_gen() -> int:
         # TODO: implement the real version generator
@@ -2,9 +2,17 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
-from typing import Dict, Iterable
+import copy
+import logging
+import math
+import os
+from typing import Dict, Iterable, Optional
 
-from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
+from azure.ml.constants import (
+    API_VERSION_2020_09_01_PREVIEW,
+    DATASTORE_CACHE_TTL_ENV_VAR,
+    DATASTORE_CACHE_TTL_SECONDS,
+)
 from azure.ml._datastore.datastore_utilities import create_azure_blob_storage_request
 from azure.ml._restclient.machinelearningservices._azure_machine_learning_workspaces import (
     AzureMachineLearningWorkspaces,
@@ -14,20 +22,50 @@ from azure.ml._restclient.machinelearningservices.models import (
     DatastorePropertiesResource,
     DatastorePropertiesResourceArmPaginatedResult,
 )
+from azure.ml._utils._ttl_cache import TTLCache
 from azure.ml._workspace_dependent_operations import WorkspaceScope, _WorkspaceDependentOperations
 
+module_logger = logging.getLogger(__name__)
+
+
+def _get_cache_ttl() -> float:
+    """Returns the datastore cache TTL in seconds from AZUREML_DATASTORE_CACHE_TTL_SECONDS"""
+    value = os.environ.get(DATASTORE_CACHE_TTL_ENV_VAR)
+    if value is None:
+        return DATASTORE_CACHE_TTL_SECONDS
+    try:
+        return float(value)
+    except ValueError:
+        module_logger.warning(
+            "Ignoring invalid %s value '%s', datastores are cached for %s seconds.",
+            DATASTORE_CACHE_TTL_ENV_VAR,
+            value,
+            DATASTORE_CACHE_TTL_SECONDS,
+        )
+        return DATASTORE_CACHE_TTL_SECONDS
 
 class DatastoreOperations(_WorkspaceDependentOperations):
     """Represents a client for performing operations on Datastores
 
     You should not instantiate this class directly. Instead, you should create MLClient and
     use this client via the property MLClient.datastores
+
+    Datastore resources, the name of the default datastore and datastore credentials are cached
+    per workspace for AZUREML_DATASTORE_CACHE_TTL_SECONDS seconds (300 by default, 0 disables the
+    cache). Use invalidate_cache after changing a datastore outside of this client.
+
+    Uploads to the datastores of this client are also remembered by local path and content hash for
+    the lifetime of the client, so the same unchanged file or directory is only uploaded once.
     """
 
     def __init__(self, workspace_scope: WorkspaceScope, service_client: AzureMachineLearningWorkspaces, **kwargs: Dict):
         super(DatastoreOperations, self).__init__(workspace_scope)
         self._operation = service_client.datastores
         self._init_kwargs = kwargs
+        cache_ttl = _get_cache_ttl()
+        self._resource_cache = TTLCache(cache_ttl)
+        self._secret_cache = TTLCache(cache_ttl)
+        self._upload_memo = TTLCache(math.inf)
 
     def list(self, include_secrets: bool = False) -> Iterable[DatastorePropertiesResourceArmPaginatedResult]:
         """Lists all datastores and associated information within a workspace"""
@@ -43,7 +81,7 @@ class DatastoreOperations(_WorkspaceDependentOperations):
         # TODO: remove this when service side allows getting secrets directly through list
         if include_secrets:
             for ds in ds_list:
-                ds_credentials = self._list_secrets(ds.name)  # type: ignore
+                ds_credentials = self._get_secrets(ds.name)  # type: ignore
                 if ds.properties.contents.azure_storage:  # type: ignore
                     ds.properties.contents.azure_storage.credentials = ds_credentials  # type: ignore
         return ds_list
@@ -62,47 +100,85 @@ class DatastoreOperations(_WorkspaceDependentOperations):
         """Deletes a datastore reference with the given name from the workspace. This method
         does not delete the actual datastore or underlying data in the datastore.
         """
-        return self._operation.delete(
-            datastore_name,
-            self._workspace_scope.subscription_id,
-            self._workspace_scope.resource_group_name,
-            self._workspace_name,
-            api_version=API_VERSION_2020_09_01_PREVIEW,
-            **self._init_kwargs
-        )
+        try:
+            return self._operation.delete(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            )
+        finally:
+            self.invalidate_cache(datastore_name)
 
     def show(self, datastore_name: str, include_secrets: bool = False) -> DatastorePropertiesResource:
         """Returns information about the datastore referenced by the given name"""
-        datastore_properties = self._operation.get(
-            datastore_name,
-            self._workspace_scope.subscription_id,
-            self._workspace_scope.resource_group_name,
-            self._workspace_name,
-            api_version=API_VERSION_2020_09_01_PREVIEW,
-            **self._init_kwargs
+        datastore_properties = self._resource_cache.get_or_load(
+            self._cache_key(datastore_name),
+            lambda: self._operation.get(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            ),
+        )
+        return self._with_secrets(datastore_properties, include_secrets)
+
+    def get_default(self, include_secrets: bool = False) -> DatastorePropertiesResource:
+        def load_default() -> DatastorePropertiesResource:
+            ds = self._operation.list(
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                is_default=True,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            ).next()
+            if ds.name:
+                self._resource_cache.put(self._cache_key(ds.name), ds)
+            return ds
+
+        ds = self._resource_cache.get_or_load(self._cache_key(None), load_default)
+        return self._with_secrets(ds, include_secrets)
+
+    def invalidate_cache(self, datastore_name: Optional[str] = None) -> None:
+        """Drops the cached resource and credentials of the given datastore, or of every datastore if
+        no name is given. The default datastore is looked up again in both cases.
+        """
+        self._resource_cache.invalidate(self._cache_key(None))
+        if datastore_name is None:
+            self._resource_cache.invalidate()
+            self._secret_cache.invalidate()
+        else:
+            self._resource_cache.invalidate(self._cache_key(datastore_name))
+            self._secret_cache.invalidate(self._cache_key(datastore_name))
+
+    def _get_secrets(self, datastore_name: str) -> DatastoreCredentials:
+        return self._secret_cache.get_or_load(
+            self._cache_key(datastore_name), lambda: self._list_secrets(datastore_name)
         )
+
+    def _with_secrets(
+        self, datastore_properties: DatastorePropertiesResource, include_secrets: bool
+    ) -> DatastorePropertiesResource:
+        datastore_name = datastore_properties.name
+        # callers get their own copy, so cached resources never carry credentials
+        datastore_properties = copy.deepcopy(datastore_properties)
         # TODO: remove this when services allow getting secrets with just _operation.get
         if include_secrets:
-            if datastore_properties.name:
-                datastore_credentials = self._list_secrets(datastore_properties.name)
+            if datastore_name:
+                datastore_credentials = self._get_secrets(datastore_name)
                 if datastore_properties.properties.contents.azure_storage:
                     datastore_properties.properties.contents.azure_storage.credentials = datastore_credentials
         return datastore_properties
 
-    def get_default(self, include_secrets: bool = False) -> DatastorePropertiesResource:
-        ds = self._operation.list(
-            self._workspace_scope.subscription_id,
-            self._workspace_scope.resource_group_name,
-            self._workspace_name,
-            is_default=True,
-            api_version=API_VERSION_2020_09_01_PREVIEW,
-            **self._init_kwargs
-        ).next()
-        if include_secrets:
-            ds_secret = self._list_secrets(ds.name)  # type: ignore
-            if ds.properties.contents.azure_storage:
-                ds.properties.contents.azure_storage.credentials = ds_secret
-        return ds
+    def _cache_key(self, datastore_name: Optional[str]) -> tuple:
+        # None stands for the default datastore of the workspace
+        return (self._workspace_scope.subscription_id, self._workspace_scope.resource_group_name,
+                self._workspace_name, datastore_name)
 
     def attach_azure_blob_storage(
         self,
@@ -138,11 +214,14 @@ class DatastoreOperations(_WorkspaceDependentOperations):
             endpoint=endpoint,
             blob_cache_timeout=blob_cache_timeout,
         )
-        return self._operation.create_or_update(
-            datastore_name,
-            self._workspace_scope.subscription_id,
-            self._workspace_scope.resource_group_name,
-            self._workspace_name,
-            request_body,
-            api_version=API_VERSION_2020_09_01_PREVIEW,
-        )
+        try:
+            return self._operation.create_or_update(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                request_body,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+            )
+        finally:
+            self.invalidate_cache(datastore_name)
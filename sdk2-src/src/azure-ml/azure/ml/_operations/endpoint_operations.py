@@ -5,7 +5,8 @@
 import os
 from pathlib import Path
 import random
-from typing import Iterable, Union, Optional, Any, Dict
+from functools import partial
+from typing import Callable, Iterable, List, Union, Optional, Any, Dict, Tuple
 from azure.ml._restclient.machinelearningservices._azure_machine_learning_workspaces import (
     AzureMachineLearningWorkspaces,
 )
@@ -39,8 +40,8 @@ from azure.ml._utils.utils import load_yaml
 from .operation_orchestrator import OperationOrchestrator
 from azure.ml._schema._endpoint.code_configuration_schema import InternalCodeConfiguration
 from azure.ml.constants import OperationTypes
-from azure.ml._arm_deployments import OnlineEndpointArmGenerator, ArmDeploymentExecutor
-from azure.identity import ChainedTokenCredential
+from azure.ml import _arm_deployments
+from azure.core.credentials import TokenCredential
 
 
 class EndpointOperations(_WorkspaceDependentOperations):
@@ -49,7 +50,7 @@ class EndpointOperations(_WorkspaceDependentOperations):
         workspace_scope: WorkspaceScope,
         service_client: AzureMachineLearningWorkspaces,
         all_operations: OperationsContainer,
-        credentials: ChainedTokenCredential = None,
+        credentials: TokenCredential = None,
         **kwargs: Dict,
     ):
         super(EndpointOperations, self).__init__(workspace_scope)
@@ -185,20 +186,42 @@ class EndpointOperations(_WorkspaceDependentOperations):
             raise Exception("Endpoint type is a required parameter.")
 
     def _load_code_configuration(self, endpoint: Union[InternalOnlineEndpoint, InternalBatchEndpoint]):
+        """Resolves the code, environment and model of every deployment concurrently
+
+        A dependency shared by several deployments is resolved, and uploaded, only once.
+        """
         orchestrators = OperationOrchestrator(
             operation_container=self._all_operations, workspace_scope=self._workspace_scope
         )
 
         # Online and batch deployments have different signature but code_configuration field is the same
+        descriptions = {}  # type: Dict[Tuple[str, Any], str]
+        resolvers = {}  # type: Dict[str, Callable[[], Any]]
         for deployment_name, deployment in endpoint.deployments.items():
-            deployment.code_configuration = InternalCodeConfiguration(
-                code=orchestrators.get_code_asset_arm_id(
-                    code_asset=deployment.code_configuration.code, register_asset=False
+            code = deployment.code_configuration.code
+            dependencies = [  # type: List[Tuple[str, Any, Callable[[], Any]]]
+                ("code", code, partial(orchestrators.get_code_asset_arm_id, code_asset=code, register_asset=False)),
+                (
+                    "environment",
+                    deployment.environment,
+                    partial(orchestrators.get_environment_arm_id, environment=deployment.environment),
                 ),
+                ("model", deployment.model, partial(orchestrators.get_model_arm_id, model=deployment.model)),
+            ]
+            for kind, dependency, resolver in dependencies:
+                key = _dependency_key(kind, dependency)
+                if key not in descriptions:
+                    descriptions[key] = f"{kind} of deployment {deployment_name}"
+                    resolvers[descriptions[key]] = resolver
+
+        resolved = orchestrators.resolve_all(resolvers)
+        for deployment in endpoint.deployments.values():
+            deployment.code_configuration = InternalCodeConfiguration(
+                code=resolved[descriptions[_dependency_key("code", deployment.code_configuration.code)]],
                 scoring_script=deployment.code_configuration.scoring_script,
             )
-            deployment.environment = orchestrators.get_environment_arm_id(environment=deployment.environment)
-            deployment.model = orchestrators.get_model_arm_id(model=deployment.model)
+            deployment.environment = resolved[descriptions[_dependency_key("environment", deployment.environment)]]
+            deployment.model = resolved[descriptions[_dependency_key("model", deployment.model)]]
 
     def _get_workspace_location(self, workspace_name: str) -> str:
         return self._all_operations.all_operations[OperationTypes.WORKSPACES].get(workspace_name).location
@@ -241,14 +264,14 @@ class EndpointOperations(_WorkspaceDependentOperations):
             internal_endpoint.name = name
 
         # generate online endpoint arm template
-        arm_generator = OnlineEndpointArmGenerator(
+        arm_generator = _arm_deployments.OnlineEndpointArmGenerator(
             operation_container=self._all_operations, workspace_scope=self._workspace_scope
         )
         template, resources_being_deployed = arm_generator.generate_online_endpoint_template(
             workspace_name=self._workspace_name, location=location, endpoint=internal_endpoint
         )
         print(template)
-        arm_submit = ArmDeploymentExecutor(
+        arm_submit = _arm_deployments.ArmDeploymentExecutor(
             credentials=self._credentials,
             resource_group_name=self._resource_group_name,
             subscription_id=self._subscription_id,
@@ -419,3 +442,8 @@ class EndpointOperations(_WorkspaceDependentOperations):
 
     def _get_batch_credentials(self, name: str) -> Union[AuthKeys, AuthToken]:
         pass
+
+
+def _dependency_key(kind: str, dependency: Any) -> Tuple[str, Any]:
+    # references by name are shared by value, local assets by object
+    return kind, dependency if isinstance(dependency, str) else id(dependency)
@@ -22,6 +22,7 @@ from azure.ml._schema._sweep import SweepJobSchema, InternalSweepJob
 from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope, OperationsContainer
 from .job_ops_helper import stream_logs_until_completion
 from azure.ml._utils._storage_utils import get_storage_client
+from azure.ml._artifacts._transfer_metrics import TransferMetrics
 from .run_operations import RunOperations
 from azure.ml._operations.run_history_constants import RunHistoryConstants
 from .operation_orchestrator import OperationOrchestrator
@@ -55,7 +56,8 @@ class JobOperations(_WorkspaceDependentOperations):
                                          **self._kwargs)
         return self._dump(job_object)
 
-    def _dump(self, job_rest_object: BaseJob) -> Any:
+    @staticmethod
+    def _dump(job_rest_object: BaseJob) -> Any:
         try:
             if job_rest_object.properties.job_type == JobType.COMMAND:
                 obj = InternalCommandJob()
@@ -112,7 +114,13 @@ class JobOperations(_WorkspaceDependentOperations):
         self._runs._operation._client._base_url = self._get_workspace_url()
         stream_logs_until_completion(self._runs, job_object)
 
-    def download(self, job_name: str, logs_only: bool = False, download_path: str = Path.home()) -> None:
+    def download(self, job_name: str, logs_only: bool = False, download_path: str = Path.home(),
+                 metrics: Optional[TransferMetrics] = None) -> None:
+        """
+        Download the outputs and logs of a completed job
+
+        :param metrics: Records the bytes, duration and retries of every file that is downloaded.
+        """
         job_details = self.get(job_name)
         job_status = job_details.properties.status
         if job_status not in RunHistoryConstants.TERMINAL_STATUSES:
@@ -133,7 +141,7 @@ class JobOperations(_WorkspaceDependentOperations):
                                             storage_account=acc_name, storage_type=datastore_type)
 
         for item in prefix_list:
-            storage_client.download(starts_with=item, destination=download_path)
+            storage_client.download(starts_with=item, destination=download_path, metrics=metrics)
 
     def _get_workspace_url(self):
         workspace_details = self._all_operations.all_operations["workspaces"].get(
@@ -2,17 +2,35 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
-from typing import Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union, Tuple
 from azure.ml._schema._endpoint.code_configuration_schema import InternalCodeConfiguration
 from azure.ml._schema.environment import InternalEnvironment
 from azure.ml._schema.model import InternalModel
 from azure.ml._utils._arm_id_utils import parse_name_version
 from azure.ml._schema.code_asset import InternalCodeAsset
+from azure.ml._restclient.machinelearningservices.models import AssetPath
 from azure.ml._workspace_dependent_operations import OperationsContainer, WorkspaceScope
 from azure.ml._artifacts._artifact_utilities import _upload_to_datastore
+from azure.ml._artifacts._snapshot import use_snapshot_archive
+from azure.ml._operations.code_operations import _code_asset_name
+from azure.ml._utils._asset_utils import get_object_hash
 from azure.ml._utils._arm_id_utils import is_arm_id
+from azure.ml._utils._ignore_file import get_ignore_file
 from pathlib import Path
-from azure.ml.constants import OperationTypes
+from azure.ml.constants import OperationTypes, DEPENDENCY_RESOLUTION_MAX_WORKERS
+
+
+class DependencyResolutionError(Exception):
+    """Raised when more than one dependency failed to resolve
+
+    :param errors: The error of every dependency that failed, by dependency description.
+    """
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        details = "\n".join(f"  {name}: {error}" for name, error in errors.items())
+        super(DependencyResolutionError, self).__init__(f"Failed to resolve {len(errors)} dependencies:\n{details}")
 
 
 class OperationOrchestrator(object):
@@ -31,7 +49,15 @@ class OperationOrchestrator(object):
             if register_asset:
                 return code_asset.check_or_create_code_asset(_code_assets)
             else:
-                asset_path, datastore_id = self._upload_code(code_asset=code_asset)
+                path = code_asset._get_local_path()
+                asset_hash = get_object_hash(path, ignore_file=get_ignore_file(path, use_gitignore=True))
+                snapshot = use_snapshot_archive(None)
+                asset_path, datastore_id = self._upload_code(
+                    code_asset=code_asset, snapshot=snapshot, asset_hash=asset_hash
+                )
+                if not code_asset.name:
+                    # named like the code CodeOperations registers, so the same content always gets the same name
+                    code_asset.name = _code_asset_name(asset_hash, path, snapshot)
                 code_asset._update_asset(asset_path=asset_path, datastore_id=datastore_id)
                 return code_asset
 
@@ -59,10 +85,51 @@ class OperationOrchestrator(object):
             model._update_asset(asset_path=asset_path, datastore_id=datastore_id)
             return model
 
-    def _upload_code(self, code_asset: InternalCodeAsset, show_progress: bool = True) -> Tuple[str, str]:
+    def resolve_all(
+        self, resolvers: Dict[str, Callable[[], Any]], max_workers: int = DEPENDENCY_RESOLUTION_MAX_WORKERS
+    ) -> Dict[str, Any]:
+        """Runs independent dependency resolutions concurrently and returns their results by description
+
+        Every resolution runs to completion even when another one fails, so that no upload or
+        registration is abandoned halfway. A single failure is re-raised as is; several failures
+        are raised together as a DependencyResolutionError.
+
+        :param resolvers: Functions resolving one dependency each, e.g. a bound get_code_asset_arm_id,
+            by a description of the dependency used in error messages.
+        :param max_workers: Maximum number of dependencies resolved at the same time.
+        """
+        if len(resolvers) <= 1:
+            return {name: resolve() for name, resolve in resolvers.items()}
+
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(resolvers))) as executor:
+            futures = {name: executor.submit(resolve) for name, resolve in resolvers.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = e
+        if len(errors) == 1:
+            raise next(iter(errors.values()))
+        if errors:
+            raise DependencyResolutionError(errors) from next(iter(errors.values()))
+        return results
+
+    def _upload_code(
+        self,
+        code_asset: InternalCodeAsset,
+        show_progress: bool = True,
+        snapshot: Optional[bool] = None,
+        dedupe: Optional[bool] = None,
+        asset_hash: Optional[str] = None,
+    ) -> Tuple[AssetPath, str]:
         """Creates a versioned code asset from the given file or directory and uploads it to a datastore.
 
         If no datastore is provided, the code asset will be uploaded to the MLClient's workspace default datastore.
+        If snapshot is set (it defaults to the AZUREML_CODE_SNAPSHOT_ARCHIVE environment variable), a directory is
+        uploaded as a single compressed archive and the returned asset path points at that archive.
+        If dedupe is set (it defaults to the AZUREML_UPLOAD_DEDUPE environment variable), files of a directory whose
+        content the blob datastore already holds are copied on the service side instead of being uploaded again.
         """
         code = code_asset.directory or code_asset.file
         if code is not None:
@@ -78,6 +145,10 @@ class OperationOrchestrator(object):
                     datastore_name=code_asset.datastore,
                     show_progress=show_progress,
                     include_container_in_asset_path=False,
+                    snapshot=use_snapshot_archive(snapshot),
+                    asset_hash=asset_hash,
+                    ignore_file=get_ignore_file(path, use_gitignore=True),
+                    dedupe=dedupe,
                 )
                 return asset_path, datastore_resource_id
         raise Exception(f"Cannot find resource for code asset: {str(path)}")
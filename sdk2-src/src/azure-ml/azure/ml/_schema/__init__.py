@@ -4,15 +4,44 @@
 
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
-from .schema import PatchedNested, PatchedSchemaMeta, PatchedBaseSchema, PathAwareSchema, YamlFileSchema
-from .job import CommandJobSchema, InternalCommandJob
-from .code_asset import CodeAssetSchema
-from .environment import EnvironmentSchema
-from .model import InternalModel, ModelSchema
-from .fields import ArmStr, ArmVersionedStr
-from .union_field import UnionField
-from .asset import AssetSchema
-from ._sweep import SweepJobSchema
+from typing import TYPE_CHECKING
+
+from azure.ml._utils._lazy_import import lazy_exports
+
+# the same names, for type checkers and IDEs
+if TYPE_CHECKING:
+    from .schema import PatchedNested, PatchedSchemaMeta, PatchedBaseSchema, PathAwareSchema, YamlFileSchema
+    from .job import CommandJobSchema, InternalCommandJob
+    from .code_asset import CodeAssetSchema
+    from .environment import EnvironmentSchema
+    from .model import InternalModel, ModelSchema
+    from .fields import ArmStr, ArmVersionedStr
+    from .union_field import UnionField
+    from .asset import AssetSchema
+    from ._sweep import SweepJobSchema
+
+# each schema is imported when it is first used, not all of them with the package
+lazy_exports(
+    __name__,
+    {
+        "PatchedNested": ".schema",
+        "PatchedSchemaMeta": ".schema",
+        "PatchedBaseSchema": ".schema",
+        "PathAwareSchema": ".schema",
+        "YamlFileSchema": ".schema",
+        "CommandJobSchema": ".job",
+        "InternalCommandJob": ".job",
+        "CodeAssetSchema": ".code_asset",
+        "EnvironmentSchema": ".environment",
+        "InternalModel": ".model",
+        "ModelSchema": ".model",
+        "ArmStr": ".fields",
+        "ArmVersionedStr": ".fields",
+        "UnionField": ".union_field",
+        "AssetSchema": ".asset",
+        "SweepJobSchema": "._sweep",
+    },
+)
 
 __all__ = [
     "ArmStr",
@@ -3,7 +3,7 @@
 # ---------------------------------------------------------
 
 import re
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 
 from collections import OrderedDict
 from marshmallow import fields, validates, post_load, ValidationError
@@ -98,6 +98,12 @@ class InternalSweepJob(BaseJob):
     def upload_dependencies(self, operation_orchestartor: "OperationOrchestrator"):
         self.trial.upload_dependencies(operation_orchestartor)
 
+    def _get_dependency_resolvers(self, operation_orchestartor: "OperationOrchestrator") -> Dict[str, Callable]:
+        return self.trial._get_dependency_resolvers(operation_orchestartor)
+
+    def _set_resolved_dependencies(self, resolved: Dict[str, Any]) -> None:
+        self.trial._set_resolved_dependencies(resolved)
+
     def _generate_code_configuration(self) -> CodeConfiguration:
         self.trial.bind_inputs()
         # strip 'python' (if it exists) from command
@@ -3,29 +3,29 @@
 # ---------------------------------------------------------
 
 from azure.ml._operations.code_operations import CodeOperations
+from azure.ml._restclient.machinelearningservices.models import AssetPath
 from azure.ml.constants import BASE_PATH_CONTEXT_KEY
-import uuid
 from marshmallow import post_load, ValidationError, pre_dump
 from .asset import AssetSchema, InternalAsset
 from pathlib import Path
 
 
 class InternalCodeAsset(InternalAsset):
-    def _update_asset(self, asset_path: str, datastore_id: str):
+    def _update_asset(self, asset_path: AssetPath, datastore_id: str):
         self._asset_path = asset_path
         self._datastore_id = datastore_id
 
     def check_or_create_code_asset(self, code_operations: CodeOperations) -> str:
+        return code_operations._get_or_create(self._get_local_path()).id
+
+    def _get_local_path(self) -> Path:
         code = self.directory or self.file
         if code is not None:
             path = Path(code)
             if not path.is_absolute():
                 path = Path(self._base_path, path).resolve()
             if path.is_file() or path.is_dir():
-                # Code resource IDs must be guids
-                name = str(uuid.uuid4())
-                code_artifact = code_operations.create(name, str(path))
-                return code_artifact.id
+                return path
         raise Exception(f"Cannot find resource for code asset: {str(path)}")
 
 
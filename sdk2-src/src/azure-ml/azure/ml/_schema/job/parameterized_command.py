@@ -3,7 +3,8 @@
 # ---------------------------------------------------------
 
 import re
-from typing import Dict, Optional, Union, Any
+from functools import partial
+from typing import Callable, Dict, Optional, Union, Any
 from marshmallow import fields, post_load
 from azure.ml.constants import AssetType, BASE_PATH_CONTEXT_KEY
 from azure.ml._restclient.machinelearningservices.models import (
@@ -117,10 +118,19 @@ class ParameterizedCommand(LoadableMixin):
         self.command = command
 
     def upload_dependencies(self, operation_orchestartor: "OperationOrchestrator") -> None:
-        # TODO: this will need to be paralelized when multiple tasks
-        # are required. Also consider the implications for dependencies.
-        self._code_asset = operation_orchestartor.get_code_asset_arm_id(self._code_asset)
-        self._environment = operation_orchestartor.get_environment_arm_id(self._environment)
+        resolved = operation_orchestartor.resolve_all(self._get_dependency_resolvers(operation_orchestartor))
+        self._set_resolved_dependencies(resolved)
+
+    def _get_dependency_resolvers(self, operation_orchestartor: "OperationOrchestrator") -> Dict[str, Callable]:
+        # the asynchronous orchestrator has the same methods, returning coroutines
+        return {
+            "code": partial(operation_orchestartor.get_code_asset_arm_id, self._code_asset),
+            "environment": partial(operation_orchestartor.get_environment_arm_id, self._environment),
+        }
+
+    def _set_resolved_dependencies(self, resolved: Dict[str, Any]) -> None:
+        self._code_asset = resolved["code"]
+        self._environment = resolved["environment"]
 
     def generate_code_configuration(self) -> CodeConfiguration:
         return CodeConfiguration(command=self._bound_command, code_artifact_id=self._code_asset)
@@ -2,15 +2,21 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
+import logging
 import os
 import uuid
-from typing import Tuple, Union, Optional, List, Iterable
+from typing import Dict, Tuple, Union, Optional, List, Iterable
 from pathlib import Path
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
-from azure.ml._artifacts.constants import CHUNK_SIZE, AZ_ML_ARTIFACT_DIRECTORY
+from azure.ml._artifacts.constants import CHUNK_SIZE, AZ_ML_ARTIFACT_DIRECTORY, HASH_MAX_WORKERS, LEGACY_HASH_ENV_VAR
+from azure.ml._utils._hash_index import HashIndex, get_hash_index, get_file_signature, get_directory_signature
+from azure.ml._utils._ignore_file import IgnoreFile, get_ignore_file, walk_directory
 
 
+module_logger = logging.getLogger(__name__)
+
 hash_type = type(hashlib.md5())
 
 
@@ -40,31 +46,147 @@ def _parse_name_version(name: str = None,
 
 
 def _get_file_hash(filename: Union[str, Path], hash: hash_type) -> hash_type:
-    with open(str(filename), "rb") as f:
-        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
-            hash.update(chunk)
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(str(filename), "rb", buffering=0) as f:
+        for size in iter(lambda: f.readinto(buffer), 0):
+            hash.update(view[:size])
     return hash
 
 
-def _get_dir_hash(directory: Union[str, Path], hash: hash_type) -> hash_type:
+def _get_dir_hash(directory: Union[str, Path], hash: hash_type, ignore_file: Optional[IgnoreFile] = None) -> hash_type:
     dir_contents = Path(directory).iterdir()
     sorted_contents = sorted(dir_contents, key=lambda path: str(path).lower())
     for path in sorted_contents:
+        if ignore_file is not None and ignore_file.is_file_excluded(path):
+            continue
         hash.update(path.name.encode())
         if path.is_file():
             hash = _get_file_hash(path, hash)
         elif path.is_dir():
-            hash = _get_dir_hash(path, hash)
+            hash = _get_dir_hash(path, hash, ignore_file)
     return hash
 
 
-def get_object_hash(path: Union[str, Path]) -> str:
+def _get_file_digest(filename: Union[str, Path], hash_index: Optional[HashIndex] = None) -> str:
+    """
+    Returns the MD5 hex digest of a single file, reusing its cached digest if the file is unchanged
+    """
+    return _get_file_digests([Path(filename)], hash_index, max_workers=1)[Path(filename)]
+
+
+def _get_file_digests(file_paths: List[Path], hash_index: Optional[HashIndex] = None,
+                      max_workers: int = HASH_MAX_WORKERS,
+                      file_signatures: Optional[Dict[str, Optional[str]]] = None) -> Dict[Path, str]:
+    """
+    Returns the MD5 hex digest of every file, hashing the files missing from the hash index in parallel
+
+    The index is read and updated once for the whole batch, so the workers never wait on its lock.
+    `file_signatures` holds signatures already taken by get_directory_signature, keyed by absolute path.
+    """
+    signatures = {}  # type: Dict[str, Optional[str]]
+    digests = {}  # type: Dict[str, str]
+    keys = {path: os.path.abspath(str(path)) for path in file_paths}
+    if hash_index is not None:
+        file_signatures = file_signatures or {}
+        for key in keys.values():
+            # the stat must come before the read, so a file changed while it is hashed is never cached as unchanged
+            signatures[key] = file_signatures[key] if key in file_signatures else get_file_signature(key)
+        digests = hash_index.get_file_digests(signatures)
+
+    missing = [path for path in file_paths if keys[path] not in digests]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        hashed = dict(zip(missing, executor.map(lambda f: _get_file_hash(f, hashlib.md5()).hexdigest(), missing)))
+    if hash_index is not None and hashed:
+        hash_index.put_file_digests({keys[path]: (signatures[keys[path]], digest) for path, digest in hashed.items()})
+    return {path: hashed[path] if path in hashed else digests[keys[path]] for path in file_paths}
+
+
+def _get_dir_tree_hash(directory: Union[str, Path], hash_index: Optional[HashIndex] = None,
+                       max_workers: int = HASH_MAX_WORKERS, ignore_file: Optional[IgnoreFile] = None,
+                       file_signatures: Optional[Dict[str, Optional[str]]] = None) -> hash_type:
+    """
+    Hashes every file of a directory in parallel and combines the per-file digests
+
+    The combined digest covers the relative path of every entry in the tree, in sorted order, and
+    the digest of every file, so it does not depend on the order in which the workers finish.
+    Entries excluded by `ignore_file` are left out.
+    """
+    entries = []  # type: List[Tuple[str, Optional[Path]]]
+    for root, dirs, files in walk_directory(directory, ignore_file):
+        relative_root = Path(root).relative_to(directory)
+        entries += [((relative_root / d).as_posix() + "/", None) for d in dirs]
+        entries += [((relative_root / f).as_posix(), Path(root, f)) for f in files]
+    entries.sort(key=lambda entry: entry[0])
+
+    file_paths = [path for _, path in entries if path is not None and path.is_file()]
+    file_digests = _get_file_digests(file_paths, hash_index, max_workers, file_signatures)
+
     hash = hashlib.md5()
-    if Path(path).is_dir():
-        object_hash = _get_dir_hash(directory=path, hash=hash)
+    for relative_path, path in entries:
+        # directories have no digest of their own
+        digest = file_digests.get(path, "") if path is not None else ""
+        hash.update(f"{relative_path}\0{digest}\n".encode())
+    return hash
+
+
+def get_object_hash(path: Union[str, Path], compatibility_mode: Optional[bool] = None,
+                    max_workers: int = HASH_MAX_WORKERS, ignore_file: Optional[IgnoreFile] = None) -> str:
+    """
+    Returns the MD5 digest of a file or directory
+
+    The digest of a file is the MD5 of its content. Files of a directory are hashed in parallel by
+    up to `max_workers` threads and their digests are combined into the directory digest. If
+    `compatibility_mode` is set (it defaults to the AZUREML_LEGACY_ASSET_HASH environment variable),
+    directories are instead hashed as a single MD5 stream over every name and byte, which matches
+    the digest of assets uploaded by previous versions.
+
+    Files and directories excluded by `ignore_file`, which defaults to the .amlignore file at the root
+    of a directory, are not part of its digest, in either mode, so the digest only changes with the
+    files that are uploaded.
+
+    Digests are cached in the asset hash index, so hashing a file or directory whose
+    contents have not been touched since the last call only costs a walk over its stat info.
+    """
+    if compatibility_mode is None:
+        compatibility_mode = os.environ.get(LEGACY_HASH_ENV_VAR, "").lower() in ("1", "true")
+    hash_index = get_hash_index()
+
+    if not Path(path).is_dir():
+        digest = _get_file_digest(path, hash_index)
+        if hash_index is not None:
+            hash_index.save()
+        return digest
+
+    if ignore_file is None:
+        ignore_file = get_ignore_file(path)
+    index_key = signature = None
+    file_signatures = {}  # type: Dict[str, Optional[str]]
+    if hash_index is not None:
+        mode = "md5-stream" if compatibility_mode else "md5-tree"
+        index_key = f"{mode}:{Path(path).resolve()}"
+        signature = get_directory_signature(path, ignore_file, file_signatures)
+        cached_hash = hash_index.get(index_key, signature)
+        if cached_hash:
+            hash_index.save()
+            return cached_hash
+
+    if compatibility_mode:
+        object_hash = _get_dir_hash(directory=path, hash=hashlib.md5(), ignore_file=ignore_file)
     else:
-        object_hash = _get_file_hash(filename=path, hash=hash)
-    return str(object_hash.hexdigest())
+        object_hash = _get_dir_tree_hash(
+            directory=path,
+            hash_index=hash_index,
+            max_workers=max_workers,
+            ignore_file=ignore_file,
+            file_signatures=file_signatures,
+        )
+    object_hash_str = str(object_hash.hexdigest())
+
+    if hash_index is not None and index_key is not None:
+        hash_index.put(index_key, signature, object_hash_str)
+        hash_index.save()
+    return object_hash_str
 
 
 def traverse_directory(root: str, files: List[str], source: str, prefix: str) -> Iterable[Tuple[str, str]]:
@@ -76,6 +198,28 @@ def traverse_directory(root: str, files: List[str], source: str, prefix: str) ->
     return zip(file_paths, blob_paths)
 
 
+def get_directory_upload_paths(source: Union[str, Path], prefix: str,
+                               ignore_file: Optional[IgnoreFile] = None) -> List[Tuple[str, str]]:
+    """
+    Returns sorted (local file path, remote path) pairs for every file under the source directory
+
+    Files excluded by `ignore_file`, which defaults to the .amlignore file of the source directory,
+    are left out, so the upload set always matches the files covered by get_object_hash.
+    """
+    if ignore_file is None:
+        ignore_file = get_ignore_file(source)
+    upload_paths = []  # type: List[Tuple[str, str]]
+    excluded = []  # type: List[str]
+    for root, _, files in sorted(walk_directory(source, ignore_file, excluded)):
+        upload_paths += list(traverse_directory(root, files, str(source), prefix))
+    if excluded:
+        module_logger.info(
+            "Excluded %d files and directories of %s listed in %s: %s",
+            len(excluded), source, ignore_file.path, ", ".join(sorted(excluded)),
+        )
+    return sorted(upload_paths)
+
+
 def generate_asset_id(asset_hash: str, include_directory=True) -> str:
     asset_id = asset_hash or str(uuid.uuid4())
     if include_directory:
@@ -0,0 +1,150 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional
+
+from azure.core.credentials import AccessToken, TokenCredential
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import (
+    AzureCliCredential,
+    ChainedTokenCredential,
+    CredentialUnavailableError,
+    EnvironmentCredential,
+    InteractiveBrowserCredential,
+    ManagedIdentityCredential,
+    SharedTokenCacheCredential,
+)
+
+from azure.ml.constants import (
+    CREDENTIAL_HINT_DISABLE_ENV_VAR,
+    CREDENTIAL_HINT_FILE_NAME,
+    CREDENTIAL_HINT_PATH_ENV_VAR,
+    CREDENTIAL_ORDER_ENV_VAR,
+)
+
+module_logger = logging.getLogger(__name__)
+
+CREDENTIAL_TYPES = OrderedDict(
+    [
+        ("managed_identity", ManagedIdentityCredential),
+        ("azure_cli", AzureCliCredential),
+        ("environment", EnvironmentCredential),
+        ("shared_token_cache", SharedTokenCacheCredential),
+        ("interactive_browser", InteractiveBrowserCredential),
+    ]
+)
+# credentials that prompt the user are never hinted, so a single fallback to a prompt isn't repeated in
+# every later process, even once a credential that needs no user is available
+INTERACTIVE_CREDENTIALS = frozenset(["interactive_browser"])
+
+
+class HintedChainedTokenCredential(ChainedTokenCredential):
+    """Chain of named credentials that tries the credential which succeeded last time first
+
+    The name of the credential that provided a token is written to a hint file, so the next process
+    goes straight to it instead of probing the credentials before it (the managed identity probe alone
+    can take seconds off Azure). If the hinted credential fails, the other credentials are tried in
+    their configured order. Credentials in INTERACTIVE_CREDENTIALS are never hinted. Without a hint
+    path, the credentials are always tried in order.
+    """
+
+    def __init__(self, names: List[str], hint_path: Optional[Path] = None):
+        self._names = names
+        self._hint_path = hint_path
+        self._hint = self._read_hint()
+        self._credentials = [CREDENTIAL_TYPES[name]() for name in names]  # type: List[TokenCredential]
+        super(HintedChainedTokenCredential, self).__init__(*self._credentials)
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        named_credentials = list(zip(self._names, self._credentials))
+        # sorting is stable, so the other credentials keep their order
+        named_credentials.sort(key=lambda named: named[0] != self._hint)
+        history = []
+        for name, credential in named_credentials:
+            try:
+                token = credential.get_token(*scopes, **kwargs)
+            except CredentialUnavailableError as e:
+                history.append(f"{type(credential).__name__}: {e.message}")
+                continue
+            except Exception as e:
+                history.append(f"{type(credential).__name__}: {e}")
+                # a stale hint must not keep the other credentials from being tried
+                if name == self._hint:
+                    continue
+                raise ClientAuthenticationError(message=_chain_failure_message(history)) from e
+            if name != self._hint and name not in INTERACTIVE_CREDENTIALS:
+                self._write_hint(name)
+            return token
+        raise ClientAuthenticationError(message=_chain_failure_message(history))
+
+    def _read_hint(self) -> Optional[str]:
+        if self._hint_path is None:
+            return None
+        try:
+            hint = self._hint_path.read_text().strip()
+        except OSError:
+            return None
+        return hint if hint in self._names and hint not in INTERACTIVE_CREDENTIALS else None
+
+    def _write_hint(self, name: str) -> None:
+        self._hint = name
+        if self._hint_path is None:
+            return
+        try:
+            self._hint_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self._hint_path.parent), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(name)
+                os.replace(tmp_path, str(self._hint_path))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError as e:
+            module_logger.debug("Unable to save credential hint to %s: %s", self._hint_path, e)
+
+
+def _chain_failure_message(history: List[str]) -> str:
+    return "No credential in the chain provided a token:\n" + "\n".join(history)
+
+
+def get_credential_order() -> List[str]:
+    """Returns the names of the default credentials in the order they are tried
+
+    AZUREML_CREDENTIAL_ORDER takes a comma separated list of names from CREDENTIAL_TYPES. Only those
+    credentials are tried, in that order, so scripts can skip the ones that cannot succeed.
+    """
+    order = os.environ.get(CREDENTIAL_ORDER_ENV_VAR)
+    if not order:
+        return list(CREDENTIAL_TYPES)
+    names = [name.strip().lower() for name in order.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CREDENTIAL_TYPES]
+    if unknown or not names:
+        raise Exception(
+            f"Unsupported credential order '{order}' in {CREDENTIAL_ORDER_ENV_VAR}. "
+            f"Supported credentials are: {', '.join(CREDENTIAL_TYPES)}."
+        )
+    return names
+
+
+def get_credential_hint_path() -> Optional[Path]:
+    """Returns the path of the credential hint file, or None if the hint is disabled
+
+    The hint is disabled through AZUREML_DISABLE_CREDENTIAL_HINT, and whenever the credential order is
+    set explicitly, as that order is meant to be followed as is.
+    """
+    if os.environ.get(CREDENTIAL_HINT_DISABLE_ENV_VAR, "").lower() in ("1", "true"):
+        return None
+    if os.environ.get(CREDENTIAL_ORDER_ENV_VAR):
+        return None
+    return Path(os.environ.get(CREDENTIAL_HINT_PATH_ENV_VAR) or Path.home() / ".azureml" / CREDENTIAL_HINT_FILE_NAME)
+
+
+def create_default_credential() -> ChainedTokenCredential:
+    return HintedChainedTokenCredential(get_credential_order(), get_credential_hint_path())
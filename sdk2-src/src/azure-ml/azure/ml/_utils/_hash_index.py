@@ -0,0 +1,240 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from azure.ml._artifacts.constants import (
+    HASH_INDEX_DISABLE_ENV_VAR,
+    HASH_INDEX_FILE_NAME,
+    HASH_INDEX_MAX_ENTRIES,
+    HASH_INDEX_MAX_FILE_ENTRIES,
+    HASH_INDEX_PATH_ENV_VAR,
+    HASH_INDEX_RACY_WINDOW_SECONDS,
+    HASH_INDEX_VERSION,
+)
+from azure.ml._utils._ignore_file import IgnoreFile
+
+module_logger = logging.getLogger(__name__)
+
+
+class HashIndex(object):
+    """On-disk cache of content digests, keyed by local path and validated by a stat signature.
+
+    A cached digest is only returned when the signature recorded with it (size, mtime_ns and inode
+    of every file it covers) still matches, so edited, replaced or touched files are always re-hashed.
+    Entries are kept in least recently used order. The index is trimmed to `max_entries` entries when
+    it is saved, so a single run may cache more entries than that without evicting any of them.
+    A missing, unreadable or outdated index file is treated as empty.
+
+    The digests of the single files of a directory are kept in a separate table, looked up and stored
+    in batches, so hashing a large tree neither crowds out the other entries nor contends on the lock
+    once per file. That table holds at least as many files as the largest batch of this process, so
+    a tree is never evicted by its own files.
+    """
+
+    def __init__(
+        self,
+        index_path: Union[str, os.PathLike],
+        max_entries: int = HASH_INDEX_MAX_ENTRIES,
+        max_file_entries: int = HASH_INDEX_MAX_FILE_ENTRIES,
+    ):
+        self._index_path = Path(index_path)
+        self._max_entries = max_entries
+        self._max_file_entries = max_file_entries
+        self._entries = OrderedDict()  # type: OrderedDict[str, Dict[str, str]]
+        self._files = OrderedDict()  # type: OrderedDict[str, Tuple[str, str]]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    @property
+    def index_path(self) -> Path:
+        return self._index_path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, signature: Optional[str]) -> Optional[str]:
+        """Returns the cached digest for key if it was recorded with the same signature"""
+        if signature is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["signature"] != signature:
+                del self._entries[key]
+                self._dirty = True
+                return None
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return str(entry["digest"])
+
+    def put(self, key: str, signature: Optional[str], digest: str) -> None:
+        if signature is None:
+            return
+        with self._lock:
+            self._entries[key] = {"signature": signature, "digest": digest}
+            self._entries.move_to_end(key)
+            self._dirty = True
+
+    def get_file_digests(self, signatures: Dict[str, Optional[str]]) -> Dict[str, str]:
+        """Returns the cached digests of the files whose signature matches, keyed by absolute path"""
+        digests = {}
+        with self._lock:
+            self._max_file_entries = max(self._max_file_entries, len(signatures))
+            for path, signature in signatures.items():
+                entry = self._files.get(path)
+                if signature is not None and entry is not None and entry[0] == signature:
+                    digests[path] = entry[1]
+                    self._files.move_to_end(path)
+            self._dirty = self._dirty or bool(digests)
+        return digests
+
+    def put_file_digests(self, digests: Dict[str, Tuple[Optional[str], str]]) -> None:
+        """Caches (signature, digest) pairs keyed by absolute path, skipping files without a signature"""
+        with self._lock:
+            self._max_file_entries = max(self._max_file_entries, len(digests))
+            for path, (signature, digest) in digests.items():
+                if signature is not None:
+                    self._files[path] = (signature, digest)
+                    self._files.move_to_end(path)
+                    self._dirty = True
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drops the entry for key, or every entry and file digest if no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._files.clear()
+            else:
+                self._entries.pop(key, None)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically writes the index to disk. Failures are logged and otherwise ignored."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._evict()
+            content = {"version": HASH_INDEX_VERSION, "entries": self._entries, "files": self._files}
+            try:
+                self._index_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=str(self._index_path.parent), suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        json.dump(content, f)
+                    os.replace(tmp_path, str(self._index_path))
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                self._dirty = False
+            except OSError as e:
+                module_logger.debug("Unable to save asset hash index to %s: %s", self._index_path, e)
+
+    def _load(self) -> None:
+        try:
+            with open(str(self._index_path), "r") as f:
+                # entries are saved least recently used first, so loading them in order restores the LRU order
+                content = json.load(f, object_pairs_hook=OrderedDict)
+            if content.get("version") == HASH_INDEX_VERSION and isinstance(content.get("entries"), dict):
+                self._entries = content["entries"]
+                self._files = OrderedDict((path, tuple(entry)) for path, entry in content.get("files", {}).items())
+        except (OSError, ValueError, AttributeError, TypeError):
+            self._entries = OrderedDict()
+            self._files = OrderedDict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        while len(self._files) > self._max_file_entries:
+            self._files.popitem(last=False)
+
+
+def _stat_signature(stat_result: os.stat_result) -> Optional[str]:
+    # A file modified within the racy window may be modified again without changing its mtime,
+    # so its digest is never cached.
+    if time.time() - stat_result.st_mtime < HASH_INDEX_RACY_WINDOW_SECONDS:
+        return None
+    return f"{stat_result.st_size}:{stat_result.st_mtime_ns}:{stat_result.st_ino}"
+
+
+def get_file_signature(path: Union[str, os.PathLike]) -> Optional[str]:
+    """Returns the stat signature of a file, or None if the file must not be cached"""
+    return _stat_signature(os.stat(str(path)))
+
+
+def get_directory_signature(
+    directory: Union[str, os.PathLike],
+    ignore_file: Optional[IgnoreFile] = None,
+    file_signatures: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[str]:
+    """Returns a signature covering the name and stat of every entry under a directory
+
+    Entries excluded by `ignore_file` are skipped, but the ignore file itself is always covered.
+    Returns None if any file under the directory must not be cached.
+
+    :param file_signatures: If given, filled with the signature of every file covered, keyed by absolute
+        path, so the files do not have to be stat'ed again to look up their digests.
+    """
+    signature = hashlib.md5()
+    cacheable = True
+    if ignore_file is not None and ignore_file.path is not None:
+        ignore_file_signature = get_file_signature(ignore_file.path)
+        if ignore_file_signature is None:
+            return None
+        signature.update(f"i:{ignore_file.path.name}:{ignore_file_signature}\n".encode())
+    root = os.path.abspath(str(directory))
+    # scandir entries know their type without another stat call, which matters on trees of many files
+    directories = [""]
+    while directories:
+        current = directories.pop()
+        with os.scandir(os.path.join(root, current)) as scanned:
+            entries = sorted(scanned, key=lambda e: e.name.lower())
+        for entry in entries:
+            relative_path = os.path.join(current, entry.name)
+            is_dir = entry.is_dir()
+            if ignore_file is not None and ignore_file.is_excluded(relative_path.replace(os.sep, "/"), is_dir):
+                continue
+            if entry.is_file():
+                file_signature = _stat_signature(entry.stat())
+                if file_signatures is not None:
+                    file_signatures[os.path.join(root, relative_path)] = file_signature
+                if file_signature is None:
+                    # the other files can still be cached on their own
+                    if file_signatures is None:
+                        return None
+                    cacheable = False
+                signature.update(f"f:{relative_path}:{file_signature}\n".encode())
+            elif is_dir:
+                signature.update(f"d:{relative_path}\n".encode())
+                directories.append(relative_path)
+            else:
+                signature.update(f"o:{relative_path}\n".encode())
+    return signature.hexdigest() if cacheable else None
+
+
+_hash_index = None  # type: Optional[HashIndex]
+_hash_index_lock = threading.Lock()
+
+
+def get_hash_index() -> Optional[HashIndex]:
+    """Returns the process-wide hash index, or None if it is disabled through the environment"""
+    global _hash_index
+    if os.environ.get(HASH_INDEX_DISABLE_ENV_VAR, "").lower() in ("1", "true"):
+        return None
+    index_path = os.environ.get(HASH_INDEX_PATH_ENV_VAR) or str(Path.home() / ".azureml" / HASH_INDEX_FILE_NAME)
+    with _hash_index_lock:
+        if _hash_index is None or str(_hash_index.index_path) != str(Path(index_path)):
+            _hash_index = HashIndex(index_path)
+        return _hash_index
@@ -0,0 +1,85 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from azure.core.credentials import AccessToken, TokenCredential
+from azure.core.pipeline.transport import RequestsTransport
+
+from azure.ml.constants import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_CONNECTIONS_ENV_VAR,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_MAXSIZE_ENV_VAR,
+    TOKEN_REFRESH_MARGIN_SECONDS,
+)
+
+_transport_lock = threading.Lock()
+_shared_transport = None  # type: Optional[RequestsTransport]
+
+
+def create_pooled_adapter(max_retries: Retry) -> HTTPAdapter:
+    """Returns an adapter whose connection pool limits are set by AZUREML_HTTP_POOL_CONNECTIONS (hosts)
+    and AZUREML_HTTP_POOL_MAXSIZE (connections per host)
+    """
+    return HTTPAdapter(
+        pool_connections=int(os.environ.get(HTTP_POOL_CONNECTIONS_ENV_VAR, HTTP_POOL_CONNECTIONS)),
+        pool_maxsize=int(os.environ.get(HTTP_POOL_MAXSIZE_ENV_VAR, HTTP_POOL_MAXSIZE)),
+        max_retries=max_retries,
+    )
+
+
+def get_shared_transport() -> RequestsTransport:
+    """Returns the process-wide transport of the azure-core clients created by this package
+
+    The service, ARM and storage clients all send their requests through it, so they share one
+    connection pool. Clients do not own the transport: closing a client leaves it open for the others.
+    """
+    global _shared_transport
+    with _transport_lock:
+        if _shared_transport is None:
+            # retries are handled by the azure-core pipeline of each client
+            disable_retries = Retry(total=False, redirect=False, raise_on_status=False)
+            adapter = create_pooled_adapter(disable_retries)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _shared_transport = RequestsTransport(session=session, session_owner=False)
+        return _shared_transport
+
+
+class CachedTokenCredential(object):
+    """Token credential that shares the tokens of the given credential between all its users
+
+    Every azure-core client keeps its own token in its authentication policy, so each client created
+    by MLClient would otherwise acquire its own token, which can mean running the Azure CLI each time.
+    Tokens are reused until TOKEN_REFRESH_MARGIN_SECONDS before they expire. Requests with claims or
+    other options are passed through to the wrapped credential.
+    """
+
+    def __init__(self, credential: TokenCredential):
+        self._credential = credential
+        self._tokens = {}  # type: Dict[Tuple[str, ...], AccessToken]
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        if kwargs:
+            return self._credential.get_token(*scopes, **kwargs)
+        with self._lock:
+            token = self._tokens.get(scopes)
+            if token is None or token.expires_on - time.time() < TOKEN_REFRESH_MARGIN_SECONDS:
+                token = self._credential.get_token(*scopes)
+                self._tokens[scopes] = token
+            return token
+
+    def close(self) -> None:
+        close = getattr(self._credential, "close", None)
+        if close:
+            close()
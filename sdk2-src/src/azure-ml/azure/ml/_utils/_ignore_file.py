@@ -0,0 +1,153 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Tuple, Union
+
+from azure.ml._artifacts.constants import AML_IGNORE_FILE_NAME, GIT_IGNORE_FILE_NAME
+
+
+class IgnoreFile(object):
+    """Exclusion rules read from an ignore file, using .gitignore syntax.
+
+    Patterns are matched against paths relative to the directory that holds the ignore file.
+    Blank lines and lines starting with # are skipped, a leading ! re-includes a path excluded
+    by an earlier pattern, a trailing / only matches directories, and a pattern containing a /
+    other than at its end is anchored to the base directory. As with git, a path inside an
+    excluded directory is excluded whatever the later patterns say.
+    """
+
+    def __init__(self, file_path: Optional[Union[str, os.PathLike]] = None):
+        self._path = Path(file_path) if file_path else None
+        self._rules = []  # type: List[Tuple[Pattern, bool, bool]]
+        if self._path is not None and self._path.is_file():
+            with open(str(self._path), "r", encoding="utf-8", errors="replace") as f:
+                self._rules = [rule for rule in (_parse_line(line) for line in f) if rule is not None]
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    @property
+    def base_path(self) -> Optional[Path]:
+        return self._path.parent if self._path is not None else None
+
+    def exists(self) -> bool:
+        return bool(self._rules)
+
+    def is_excluded(self, relative_path: str, is_dir: bool) -> bool:
+        """Returns whether a single entry is excluded, without looking at its parent directories
+
+        :param relative_path: Path relative to the base directory, using / as separator
+        """
+        excluded = False
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                excluded = not negate
+        return excluded
+
+    def is_file_excluded(self, file_path: Union[str, os.PathLike]) -> bool:
+        """Returns whether a file or directory under the base directory is excluded"""
+        if not self._rules:
+            return False
+        path = Path(file_path)
+        relative_path = Path(os.path.relpath(str(path), str(self.base_path))).as_posix()
+        if relative_path.startswith("../"):
+            return False
+        parts = relative_path.split("/")
+        for i in range(1, len(parts)):
+            if self.is_excluded("/".join(parts[:i]), is_dir=True):
+                return True
+        return self.is_excluded(relative_path, is_dir=path.is_dir())
+
+
+def get_ignore_file(directory: Union[str, os.PathLike], use_gitignore: bool = False) -> IgnoreFile:
+    """Returns the exclusion rules of a directory
+
+    The .amlignore file of the directory is used if there is one. Only with `use_gitignore`, which is
+    meant for code, the .gitignore file is used otherwise: model and data directories often hold files
+    that are kept out of git on purpose. A directory with neither gets an empty rule set that excludes
+    nothing.
+    """
+    file_names = (AML_IGNORE_FILE_NAME, GIT_IGNORE_FILE_NAME) if use_gitignore else (AML_IGNORE_FILE_NAME,)
+    for file_name in file_names:
+        path = Path(directory, file_name)
+        if path.is_file():
+            return IgnoreFile(path)
+    return IgnoreFile()
+
+
+def walk_directory(
+    directory: Union[str, os.PathLike], ignore_file: Optional[IgnoreFile] = None, excluded: Optional[List[str]] = None
+) -> Iterable[Tuple[str, List[str], List[str]]]:
+    """Same as os.walk, but skips excluded files and never descends into excluded directories
+
+    :param excluded: Collects the paths of the skipped files and directories, relative to `directory`.
+    """
+    for root, dirs, files in os.walk(str(directory)):
+        if ignore_file is not None and ignore_file.exists():
+            relative_root = Path(os.path.relpath(root, str(directory))).as_posix()
+            prefix = "" if relative_root == "." else relative_root + "/"
+            if excluded is not None:
+                excluded += [prefix + d + "/" for d in dirs if ignore_file.is_excluded(prefix + d, is_dir=True)]
+                excluded += [prefix + f for f in files if ignore_file.is_excluded(prefix + f, is_dir=False)]
+            dirs[:] = [d for d in dirs if not ignore_file.is_excluded(prefix + d, is_dir=True)]
+            files = [f for f in files if not ignore_file.is_excluded(prefix + f, is_dir=False)]
+        yield root, dirs, files
+
+
+def _parse_line(line: str) -> Optional[Tuple[Pattern, bool, bool]]:
+    line = line.rstrip("\r\n")
+    if not line.strip() or line.startswith("#"):
+        return None
+    line = line.rstrip(" ")
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    regex = ("^" if anchored else "^(?:.*/)?") + _pattern_to_regex(line.lstrip("/")) + "$"
+    return re.compile(regex), negate, dir_only
+
+
+def _pattern_to_regex(pattern: str) -> str:
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += "[" + body.replace("\\", "\\\\") + "]"
+            i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
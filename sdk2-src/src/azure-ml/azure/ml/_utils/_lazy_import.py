@@ -0,0 +1,35 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import importlib
+import sys
+import types
+from typing import Any, Dict, List
+
+
+def lazy_exports(package_name: str, exports: Dict[str, str]) -> None:
+    """Makes the names a package exports from its submodules load on first access
+
+    :param package_name: __name__ of the package, called from its __init__.
+    :param exports: Maps each exported name to the relative name of the submodule defining it.
+
+    `from package import Name` and `package.Name` import the submodule defining Name the first time
+    they run, so importing the package only costs what its users actually touch. This works on
+    Python 3.6 as well, which has no module level __getattr__.
+    """
+    package = sys.modules[package_name]
+
+    class _LazyPackage(types.ModuleType):
+        def __getattr__(self, name: str) -> Any:
+            submodule = exports.get(name)
+            if submodule is None:
+                raise AttributeError(f"module '{package_name}' has no attribute '{name}'")
+            value = getattr(importlib.import_module(submodule, package_name), name)
+            setattr(self, name, value)
+            return value
+
+        def __dir__(self) -> List[str]:
+            return sorted(set(super(_LazyPackage, self).__dir__()) | set(exports))
+
+    package.__class__ = _LazyPackage
@@ -2,10 +2,22 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
-from typing import Union
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Tuple, TypeVar, Union, cast
 
-from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
-from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient
+from azure.core.pipeline.transport import RequestsTransport
+
+from azure.ml._artifacts.constants import AZ_ML_ARTIFACT_DIRECTORY, STORAGE_CLIENT_POOL_MAX_SIZE
+from azure.ml._utils._http_utils import get_shared_transport
+
+# the storage SDKs are only imported when the first storage client is created
+if TYPE_CHECKING:
+    from azure.storage.blob import BlobServiceClient
+    from azure.storage.fileshare import ShareDirectoryClient
+    from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
+    from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient
 
 
 SUPPORTED_STORAGE_TYPES = ["AzureBlob", "AzureDataLakeGen2", "AzureFile"]
@@ -15,12 +27,94 @@ STORAGE_ACCOUNT_URLS = {
     "AzureFile": "https://{}.file.core.windows.net",
 }
 
+T = TypeVar("T")
+
+
+class StorageClientPool(object):
+    """Process-wide pool of storage SDK clients keyed by account url, container and credential.
+
+    All pooled clients send their requests through the process-wide transport that the other clients of
+    MLClient use as well, so repeated uploads and downloads reuse warm connections instead of opening a
+    new connection pool each time. The pool keeps at most `max_size` clients and drops the least recently
+    used ones beyond that; the shared transport is never closed by a client, so evicting a client does
+    not affect the others.
+    """
+
+    def __init__(self, max_size: int = STORAGE_CLIENT_POOL_MAX_SIZE):
+        self._max_size = max_size
+        self._clients = OrderedDict()  # type: OrderedDict[Hashable, object]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    @property
+    def transport(self) -> RequestsTransport:
+        return get_shared_transport()
+
+    def get_blob_service_client(self, account_url: str, container_name: str, credential: Any) -> "BlobServiceClient":
+        from azure.storage.blob import BlobServiceClient
+
+        return self._get_or_create(
+            ("blob", account_url, container_name, _credential_key(credential)),
+            lambda: BlobServiceClient(account_url=account_url, credential=credential, transport=self.transport),
+        )
+
+    def get_share_directory_client(self, account_url: str, share_name: str, credential: Any) -> "ShareDirectoryClient":
+        from azure.storage.fileshare import ShareDirectoryClient
+
+        return self._get_or_create(
+            ("file", account_url, share_name, _credential_key(credential)),
+            lambda: ShareDirectoryClient(
+                account_url=account_url,
+                credential=credential,
+                share_name=share_name,
+                directory_path=AZ_ML_ARTIFACT_DIRECTORY,
+                transport=self.transport,
+            ),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def _get_or_create(self, key: Tuple, factory: Callable[[], T]) -> T:
+        with self._lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return cast(T, self._clients[key])
+        client = factory()
+        with self._lock:
+            # keep the client of a concurrent caller if it won the race
+            client = cast(T, self._clients.setdefault(key, client))
+            self._clients.move_to_end(key)
+            while len(self._clients) > self._max_size:
+                self._clients.popitem(last=False)
+            return client
+
+
+def _credential_key(credential: Any) -> Hashable:
+    # account keys and SAS tokens are not kept in the pool keys in clear text
+    if isinstance(credential, str):
+        return hashlib.sha256(credential.encode()).hexdigest()
+    return id(credential)
+
+
+_storage_client_pool = StorageClientPool()
+
+
+def get_storage_client_pool() -> StorageClientPool:
+    return _storage_client_pool
+
 
 def get_storage_client(
     credential: str, container_name: str, storage_account: str, storage_type: str
-) -> Union[DefaultStorageClient, FileStorageClient]:
+) -> Union["DefaultStorageClient", "FileStorageClient"]:
     """
     Return a storage client class instance based on the storage account type
+
+    The returned instance is new, but the underlying SDK client and its connections come from the
+    process-wide storage client pool.
     """
     if storage_type not in SUPPORTED_STORAGE_TYPES:
         raise Exception(
@@ -28,8 +122,23 @@ def get_storage_client(
             f"types for artifact upload include: {*SUPPORTED_STORAGE_TYPES,}"
         )
     account_url = STORAGE_ACCOUNT_URLS[storage_type].format(storage_account)
+    pool = get_storage_client_pool()
 
     if storage_type in ["AzureBlob", "AzureDataLakeGen2"]:
-        return DefaultStorageClient(credential=credential, container_name=container_name, account_url=account_url)
+        from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
+
+        return DefaultStorageClient(
+            credential=credential,
+            container_name=container_name,
+            account_url=account_url,
+            service_client=pool.get_blob_service_client(account_url, container_name, credential),
+        )
     elif storage_type == "AzureFile":
-        return FileStorageClient(credential=credential, file_share_name=container_name, account_url=account_url)
+        from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient
+
+        return FileStorageClient(
+            credential=credential,
+            file_share_name=container_name,
+            account_url=account_url,
+            directory_client=pool.get_share_directory_client(account_url, container_name, credential),
+        )
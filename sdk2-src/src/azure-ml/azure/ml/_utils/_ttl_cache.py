@@ -0,0 +1,99 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache(object):
+    """Thread-safe in-memory cache whose entries expire `ttl_seconds` after they were stored.
+
+    A ttl of 0 or less disables the cache: every lookup goes to the loader, while an infinite ttl
+    keeps entries for the lifetime of the cache. Concurrent lookups of the same missing key wait for
+    a single load instead of each calling the loader.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        self._entries = {}  # type: Dict[Hashable, Tuple[float, Any]]
+        self._lock = threading.Lock()
+        # lock of every key being loaded, with the number of threads holding or waiting for it
+        self._key_locks = {}  # type: Dict[Hashable, Tuple[threading.Lock, int]]
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock, waiters = self._key_locks.get(key, (threading.Lock(), 0))
+            self._key_locks[key] = (key_lock, waiters + 1)
+        try:
+            with key_lock:
+                # another thread may have loaded the value while this one was waiting
+                value = self.get(key)
+                if value is None:
+                    value = loader()
+                    self.put(key, value)
+                return value
+        finally:
+            # the lock of a key is dropped with its last waiter, so only keys being loaded hold a lock
+            with self._lock:
+                key_lock, waiters = self._key_locks[key]
+                if waiters == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (key_lock, waiters - 1)
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Asynchronous get_or_load for caches used from an event loop
+
+        The cache holds the future of each load, so concurrent lookups of the same missing key await a
+        single load. A failed load is dropped from the cache, so the next lookup loads again.
+        """
+        future = self.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self.put(key, future)
+        try:
+            # a cancelled caller must not cancel the load other callers are awaiting
+            return await asyncio.shield(future)
+        except Exception:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] is future:
+                    del self._entries[key]
+            raise
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drops the entry for key, or every entry if no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -11,8 +11,12 @@ from typing import Dict, Union
 from requests.adapters import HTTPAdapter
 from urllib3 import Retry
 
+from azure.ml._utils._http_utils import create_pooled_adapter
+
 DEVELOPER_URL_MFE_ENV_VAR = "AZUREML_DEV_URL_MFE"
 
+_retry_adapters = {}  # type: Dict[int, HTTPAdapter]
+
 
 def _get_developer_override(base_url):
     dev_override_url = os.environ.get(DEVELOPER_URL_MFE_ENV_VAR, base_url)
@@ -37,14 +41,18 @@ def create_session_with_retry(retry=3):
     """
     Create requests.session with retry
 
+    Sessions with the same number of retries share one adapter, and so one connection pool.
+
     :type retry: int
     rtype: Response
     """
-    retry_policy = get_retry_policy(num_retry=retry)
+    adapter = _retry_adapters.get(retry)
+    if adapter is None:
+        adapter = _retry_adapters.setdefault(retry, create_pooled_adapter(get_retry_policy(num_retry=retry)))
 
     session = requests.Session()
-    session.mount("https://", HTTPAdapter(max_retries=retry_policy))
-    session.mount("http://", HTTPAdapter(max_retries=retry_policy))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     return session
 
 
@@ -3,7 +3,7 @@
 # ---------------------------------------------------------
 
 import functools
-import yaml
+import threading
 from collections import OrderedDict
 from typing import Any, Callable, Optional, cast, Dict
 
@@ -43,14 +43,17 @@ def workspace_none_check(func: Callable[..., Any]) -> Callable[..., Any]:
     return new_function
 
 
-class _WorkspaceDependentOperations(object):
-    def __init__(self, workspace_scope: WorkspaceScope):
-        self._workspace_scope = workspace_scope
-        self._scope_kwargs = {
-            "subscription_id": self._workspace_scope.subscription_id,
-            "resource_group_name": self._workspace_scope.resource_group_name,
-            "api_version": API_VERSION_2020_09_01_PREVIEW,
-        }
+_yaml_setup_lock = threading.Lock()
+_yaml_is_setup = False
+
+
+def _setup_yaml_ordered_dicts() -> None:
+    global _yaml_is_setup
+    with _yaml_setup_lock:
+        if _yaml_is_setup:
+            return
+        import yaml
+
         # Marshmallow supports load/dump of ordered dicts, but pollutes the yaml to tag dicts as ordered dicts
         # Setting these load/dump functions make ordered dict the default in place of dict, allowing for clean yaml
         _mapping_tag = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
@@ -62,9 +65,21 @@ class _WorkspaceDependentOperations(object):
             loader.flatten_mapping(node)
             return OrderedDict(loader.construct_pairs(node))
 
-        # setup yaml to load and dump in order
+        # setup yaml to load and dump in order, once per process
         yaml.add_representer(OrderedDict, dict_representer)
         yaml.add_constructor(_mapping_tag, dict_constructor, Loader=yaml.SafeLoader)
+        _yaml_is_setup = True
+
+
+class _WorkspaceDependentOperations(object):
+    def __init__(self, workspace_scope: WorkspaceScope):
+        self._workspace_scope = workspace_scope
+        self._scope_kwargs = {
+            "subscription_id": self._workspace_scope.subscription_id,
+            "resource_group_name": self._workspace_scope.resource_group_name,
+            "api_version": API_VERSION_2020_09_01_PREVIEW,
+        }
+        _setup_yaml_ordered_dicts()
 
     @property  # type: ignore
     @workspace_none_check
@@ -80,13 +95,38 @@ class _WorkspaceDependentOperations(object):
         return self._workspace_scope.resource_group_name
 
 
+class _LazyOperations(Dict[str, Any]):
+    """Dict of operations that builds an operation from its factory the first time it is looked up"""
+
+    def __init__(self) -> None:
+        super(_LazyOperations, self).__init__()
+        self._factories = {}  # type: Dict[str, Callable[[], Any]]
+        # operations may look up the operations they depend on while they are being built
+        self._lock = threading.RLock()
+
+    def set_factory(self, name: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self.pop(name, None)
+            self._factories[name] = factory
+
+    def __missing__(self, name: str) -> Any:
+        with self._lock:
+            if name not in self:
+                self[name] = self._factories[name]()
+            return self[name]
+
+
 class OperationsContainer(object):
-    def __init__(self):
-        self._all_operations = {}
+    def __init__(self) -> None:
+        self._all_operations = _LazyOperations()
 
     @property
-    def all_operations(self) -> Dict[str, _WorkspaceDependentOperations]:
+    def all_operations(self) -> Dict[str, Any]:
         return self._all_operations
 
     def add(self, name: str, operation: _WorkspaceDependentOperations) -> None:
         self._all_operations[name] = operation
+
+    def add_lazy(self, name: str, factory: Callable[[], Any]) -> None:
+        """Registers an operation that is only built by factory when it is first looked up"""
+        self._all_operations.set_factory(name, factory)
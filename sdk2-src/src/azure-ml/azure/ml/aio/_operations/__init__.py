@@ -0,0 +1,25 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+from .datastore_operations import DatastoreOperations
+from .compute_operations import ComputeOperations
+from .workspace_operations import WorkspaceOperations
+from .code_operations import CodeOperations
+from .data_operations import DataOperations
+from .model_operations import ModelOperations
+from .environment_operations import EnvironmentOperations
+from .job_operations import JobOperations
+from .endpoint_operations import EndpointOperations
+
+__all__ = [
+    "ComputeOperations",
+    "DatastoreOperations",
+    "JobOperations",
+    "ModelOperations",
+    "WorkspaceOperations",
+    "DataOperations",
+    "EndpointOperations",
+    "CodeOperations",
+    "EnvironmentOperations",
+]
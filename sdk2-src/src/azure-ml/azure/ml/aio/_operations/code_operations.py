@@ -0,0 +1,148 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import asyncio
+import math
+import os
+from functools import partial
+from pathlib import Path
+from typing import Union, Optional, Dict
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import CodeVersionResource, CodeVersion
+from azure.ml._operations.code_operations import CodeOperations as _SyncCodeOperations, _code_asset_name
+from azure.ml._utils._asset_utils import _parse_name_version, get_object_hash
+from azure.ml._utils._ignore_file import get_ignore_file
+from azure.ml._utils._ttl_cache import TTLCache
+from azure.ml._artifacts.aio._artifact_utilities import _upload_to_datastore
+from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
+from azure.ml._artifacts.constants import ASSET_PATH_ERROR, CHANGED_ASSET_PATH_MSG
+from .datastore_operations import DatastoreOperations
+
+
+class CodeOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on code assets
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.code
+
+    Code registered on behalf of jobs is named after its content, like in
+    azure.ml._operations.CodeOperations, so the same code is only uploaded and registered once.
+    """
+
+    def __init__(
+        self,
+        workspace_scope: WorkspaceScope,
+        service_client: AzureMachineLearningWorkspaces,
+        datastore_operations: DatastoreOperations,
+        **kwargs: Dict,
+    ):
+        super(CodeOperations, self).__init__(workspace_scope)
+        self._version_operation = service_client.code_versions
+        self._datastore_operation = datastore_operations
+        self._init_kwargs = kwargs
+        self._registration_memo = TTLCache(math.inf)
+
+    async def create(
+        self,
+        name: str,
+        directory: Union[str, os.PathLike],
+        version: str = None,
+        datastore_name: Optional[str] = None,
+        show_progress: bool = True,
+    ) -> CodeVersionResource:
+        """Creates a versioned code asset from the given file or directory and uploads it to a datastore.
+
+        If no datastore is provided, the code asset will be uploaded to the MLClient's workspace default datastore.
+        """
+        return await self._create(name, directory, version, datastore_name, show_progress)
+
+    async def _create(
+        self,
+        name: str,
+        directory: Union[str, os.PathLike],
+        version: str = None,
+        datastore_name: Optional[str] = None,
+        show_progress: bool = True,
+        asset_hash: Optional[str] = None,
+    ) -> CodeVersionResource:
+        asset_path, datastore_resource_id = await _upload_to_datastore(
+            self._workspace_scope,
+            self._datastore_operation,
+            directory,
+            datastore_name=datastore_name,
+            show_progress=show_progress,
+            include_container_in_asset_path=False,
+            asset_hash=asset_hash,
+            ignore_file=get_ignore_file(directory, use_gitignore=True),
+        )
+
+        code_version = CodeVersion(asset_path=asset_path, datastore_id=datastore_resource_id)
+        code_version_resource = CodeVersionResource(properties=code_version)
+
+        if not version:
+            version = str(self._version_gen())
+        try:
+            int(version)
+        except ValueError:
+            raise Exception("Version must be an integer value.")
+
+        try:
+            return await self._version_operation.create_or_update(
+                name=name,
+                version=version,
+                subscription_id=self._workspace_scope.subscription_id,
+                resource_group_name=self._workspace_scope.resource_group_name,
+                workspace_name=self._workspace_name,
+                body=code_version_resource,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        except Exception as e:
+            # service side raises an exception if we attempt to update an existing asset's asset path
+            if str(e) == ASSET_PATH_ERROR:
+                raise Exception(CHANGED_ASSET_PATH_MSG)
+            else:
+                raise e
+
+    async def show(self, name: str) -> CodeVersionResource:
+        """Returns information about the code asset referenced by the given name"""
+        name, version = _parse_name_version(name)
+
+        if not version:
+            raise Exception("Code asset version must be specified as part of name parameter, in format 'name:version'.")
+        return await self._version_operation.get(
+            name=name,
+            version=version,
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def _get_or_create(self, path: Union[str, os.PathLike]) -> CodeVersionResource:
+        """Returns the code asset registered for the content at path, registering it if there is none"""
+        path = Path(path).resolve()
+        # hashing is blocking, so it runs on the default executor
+        asset_hash = await asyncio.get_event_loop().run_in_executor(
+            None, partial(get_object_hash, path, ignore_file=get_ignore_file(path, use_gitignore=True))
+        )
+        # the asynchronous upload never uploads a snapshot archive
+        name = _code_asset_name(asset_hash, path, False)
+        key = (self._subscription_id, self._resource_group_name, self._workspace_name, name)
+
+        async def load() -> CodeVersionResource:
+            version = str(self._version_gen())
+            try:
+                return await self.show(f"{name}:{version}")
+            except ResourceNotFoundError:
+                return await self._create(name, str(path), version, asset_hash=asset_hash)
+
+        return await self._registration_memo.get_or_load_async(key, load)
+
+    # version generation is shared with the synchronous operations
+    _version_gen = staticmethod(_SyncCodeOperations._version_gen)
@@ -0,0 +1,165 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._operations.data_operations import DataOperations as _SyncDataOperations
+from azure.ml._artifacts.aio._artifact_utilities import upload_artifact
+from azure.ml._utils._arm_id_utils import get_datastore_arm_id
+from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope
+from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
+from azure.ml._schema.asset import InternalAsset
+from .datastore_operations import DatastoreOperations
+
+
+class DataOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on data assets
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.data
+    """
+
+    def __init__(
+        self,
+        workspace_scope: WorkspaceScope,
+        service_client: AzureMachineLearningWorkspaces,
+        datastore_operations: DatastoreOperations,
+        **kwargs: Dict,
+    ):
+        super(DataOperations, self).__init__(workspace_scope)
+        self._operation = service_client.data_versions
+        self._container_operation = service_client.data_containers
+        self._datastore_operations = datastore_operations
+        self._init_kwargs = kwargs
+
+    async def list(self, name: str = None) -> List[InternalAsset]:
+        if name:
+            return [
+                InternalAsset._from_data_version(str(name), data_version)
+                async for data_version in self._operation.list(
+                    name,
+                    self._subscription_id,
+                    self._resource_group_name,
+                    self._workspace_name,
+                    API_VERSION_2020_09_01_PREVIEW,
+                    skip_token=None,
+                    **self._init_kwargs,
+                )
+            ]
+        return [
+            InternalAsset._from_data_container(data_container)
+            async for data_container in self._container_operation.list(
+                self._subscription_id,
+                self._resource_group_name,
+                self._workspace_name,
+                API_VERSION_2020_09_01_PREVIEW,
+                skip_token=None,
+                **self._init_kwargs,
+            )
+        ]
+
+    async def get(self, name: str, version: int) -> InternalAsset:
+        data_version = await self._operation.get(
+            name,
+            str(version),
+            self._subscription_id,
+            self._resource_group_name,
+            self._workspace_name,
+            API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+        return InternalAsset._from_data_version(name, data_version)
+
+    async def create_or_update(
+        self,
+        name: str = None,
+        version: int = None,
+        description: str = None,
+        linked_service_id: str = None,
+        file_path: Union[str, os.PathLike] = None,
+        directory_path: Union[str, os.PathLike] = None,
+        yaml_path: Union[str, os.PathLike, None] = None,
+    ) -> InternalAsset:
+        loaded_data = self._load_yaml(yaml_path)
+
+        loaded_data.name = name or loaded_data.name
+        loaded_data.version = version if version else loaded_data.version
+
+        if loaded_data.name is None or loaded_data.version is None:
+            raise Exception(
+                'Name and version are required, please provide name and version in "<name>:<version>" format '
+                "or in yaml file."
+            )
+
+        loaded_data.description = description or loaded_data.description
+        loaded_data.datastore = linked_service_id or loaded_data.datastore
+
+        if file_path and directory_path:
+            raise Exception("The asset needs to point to either a file or a folder.")
+        elif file_path or directory_path:
+            # overwriting from directly passed in arguments
+            loaded_data.file = str(file_path) if file_path else loaded_data.file
+            loaded_data.directory = str(directory_path) if directory_path else loaded_data.directory
+
+        result = await self._operation.create_or_update(
+            str(loaded_data.name),
+            str(loaded_data.version),
+            self._subscription_id,
+            self._resource_group_name,
+            self._workspace_name,
+            API_VERSION_2020_09_01_PREVIEW,
+            loaded_data.to_data_version(),
+            **self._init_kwargs,
+        )
+        return InternalAsset._from_data_version(str(loaded_data.name), result)
+
+    async def upload(
+        self,
+        name: str,
+        version: int,
+        local_path: Union[str, os.PathLike],
+        description: str = None,
+        linked_service_name: str = None,
+    ) -> InternalAsset:
+        path = Path(local_path)
+        datastore_name = linked_service_name or (await self._datastore_operations.get_default()).name
+        asset_path = await upload_artifact(
+            str(path), self._datastore_operations, datastore_name, include_container_in_asset_path=False
+        )
+        datastore_resource_id = get_datastore_arm_id(str(datastore_name), self._workspace_scope)
+        if path.is_dir():
+            return await self.create_or_update(
+                name=name,
+                version=version,
+                description=description,
+                linked_service_id=datastore_resource_id,
+                directory_path=asset_path.path,
+            )
+        return await self.create_or_update(
+            name=name,
+            version=version,
+            description=description,
+            linked_service_id=datastore_resource_id,
+            file_path=asset_path.path,
+        )
+
+    async def delete(self, name: str, version: int) -> None:
+        if version:
+            return await self._operation.delete(
+                name,
+                str(version),
+                self._subscription_id,
+                self._resource_group_name,
+                self._workspace_name,
+                API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        else:
+            raise Exception("Deletion on the whole lineage is not supported yet.")
+
+    # loading the yaml file is shared with the synchronous operations
+    _load_yaml = _SyncDataOperations._load_yaml
@@ -0,0 +1,193 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import copy
+import math
+from typing import Dict, List, Optional
+
+from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
+from azure.ml._operations.datastore_operations import _get_cache_ttl
+from azure.ml._datastore.datastore_utilities import create_azure_blob_storage_request
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import (
+    DatastoreCredentials,
+    DatastorePropertiesResource,
+)
+from azure.ml._utils._ttl_cache import TTLCache
+from azure.ml._workspace_dependent_operations import WorkspaceScope, _WorkspaceDependentOperations
+
+
+class DatastoreOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on Datastores
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.datastores
+
+    Datastore resources, the name of the default datastore and datastore credentials are cached
+    like in azure.ml._operations.DatastoreOperations. Concurrent lookups of the same datastore
+    share a single request.
+    """
+
+    def __init__(self, workspace_scope: WorkspaceScope, service_client: AzureMachineLearningWorkspaces, **kwargs: Dict):
+        super(DatastoreOperations, self).__init__(workspace_scope)
+        self._operation = service_client.datastores
+        self._init_kwargs = kwargs
+        cache_ttl = _get_cache_ttl()
+        self._resource_cache = TTLCache(cache_ttl)
+        self._secret_cache = TTLCache(cache_ttl)
+        self._upload_memo = TTLCache(math.inf)
+
+    async def list(self, include_secrets: bool = False) -> List[DatastorePropertiesResource]:
+        """Lists all datastores and associated information within a workspace"""
+        ds_list = [
+            ds
+            async for ds in self._operation.list(
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            )
+        ]
+        if include_secrets:
+            for ds in ds_list:
+                ds_credentials = await self._get_secrets(ds.name)
+                if ds.properties.contents.azure_storage:
+                    ds.properties.contents.azure_storage.credentials = ds_credentials
+        return ds_list
+
+    async def delete(self, datastore_name: str) -> None:
+        """Deletes a datastore reference with the given name from the workspace. This method
+        does not delete the actual datastore or underlying data in the datastore.
+        """
+        try:
+            return await self._operation.delete(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            )
+        finally:
+            self.invalidate_cache(datastore_name)
+
+    async def show(self, datastore_name: str, include_secrets: bool = False) -> DatastorePropertiesResource:
+        """Returns information about the datastore referenced by the given name"""
+        datastore_properties = await self._resource_cache.get_or_load_async(
+            self._cache_key(datastore_name),
+            lambda: self._operation.get(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            ),
+        )
+        return await self._with_secrets(datastore_properties, include_secrets)
+
+    async def get_default(self, include_secrets: bool = False) -> DatastorePropertiesResource:
+        async def load_default() -> DatastorePropertiesResource:
+            async for ds in self._operation.list(
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                is_default=True,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            ):
+                return ds
+            raise Exception(f"Workspace {self._workspace_name} has no default datastore.")
+
+        ds = await self._resource_cache.get_or_load_async(self._cache_key(None), load_default)
+        return await self._with_secrets(ds, include_secrets)
+
+    def invalidate_cache(self, datastore_name: Optional[str] = None) -> None:
+        """Drops the cached resource and credentials of the given datastore, or of every datastore if
+        no name is given. The default datastore is looked up again in both cases.
+        """
+        self._resource_cache.invalidate(self._cache_key(None))
+        if datastore_name is None:
+            self._resource_cache.invalidate()
+            self._secret_cache.invalidate()
+        else:
+            self._resource_cache.invalidate(self._cache_key(datastore_name))
+            self._secret_cache.invalidate(self._cache_key(datastore_name))
+
+    async def _get_secrets(self, datastore_name: str) -> DatastoreCredentials:
+        return await self._secret_cache.get_or_load_async(
+            self._cache_key(datastore_name),
+            lambda: self._operation.list_secrets(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs
+            ),
+        )
+
+    async def _with_secrets(
+        self, datastore_properties: DatastorePropertiesResource, include_secrets: bool
+    ) -> DatastorePropertiesResource:
+        datastore_name = datastore_properties.name
+        # callers get their own copy, so cached resources never carry credentials
+        datastore_properties = copy.deepcopy(datastore_properties)
+        if include_secrets and datastore_name:
+            datastore_credentials = await self._get_secrets(datastore_name)
+            if datastore_properties.properties.contents.azure_storage:
+                datastore_properties.properties.contents.azure_storage.credentials = datastore_credentials
+        return datastore_properties
+
+    def _cache_key(self, datastore_name: Optional[str]) -> tuple:
+        # None stands for the default datastore of the workspace
+        return (self._workspace_scope.subscription_id, self._workspace_scope.resource_group_name,
+                self._workspace_name, datastore_name)
+
+    async def attach_azure_blob_storage(
+        self,
+        datastore_name: str,
+        container_name: str,
+        account_name: str,
+        description: str = None,
+        has_been_validated: bool = None,
+        ident: str = None,
+        is_default: bool = None,
+        tags: Dict[str, str] = None,
+        sas_token: str = None,
+        account_key: str = None,
+        protocol: str = None,
+        endpoint: str = None,
+        blob_cache_timeout: str = None,
+    ) -> DatastorePropertiesResource:
+        """Registers an Azure Blob container to the workspace
+
+        You can use either a SAS Token or Storage Account Key as a credential to the datastore.
+        """
+        request_body = create_azure_blob_storage_request(
+            container_name,
+            account_name,
+            description=description,
+            has_been_validated=has_been_validated,
+            ident=ident,
+            is_default=is_default,
+            tags=tags,
+            sas_token=sas_token,
+            account_key=account_key,
+            protocol=protocol,
+            endpoint=endpoint,
+            blob_cache_timeout=blob_cache_timeout,
+        )
+        try:
+            return await self._operation.create_or_update(
+                datastore_name,
+                self._workspace_scope.subscription_id,
+                self._workspace_scope.resource_group_name,
+                self._workspace_name,
+                request_body,
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+            )
+        finally:
+            self.invalidate_cache(datastore_name)
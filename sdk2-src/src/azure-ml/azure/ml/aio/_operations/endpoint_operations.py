@@ -0,0 +1,323 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+from functools import partial
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import (
+    BatchEndpointTrackedResource,
+    AuthKeys,
+    AuthToken,
+    DeploymentLogsRequest,
+)
+from azure.ml._operations.endpoint_operations import (
+    EndpointOperations as _SyncEndpointOperations,
+    _dependency_key,
+)
+from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope, OperationsContainer
+from azure.ml.constants import (
+    API_VERSION_2020_12_01_PREVIEW,
+    API_VERSION_2020_09_01_PREVIEW,
+    ONLINE_ENDPOINT_TYPE,
+    OperationTypes,
+)
+from azure.ml._schema._endpoint.online.online_endpoint import InternalOnlineEndpoint
+from azure.ml._schema._endpoint.batch.batch_endpoint import InternalBatchEndpoint
+from azure.ml._schema._endpoint.code_configuration_schema import InternalCodeConfiguration
+from .operation_orchestrator import OperationOrchestrator
+
+
+class EndpointOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on online and batch endpoints
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.endpoints
+
+    Online endpoints are created through an ARM template deployment, which is only available on
+    azure.ml.MLClient.
+    """
+
+    def __init__(
+        self,
+        workspace_scope: WorkspaceScope,
+        service_client: AzureMachineLearningWorkspaces,
+        all_operations: OperationsContainer,
+        **kwargs: Dict,
+    ):
+        super(EndpointOperations, self).__init__(workspace_scope)
+        self._online_operation = service_client.online_endpoints
+        self._batch_operation = service_client.batch_endpoints
+        self._online_deployment = service_client.online_deployments
+        self._batch_deployment = service_client.batch_deployments
+        self._all_operations = all_operations
+        self._init_kwargs = kwargs
+
+    def list(self, type: str) -> AsyncIterable:
+        endpoint_type = self._validate_endpoint_type(type=type)
+        self._throw_if_no_endpoint_type(endpoint_type)
+        if endpoint_type.lower() == ONLINE_ENDPOINT_TYPE:
+            return self._online_operation.list(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                api_version=API_VERSION_2020_12_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        return self._batch_operation.list(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def list_keys(self, type: str, name: str) -> Union[AuthKeys, AuthToken, None]:
+        endpoint_type = self._validate_endpoint_type(type=type)
+        self._throw_if_no_endpoint_type(endpoint_type)
+        if endpoint_type.lower() == ONLINE_ENDPOINT_TYPE:
+            return await self._get_online_credentials(name=name)
+        return None
+
+    async def get(self, type: str, name: str) -> Union[Dict[str, Any], BatchEndpointTrackedResource]:
+        endpoint_type = self._validate_endpoint_type(type=type)
+        self._throw_if_no_endpoint_type(endpoint_type)
+        if endpoint_type.lower() == ONLINE_ENDPOINT_TYPE:
+            return await self._get_online_endpoint(name)
+        return await self._batch_operation.get(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            name=name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def delete(self, type: str, name: str, deployment: str = None) -> None:
+        endpoint_type = self._validate_endpoint_type(type=type)
+        self._throw_if_no_endpoint_type(endpoint_type)
+        if endpoint_type.lower() == ONLINE_ENDPOINT_TYPE:
+            return await self._delete_online_endpoint(name=name, deployment=deployment)
+        return await self._batch_operation.delete(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            name=name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def create(
+        self, file: Union[str, os.PathLike], type: str = None, name: Optional[str] = None
+    ) -> BatchEndpointTrackedResource:
+        self._validate_endpoint_type(type=type)
+        if not file:
+            raise Exception("Please provide yaml file for the creation parameters")
+
+        loaded_endpoint = self._load_endpoint(file, type)
+        endpoint_type = type or loaded_endpoint.type
+        if endpoint_type.lower() == ONLINE_ENDPOINT_TYPE:
+            raise Exception("Creating online endpoints is only supported by azure.ml.MLClient.")
+        return await self._create_batch_endpoint(internal_endpoint=loaded_endpoint, name=name)
+
+    async def get_deployment_logs(
+        self,
+        endpoint_name: str,
+        deployment_name: str,
+        tail: int,
+        type: str = None,
+        container_type: Optional[str] = None,
+    ) -> Optional[str]:
+        endpoint_type = self._validate_endpoint_type(type=type)
+        if endpoint_type != ONLINE_ENDPOINT_TYPE:
+            return None
+        if container_type:
+            container_type = self._validate_deployment_log_container_type(container_type)
+        log_request = DeploymentLogsRequest(container_type=container_type, tail=tail)
+        logs = await self._online_deployment.get_logs(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            endpoint_name=endpoint_name,
+            deployment_name=deployment_name,
+            body=log_request,
+            api_version=API_VERSION_2020_12_01_PREVIEW,
+            **self._init_kwargs,
+        )
+        return logs.content
+
+    # loading and validation are shared with the synchronous operations
+    _load_endpoint = _SyncEndpointOperations._load_endpoint
+    _validate_endpoint_type = _SyncEndpointOperations._validate_endpoint_type
+    _throw_if_no_endpoint_type = _SyncEndpointOperations._throw_if_no_endpoint_type
+    _validate_deployment_log_container_type = _SyncEndpointOperations._validate_deployment_log_container_type
+
+    async def _load_code_configuration(self, endpoint: InternalBatchEndpoint) -> None:
+        """Resolves the code, environment and model of every deployment concurrently
+
+        A dependency shared by several deployments is resolved, and uploaded, only once.
+        """
+        orchestrator = OperationOrchestrator(
+            operation_container=self._all_operations, workspace_scope=self._workspace_scope
+        )
+
+        descriptions = {}  # type: Dict[Tuple[str, Any], str]
+        resolvers = {}  # type: Dict[str, Callable[[], Awaitable[Any]]]
+        for deployment_name, deployment in endpoint.deployments.items():
+            code = deployment.code_configuration.code
+            dependencies = [  # type: List[Tuple[str, Any, Callable[[], Awaitable[Any]]]]
+                ("code", code, partial(orchestrator.get_code_asset_arm_id, code_asset=code, register_asset=False)),
+                (
+                    "environment",
+                    deployment.environment,
+                    partial(orchestrator.get_environment_arm_id, environment=deployment.environment),
+                ),
+                ("model", deployment.model, partial(orchestrator.get_model_arm_id, model=deployment.model)),
+            ]
+            for kind, dependency, resolver in dependencies:
+                key = _dependency_key(kind, dependency)
+                if key not in descriptions:
+                    descriptions[key] = f"{kind} of deployment {deployment_name}"
+                    resolvers[descriptions[key]] = resolver
+
+        resolved = await orchestrator.resolve_all(resolvers)
+        for deployment in endpoint.deployments.values():
+            deployment.code_configuration = InternalCodeConfiguration(
+                code=resolved[descriptions[_dependency_key("code", deployment.code_configuration.code)]],
+                scoring_script=deployment.code_configuration.scoring_script,
+            )
+            deployment.environment = resolved[descriptions[_dependency_key("environment", deployment.environment)]]
+            deployment.model = resolved[descriptions[_dependency_key("model", deployment.model)]]
+
+    async def _get_workspace_location(self, workspace_name: str) -> str:
+        return (await self._all_operations.all_operations[OperationTypes.WORKSPACES].get(workspace_name)).location
+
+    async def _get_online_endpoint(self, name: str) -> Dict[str, Any]:
+        endpoint = await self._online_operation.get(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            endpoint_name=name,
+            api_version=API_VERSION_2020_12_01_PREVIEW,
+            **self._init_kwargs,
+        )
+        deployments = [
+            deployment
+            async for deployment in self._online_deployment.list(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                endpoint_name=name,
+                api_version=API_VERSION_2020_12_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        ]
+        return InternalOnlineEndpoint()._from_rest(endpoint, deployments)
+
+    async def _delete_online_endpoint(self, name: str, deployment: str = None) -> None:
+        if deployment:
+            endpoint = await self._online_operation.get(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                endpoint_name=name,
+                api_version=API_VERSION_2020_12_01_PREVIEW,
+                **self._init_kwargs,
+            )
+            if (
+                endpoint.properties
+                and endpoint.properties.traffic_rules
+                and deployment in endpoint.properties.traffic_rules.keys()
+                and endpoint.properties.traffic_rules[deployment] > 0
+            ):
+                raise Exception(
+                    f"The deployment {deployment} has live traffic. Can't be deleted. "
+                    "Please scale down traffic to 0 first."
+                )
+            return await self._online_deployment.delete(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                endpoint_name=name,
+                deployment_name=deployment,
+                api_version=API_VERSION_2020_12_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        return await self._online_operation.delete(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            endpoint_name=name,
+            api_version=API_VERSION_2020_12_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def _create_batch_endpoint(
+        self, internal_endpoint: InternalBatchEndpoint, name: Optional[str] = None
+    ) -> BatchEndpointTrackedResource:
+        await self._load_code_configuration(internal_endpoint)
+        location = await self._get_workspace_location(self._workspace_name)
+        endpoint_resource = internal_endpoint._to_rest_batch_endpoint(location)
+        name = name or internal_endpoint.name
+        await self._batch_operation.create_or_update(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            name=name,
+            body=endpoint_resource,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+        for deployment_name, deployment in internal_endpoint.deployments.items():
+            await self._batch_deployment.create_or_update(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                endpoint_name=name,
+                id=deployment_name,
+                body=deployment._to_rest_obj(location=location),
+                api_version=API_VERSION_2020_09_01_PREVIEW,
+                **self._init_kwargs,
+            )
+
+        # set the traffic
+        endpoint_resource = internal_endpoint._to_rest_batch_endpoint_with_traffic(location)
+        return await self._batch_operation.create_or_update(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            name=name,
+            body=endpoint_resource,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._init_kwargs,
+        )
+
+    async def _get_online_credentials(self, name: str) -> Union[AuthKeys, AuthToken]:
+        endpoint = await self._online_operation.get(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            endpoint_name=name,
+            api_version=API_VERSION_2020_12_01_PREVIEW,
+            **self._init_kwargs,
+        )
+        if endpoint.properties.auth_mode.lower() == "key":
+            return await self._online_operation.list_keys(
+                subscription_id=self._subscription_id,
+                resource_group_name=self._resource_group_name,
+                workspace_name=self._workspace_name,
+                endpoint_name=name,
+                api_version=API_VERSION_2020_12_01_PREVIEW,
+                **self._init_kwargs,
+            )
+        return await self._online_operation.get_token(
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            endpoint_name=name,
+            api_version=API_VERSION_2020_12_01_PREVIEW,
+            **self._init_kwargs,
+        )
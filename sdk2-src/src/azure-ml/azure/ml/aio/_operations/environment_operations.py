@@ -0,0 +1,124 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+from typing import Any, AsyncIterable, Optional, Union
+
+from azure.ml.constants import API_VERSION_2020_09_01_PREVIEW
+from azure.ml._operations.environment_operations import EnvironmentOperations as _SyncEnvironmentOperations
+from azure.ml._schema.environment import InternalEnvironment
+from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import EnvironmentSpecificationVersionResource
+
+
+class EnvironmentOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on environments
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.environments
+    """
+
+    def __init__(self, workspace_scope: WorkspaceScope, service_client: AzureMachineLearningWorkspaces, **kwargs: Any):
+        super(EnvironmentOperations, self).__init__(workspace_scope)
+        self._kwargs = kwargs
+        self._containers_operations = service_client.environment_containers
+        self._version_operations = service_client.environment_specification_versions
+
+    async def create_or_update(
+        self,
+        environment_name: Optional[str] = None,
+        environment_version: Optional[int] = None,
+        file: Union[str, os.PathLike, None] = None,
+        **kwargs: Any,
+    ) -> EnvironmentSpecificationVersionResource:
+        """
+        Create or update an environment
+        """
+        environment = self._load(
+            file=file, environment_name=environment_name, environment_version=environment_version, **kwargs
+        )
+        return await self._create_or_update(
+            environment=environment, environment_name=environment_name, environment_version=environment_version
+        )
+
+    async def get(self, environment_name: str, environment_version: int) -> EnvironmentSpecificationVersionResource:
+        """
+        Gets a specific version of an environment
+        """
+        return await self._version_operations.get(
+            name=environment_name,
+            version=str(environment_version),
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_scope.workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        )
+
+    async def get_latest_version(self, environment_name: str) -> Optional[EnvironmentSpecificationVersionResource]:
+        """
+        Gets the latest version of the environment
+        """
+        async for environment in self._version_operations.list(
+            name=environment_name,
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_scope.workspace_name,
+            orderby="Version desc",
+            top=1,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        ):
+            return environment
+        return None
+
+    def list(self) -> AsyncIterable:
+        """
+        Lists the environment containers
+        """
+        return self._containers_operations.list(
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_scope.workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        )
+
+    def list_versions(self, environment_name: str) -> AsyncIterable:
+        """
+        Lists the environment versions
+        """
+        return self._version_operations.list(
+            name=environment_name,
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_scope.workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        )
+
+    # loading the yaml file is shared with the synchronous operations
+    _load = _SyncEnvironmentOperations._load
+
+    async def _create_or_update(
+        self,
+        environment: InternalEnvironment,
+        environment_name: Optional[str] = None,
+        environment_version: Optional[int] = None,
+    ) -> EnvironmentSpecificationVersionResource:
+        # override with args
+        environment.name = environment_name or environment.name
+        environment.version = environment_version or environment.version
+
+        return await self._version_operations.create_or_update(
+            name=environment.name,
+            version=str(environment.version),
+            subscription_id=self._subscription_id,
+            resource_group_name=self._resource_group_name,
+            workspace_name=self._workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            body=environment.translate_to_rest_object(),
+            **self._kwargs,
+        )
@@ -0,0 +1,112 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+from pathlib import Path
+from typing import Any, AsyncIterable, Dict, Union
+
+import yaml
+from marshmallow import ValidationError, RAISE
+
+from azure.ml.constants import (
+    API_VERSION_2020_09_01_PREVIEW,
+    BASE_PATH_CONTEXT_KEY,
+    PARAMS_OVERRIDE_KEY,
+    WORKSPACE_CONTEXT_KEY,
+)
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import JobBaseResource
+from azure.ml._operations.job_operations import JobOperations as _SyncJobOperations
+from azure.ml._schema.job import BaseJob
+from azure.ml._schema._utils import load_job_from_yaml
+from azure.ml._utils.utils import load_yaml
+from azure.ml._workspace_dependent_operations import _WorkspaceDependentOperations, WorkspaceScope, OperationsContainer
+from .operation_orchestrator import OperationOrchestrator
+
+
+class JobOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for submitting and querying jobs
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.jobs
+
+    Streaming logs and downloading outputs are only available on azure.ml.MLClient.
+    """
+
+    def __init__(
+        self,
+        workspace_scope: WorkspaceScope,
+        service_client: AzureMachineLearningWorkspaces,
+        all_operations: OperationsContainer,
+        **kwargs: Any,
+    ):
+        super(JobOperations, self).__init__(workspace_scope)
+        self._operation = service_client.jobs
+        self._all_operations = all_operations
+        self._kwargs = kwargs
+
+    def list(self) -> AsyncIterable[JobBaseResource]:
+        return self._operation.list(
+            self._workspace_scope.subscription_id,
+            self._workspace_scope.resource_group_name,
+            self._workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+        )
+
+    async def get(self, job_name: str) -> Any:
+        job_object = await self._operation.get(
+            id=job_name,
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_name,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        )
+        return _SyncJobOperations._dump(job_object)
+
+    async def submit(
+        self,
+        save_as_name: Union[str, os.PathLike, None] = None,
+        file: Union[str, os.PathLike, None] = None,
+        job_resource: BaseJob = None,
+        **kwargs: Any,
+    ) -> JobBaseResource:
+        """Submits a job loaded from a yaml file, or the given job
+
+        The code and environment of the job are uploaded and registered concurrently if needed.
+        """
+        if file:
+            yaml_job = load_yaml(file)
+            job_resource = await self._create_job_resource(cfg=yaml_job, file=file, **kwargs)
+        rest_job_resource = job_resource.translate_to_rest_object()
+        result = await self._operation.create_or_update(
+            id=rest_job_resource.name,
+            subscription_id=self._workspace_scope.subscription_id,
+            resource_group_name=self._workspace_scope.resource_group_name,
+            workspace_name=self._workspace_name,
+            body=rest_job_resource,
+            api_version=API_VERSION_2020_09_01_PREVIEW,
+            **self._kwargs,
+        )
+        if save_as_name is not None:
+            with open(save_as_name, "w") as f:
+                yaml.dump(_SyncJobOperations._dump(result), f, default_flow_style=False)
+        return result
+
+    async def _create_job_resource(
+        self, cfg: Dict, file: Union[str, os.PathLike, None] = None, unknown_type: str = RAISE, **kwargs: Any
+    ) -> BaseJob:
+        context = {
+            BASE_PATH_CONTEXT_KEY: Path("./") if file is None else Path(file).parent,
+            PARAMS_OVERRIDE_KEY: kwargs.get(PARAMS_OVERRIDE_KEY, None),
+            WORKSPACE_CONTEXT_KEY: self._workspace_scope,
+        }
+        try:
+            job_resource = load_job_from_yaml(cfg, context, unknown=unknown_type)
+        except ValidationError as e:
+            raise Exception(f"Error while parsing yaml file: {file} \n\n {str(e)}")
+        orchestrator = OperationOrchestrator(self._all_operations, self._workspace_scope)
+        resolved = await orchestrator.resolve_all(job_resource._get_dependency_resolvers(orchestrator))
+        job_resource._set_resolved_dependencies(resolved)
+        return job_resource
@@ -0,0 +1,101 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import os
+from pathlib import Path
+from typing import Any, AsyncIterable, Union
+
+from azure.ml._operations.model_operations import ModelOperations as _SyncModelOperations
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import ModelVersion, ModelVersionResource
+from azure.ml._schema import InternalModel
+from azure.ml._workspace_dependent_operations import WorkspaceScope, _WorkspaceDependentOperations
+from azure.ml._artifacts.aio._artifact_utilities import _upload_to_datastore
+from azure.ml._artifacts.constants import ASSET_PATH_ERROR, CHANGED_ASSET_PATH_MSG
+from .datastore_operations import DatastoreOperations
+
+
+class ModelOperations(_WorkspaceDependentOperations):
+    """Represents an asynchronous client for performing operations on models
+
+    You should not instantiate this class directly. Instead, you should create azure.ml.aio.MLClient and
+    use this client via the property MLClient.model
+    """
+
+    def __init__(
+        self,
+        workspace_scope: WorkspaceScope,
+        service_client: AzureMachineLearningWorkspaces,
+        datastore_operations: DatastoreOperations,
+    ):
+        super(ModelOperations, self).__init__(workspace_scope)
+        self._model_versions_operation = service_client.model_versions
+        self._model_container_operation = service_client.model_containers
+        self._datastore_operations = datastore_operations
+
+    async def create_or_update(self, file: Union[str, os.PathLike] = None, **kwargs: Any) -> InternalModel:
+        internal_model = self._load(file, **kwargs)
+        model_version_resource = await self._create_from(internal_model=internal_model)
+        return InternalModel.translate_from_rest_object(
+            name=internal_model.name, model_version_resource=model_version_resource
+        )
+
+    async def show(self, name: str, version: int) -> InternalModel:
+        model_version_resource = await self._model_versions_operation.get(
+            name=name, version=str(version), workspace_name=self._workspace_name, **self._scope_kwargs
+        )
+        return InternalModel.translate_from_rest_object(name=name, model_version_resource=model_version_resource)
+
+    async def delete(self, name: str, version: int) -> None:
+        if version:
+            return await self._model_versions_operation.delete(
+                name=name, version=str(version), workspace_name=self._workspace_name, **self._scope_kwargs
+            )
+        else:
+            raise Exception("Deletion on the whole lineage is not supported yet.")
+
+    def list(self, name: str = None) -> AsyncIterable:
+        if name:
+            return self._model_versions_operation.list(
+                name=name, workspace_name=self._workspace_name, **self._scope_kwargs
+            )
+        else:
+            return self._model_container_operation.list(workspace_name=self._workspace_name, **self._scope_kwargs)
+
+    # loading the yaml file is shared with the synchronous operations
+    _load = _SyncModelOperations._load
+
+    async def _create_from(self, internal_model: InternalModel) -> ModelVersionResource:
+        model_container_resource = internal_model.translate_to_rest_object()
+        path = Path(internal_model.asset_path)
+        if not path.is_absolute():
+            path = Path(internal_model._base_path, path).resolve()  # combine base path to asset path
+        name = internal_model.name
+        asset_path, datastore_resource_id = await _upload_to_datastore(
+            self._workspace_scope, self._datastore_operations, path
+        )
+        await self._model_container_operation.create_or_update(
+            name=name, body=model_container_resource, workspace_name=self._workspace_name, **self._scope_kwargs
+        )
+        model_version = ModelVersion(
+            asset_path=asset_path,
+            description=internal_model.description,
+            tags=internal_model.tags,
+            properties=internal_model._flatten_flavors(),
+            datastore_id=datastore_resource_id,
+        )
+        try:
+            return await self._model_versions_operation.create_or_update(
+                name=name,
+                version=str(internal_model.version),
+                body=ModelVersionResource(properties=model_version),
+                workspace_name=self._workspace_name,
+                **self._scope_kwargs,
+            )
+        except Exception as e:
+            # service side raises an exception if we attempt to update an existing asset's asset path
+            if str(e) == ASSET_PATH_ERROR:
+                raise Exception(CHANGED_ASSET_PATH_MSG)
+            else:
+                raise e
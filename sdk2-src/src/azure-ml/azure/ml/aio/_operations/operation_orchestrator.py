@@ -0,0 +1,120 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+import asyncio
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Tuple, Union
+
+from azure.ml._operations.code_operations import _code_asset_name
+from azure.ml._operations.operation_orchestrator import DependencyResolutionError
+from azure.ml._schema.code_asset import InternalCodeAsset
+from azure.ml._schema.environment import InternalEnvironment
+from azure.ml._schema.model import InternalModel
+from azure.ml._utils._arm_id_utils import is_arm_id, parse_name_version
+from azure.ml._utils._asset_utils import get_object_hash
+from azure.ml._utils._ignore_file import get_ignore_file
+from azure.ml._workspace_dependent_operations import OperationsContainer, WorkspaceScope
+from azure.ml._artifacts.aio._artifact_utilities import _upload_to_datastore
+from azure.ml.constants import OperationTypes
+
+
+class OperationOrchestrator(object):
+    """Asynchronous counterpart of azure.ml._operations.operation_orchestrator.OperationOrchestrator
+
+    Its methods have the same names and arguments and return coroutines, so the dependency resolvers
+    of a job (see ParameterizedCommand._get_dependency_resolvers) work with either orchestrator.
+    """
+
+    def __init__(self, operation_container: OperationsContainer, workspace_scope: WorkspaceScope):
+        self._operation_container = operation_container
+        self._workspace_scope = workspace_scope
+        self._datastore_operation = self._operation_container.all_operations[OperationTypes.DATASTORES]
+
+    async def get_code_asset_arm_id(
+        self, code_asset: Union[InternalCodeAsset, str], register_asset: bool = True
+    ) -> Union[str, InternalCodeAsset]:
+        if is_arm_id(code_asset):
+            return code_asset
+        _code_assets = self._operation_container.all_operations[OperationTypes.CODES]
+        if isinstance(code_asset, str):
+            return (await _code_assets.show(name=code_asset)).id
+        elif isinstance(code_asset, InternalCodeAsset):
+            if register_asset:
+                return (await _code_assets._get_or_create(code_asset._get_local_path())).id
+            path = code_asset._get_local_path()
+            ignore_file = get_ignore_file(path, use_gitignore=True)
+            # hashing is blocking, so it runs on the default executor
+            asset_hash = await asyncio.get_event_loop().run_in_executor(
+                None, partial(get_object_hash, path, ignore_file=ignore_file)
+            )
+            asset_path, datastore_id = await _upload_to_datastore(
+                self._workspace_scope,
+                self._datastore_operation,
+                path,
+                datastore_name=code_asset.datastore,
+                include_container_in_asset_path=False,
+                asset_hash=asset_hash,
+                ignore_file=ignore_file,
+            )
+            if not code_asset.name:
+                # named like the code CodeOperations registers; the asynchronous upload never uploads an archive
+                code_asset.name = _code_asset_name(asset_hash, path, False)
+            code_asset._update_asset(asset_path=asset_path, datastore_id=datastore_id)
+            return code_asset
+
+    async def get_environment_arm_id(
+        self, environment: Union[str, InternalEnvironment]
+    ) -> Union[str, InternalEnvironment]:
+        if is_arm_id(environment):
+            return environment
+        _environments = self._operation_container.all_operations[OperationTypes.ENVIRONMENTS]
+        if isinstance(environment, str):
+            name, version = parse_name_version(environment)
+            if version:
+                return (await _environments.get(environment_name=name, environment_version=version)).id
+            return await _environments.get_latest_version(environment)
+        elif isinstance(environment, InternalEnvironment):
+            return (await _environments._create_or_update(environment)).id
+
+    async def get_model_arm_id(self, model: Union[str, InternalModel]) -> Union[str, InternalModel]:
+        if is_arm_id(model):
+            return model
+        _model = self._operation_container.all_operations[OperationTypes.MODELS]
+        if isinstance(model, str):
+            name, version = parse_name_version(model)
+            return await _model.show(name=name, version=version)
+        elif isinstance(model, InternalModel):
+            asset_path, datastore_id = await self._upload_model(internal_model=model)
+            model._update_asset(asset_path=asset_path, datastore_id=datastore_id)
+            return model
+
+    async def resolve_all(self, resolvers: Dict[str, Callable[[], Awaitable[Any]]]) -> Dict[str, Any]:
+        """Runs independent dependency resolutions concurrently and returns their results by description
+
+        Like the synchronous resolve_all, every resolution runs to completion even when another one
+        fails. A single failure is re-raised as is; several failures are raised together as a
+        DependencyResolutionError.
+        """
+        names = list(resolvers)
+        outcomes = await asyncio.gather(*(resolvers[name]() for name in names), return_exceptions=True)
+        results, errors = {}, {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                errors[name] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[name] = outcome
+        if len(errors) == 1:
+            raise next(iter(errors.values()))
+        if errors:
+            raise DependencyResolutionError(errors) from next(iter(errors.values()))
+        return results
+
+    async def _upload_model(self, internal_model: InternalModel) -> Tuple[str, str]:
+        path = Path(internal_model.asset_path)
+        if not path.is_absolute():
+            path = Path(internal_model._base_path, path).resolve()  # combine base path to asset path
+        return await _upload_to_datastore(self._workspace_scope, self._datastore_operation, path)
@@ -0,0 +1,23 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+from typing import AsyncIterable
+
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._restclient.machinelearningservices.models import Workspace
+from azure.ml._workspace_dependent_operations import WorkspaceScope
+
+
+class WorkspaceOperations(object):
+    def __init__(self, workspace_scope: WorkspaceScope, service_client: AzureMachineLearningWorkspaces):
+        self._workspace_scope = workspace_scope
+        self._operation = service_client.workspaces
+
+    def list(self, scope: str = "resource_group") -> AsyncIterable[Workspace]:
+        if scope == "subscription":
+            return self._operation.list_by_subscription()
+        return self._operation.list_by_resource_group(self._workspace_scope.resource_group_name)
+
+    async def get(self, name: str) -> Workspace:
+        return await self._operation.get(self._workspace_scope.resource_group_name, name)
@@ -0,0 +1,148 @@
+# ---------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# ---------------------------------------------------------
+
+from typing import Any, Optional
+
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.identity.aio import (
+    AzureCliCredential,
+    ChainedTokenCredential,
+    ManagedIdentityCredential,
+    SharedTokenCacheCredential,
+    EnvironmentCredential,
+)
+
+from azure.ml.constants import MFE_BASE_URL, OperationTypes
+from azure.ml._restclient.machinelearningservices.aio import AzureMachineLearningWorkspaces
+from azure.ml._workspace_dependent_operations import WorkspaceScope, OperationsContainer
+from azure.ml._utils.utils import _get_developer_override
+from ._operations import (
+    ComputeOperations,
+    DatastoreOperations,
+    JobOperations,
+    WorkspaceOperations,
+    ModelOperations,
+    DataOperations,
+    CodeOperations,
+    EnvironmentOperations,
+    EndpointOperations,
+)
+
+
+class MLClient(object):
+    """Asynchronous counterpart of azure.ml.MLClient
+
+    All service calls of its operations are coroutines running on the caller's event loop, so many
+    calls can be in flight at once without a thread per call. Use the client as an async context
+    manager, or await close() when done with it, to close its connections.
+
+    :param credential: An async credential from azure.identity.aio. Defaults to a chain of managed
+        identity, Azure CLI, environment and shared token cache credentials.
+    """
+
+    def __init__(
+        self,
+        subscription_id: str,
+        resource_group_name: str,
+        default_workspace_name: str = None,
+        base_url: str = MFE_BASE_URL,
+        credential: AsyncTokenCredential = None,
+    ):
+        base_url, enforce_https = _get_developer_override(base_url)
+        kwargs = {"enforce_https": enforce_https}
+
+        self._workspace_scope = WorkspaceScope(subscription_id, resource_group_name, default_workspace_name)
+
+        # the client closes the default credential, but not one passed in by the caller
+        self._owns_credential = credential is None
+        self._credential = credential or self._default_chained_credentials()
+
+        self._service_client = AzureMachineLearningWorkspaces(
+            subscription_id=self._workspace_scope._subscription_id, credential=self._credential, base_url=base_url
+        )
+
+        # operation groups are built on first use, so a script only pays for the ones it uses
+        self._operation_container = OperationsContainer()
+        container = self._operation_container
+        scope, service_client = self._workspace_scope, self._service_client
+        container.add_lazy(OperationTypes.WORKSPACES, lambda: WorkspaceOperations(scope, service_client))
+        container.add_lazy(OperationTypes.COMPUTES, lambda: ComputeOperations(scope, service_client))
+        container.add_lazy(OperationTypes.DATASTORES, lambda: DatastoreOperations(scope, service_client, **kwargs))
+        container.add_lazy(OperationTypes.MODELS, lambda: ModelOperations(scope, service_client, self.datastores))
+        container.add_lazy(
+            OperationTypes.ENDPOINTS, lambda: EndpointOperations(scope, service_client, container, **kwargs)
+        )
+        container.add_lazy(
+            OperationTypes.DATASETS, lambda: DataOperations(scope, service_client, self.datastores, **kwargs)
+        )
+        container.add_lazy(
+            OperationTypes.CODES, lambda: CodeOperations(scope, service_client, self.datastores, **kwargs)
+        )
+        container.add_lazy(OperationTypes.JOBS, lambda: JobOperations(scope, service_client, container, **kwargs))
+        container.add_lazy(OperationTypes.ENVIRONMENTS, lambda: EnvironmentOperations(scope, service_client, **kwargs))
+
+    async def __aenter__(self) -> "MLClient":
+        await self._service_client.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self._service_client.close()
+        if self._owns_credential:
+            await self._credential.close()
+
+    @property
+    def workspaces(self) -> WorkspaceOperations:
+        return self._operation_container.all_operations[OperationTypes.WORKSPACES]
+
+    @property
+    def jobs(self) -> JobOperations:
+        return self._operation_container.all_operations[OperationTypes.JOBS]
+
+    @property
+    def computes(self) -> ComputeOperations:
+        return self._operation_container.all_operations[OperationTypes.COMPUTES]
+
+    @property
+    def model(self) -> ModelOperations:
+        return self._operation_container.all_operations[OperationTypes.MODELS]
+
+    @property
+    def data(self) -> DataOperations:
+        return self._operation_container.all_operations[OperationTypes.DATASETS]
+
+    @property
+    def endpoints(self) -> EndpointOperations:
+        return self._operation_container.all_operations[OperationTypes.ENDPOINTS]
+
+    @property
+    def code(self) -> CodeOperations:
+        return self._operation_container.all_operations[OperationTypes.CODES]
+
+    @property
+    def default_workspace_name(self) -> Optional[str]:
+        return self._workspace_scope.workspace_name
+
+    @property
+    def datastores(self) -> DatastoreOperations:
+        return self._operation_container.all_operations[OperationTypes.DATASTORES]
+
+    @property
+    def environments(self) -> EnvironmentOperations:
+        return self._operation_container.all_operations[OperationTypes.ENVIRONMENTS]
+
+    @default_workspace_name.setter
+    def default_workspace_name(self, value: str) -> None:
+        self._workspace_scope.workspace_name = value
+
+    def _default_chained_credentials(self) -> ChainedTokenCredential:
+        # there is no asynchronous interactive browser credential
+        managed_identity = ManagedIdentityCredential()
+        azure_cli = AzureCliCredential()
+        environment = EnvironmentCredential()
+        shared_token_cache = SharedTokenCacheCredential()
+
+        return ChainedTokenCredential(managed_identity, azure_cli, environment, shared_token_cache)
@@ -19,6 +19,18 @@ RESOURCE_ID_FORMAT = "/subscriptions/{}/resourceGroups/{}/providers/" "{}/worksp
 PYTHON = "python"
 AMLTOKEN = "AMLToken"
 KEY = "KEY"
+DATASTORE_CACHE_TTL_SECONDS = 300
+DATASTORE_CACHE_TTL_ENV_VAR = "AZUREML_DATASTORE_CACHE_TTL_SECONDS"
+DEPENDENCY_RESOLUTION_MAX_WORKERS = 4
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_CONNECTIONS_ENV_VAR = "AZUREML_HTTP_POOL_CONNECTIONS"
+HTTP_POOL_MAXSIZE = 64
+HTTP_POOL_MAXSIZE_ENV_VAR = "AZUREML_HTTP_POOL_MAXSIZE"
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+CREDENTIAL_ORDER_ENV_VAR = "AZUREML_CREDENTIAL_ORDER"
+CREDENTIAL_HINT_PATH_ENV_VAR = "AZUREML_CREDENTIAL_HINT_PATH"
+CREDENTIAL_HINT_DISABLE_ENV_VAR = "AZUREML_DISABLE_CREDENTIAL_HINT"
+CREDENTIAL_HINT_FILE_NAME = "credential_hint"
 
 
 class ComputeType(object):
@@ -2,34 +2,27 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # ---------------------------------------------------------
 
-from typing import Optional
-
-from azure.identity import (
-    AzureCliCredential,
-    ChainedTokenCredential,
-    ManagedIdentityCredential,
-    SharedTokenCacheCredential,
-    EnvironmentCredential,
-    InteractiveBrowserCredential,
-)
+from typing import TYPE_CHECKING, Optional
 
 from azure.ml.constants import MFE_BASE_URL, OperationTypes
-from azure.ml._operations import (
-    ComputeOperations,
-    DatastoreOperations,
-    JobOperations,
-    WorkspaceOperations,
-    ModelOperations,
-    DataOperations,
-    CodeOperations,
-    EnvironmentOperations,
-)
-from azure.ml._restclient.machinelearningservices._azure_machine_learning_workspaces import (
-    AzureMachineLearningWorkspaces,
-)
 from azure.ml._workspace_dependent_operations import WorkspaceScope, OperationsContainer
-from azure.ml._utils.utils import _get_developer_override
-from azure.ml._operations import EndpointOperations
+from azure.ml import _operations
+
+# `import azure.ml` only loads this module: the REST client, azure.identity and the operation groups,
+# with their schemas and storage and ARM clients, are imported when a client or operation group is created
+if TYPE_CHECKING:
+    from azure.identity import ChainedTokenCredential
+    from azure.ml._operations import (
+        ComputeOperations,
+        DatastoreOperations,
+        JobOperations,
+        WorkspaceOperations,
+        ModelOperations,
+        DataOperations,
+        CodeOperations,
+        EnvironmentOperations,
+        EndpointOperations,
+    )
 
 
 class MLClient(object):
@@ -39,94 +32,107 @@ class MLClient(object):
         resource_group_name: str,
         default_workspace_name: str = None,
         base_url: str = MFE_BASE_URL,
-        credential: ChainedTokenCredential = None,
+        credential: "ChainedTokenCredential" = None,
     ):
+        from azure.ml._restclient.machinelearningservices._azure_machine_learning_workspaces import (
+            AzureMachineLearningWorkspaces,
+        )
+        from azure.ml._utils.utils import _get_developer_override
+        from azure.ml._utils._http_utils import CachedTokenCredential, get_shared_transport
+
         base_url, enforce_https = _get_developer_override(base_url)
         kwargs = {"enforce_https": enforce_https}
 
         self._workspace_scope = WorkspaceScope(subscription_id, resource_group_name, default_workspace_name)
 
-        if credential:
-            self._credential = credential
-        else:
-            self._credential = self._default_chained_credentials()
+        # all clients created below share one token cache and one connection pool
+        self._credential = CachedTokenCredential(credential or self._default_chained_credentials())
 
         self._service_client = AzureMachineLearningWorkspaces(
-            subscription_id=self._workspace_scope._subscription_id, credential=self._credential, base_url=base_url
+            subscription_id=self._workspace_scope._subscription_id,
+            credential=self._credential,
+            base_url=base_url,
+            transport=get_shared_transport(),
         )
 
+        # operation groups are built on first use, so a script only pays for the ones it uses
         self._operation_container = OperationsContainer()
-        self._datastores = DatastoreOperations(self._workspace_scope, self._service_client, **kwargs)
-        self._workspaces = WorkspaceOperations(self._workspace_scope, self._service_client)
-        self._computes = ComputeOperations(self._workspace_scope, self._service_client)
-        self._model = ModelOperations(self._workspace_scope, self._service_client, self._datastores)
-        self._endpoints = EndpointOperations(
-            self._workspace_scope, self._service_client, self._operation_container, self._credential, **kwargs
+        container = self._operation_container
+        scope, service_client = self._workspace_scope, self._service_client
+        container.add_lazy(OperationTypes.WORKSPACES, lambda: _operations.WorkspaceOperations(scope, service_client))
+        container.add_lazy(OperationTypes.COMPUTES, lambda: _operations.ComputeOperations(scope, service_client))
+        container.add_lazy(
+            OperationTypes.DATASTORES, lambda: _operations.DatastoreOperations(scope, service_client, **kwargs)
+        )
+        container.add_lazy(
+            OperationTypes.MODELS, lambda: _operations.ModelOperations(scope, service_client, self.datastores)
+        )
+        container.add_lazy(
+            OperationTypes.ENDPOINTS,
+            lambda: _operations.EndpointOperations(scope, service_client, container, self._credential, **kwargs),
+        )
+        container.add_lazy(
+            OperationTypes.DATASETS,
+            lambda: _operations.DataOperations(scope, service_client, self.datastores, **kwargs),
+        )
+        container.add_lazy(
+            OperationTypes.CODES,
+            lambda: _operations.CodeOperations(scope, service_client, self.datastores, **kwargs),
+        )
+        container.add_lazy(
+            OperationTypes.JOBS, lambda: _operations.JobOperations(scope, service_client, container, **kwargs)
+        )
+        container.add_lazy(
+            OperationTypes.ENVIRONMENTS, lambda: _operations.EnvironmentOperations(scope, service_client, **kwargs)
         )
-        self._data = DataOperations(self._workspace_scope, self._service_client, self._datastores, **kwargs)
-        self._code = CodeOperations(self._workspace_scope, self._service_client, self._datastores, **kwargs)
-        self._environments = EnvironmentOperations(self._workspace_scope, self._service_client, **kwargs)
-        self._jobs = JobOperations(self._workspace_scope, self._service_client, self._operation_container, **kwargs)
-
-        self._operation_container.add(OperationTypes.WORKSPACES, self._workspaces)
-        self._operation_container.add(OperationTypes.COMPUTES, self._computes)
-        self._operation_container.add(OperationTypes.DATASTORES, self._datastores)
-        self._operation_container.add(OperationTypes.MODELS, self._model)
-        self._operation_container.add(OperationTypes.ENDPOINTS, self._endpoints)
-        self._operation_container.add(OperationTypes.DATASETS, self._data)
-        self._operation_container.add(OperationTypes.CODES, self._code)
-        self._operation_container.add(OperationTypes.JOBS, self._jobs)
-        self._operation_container.add(OperationTypes.ENVIRONMENTS, self._environments)
 
     @property
-    def workspaces(self) -> WorkspaceOperations:
-        return self._workspaces
+    def workspaces(self) -> "WorkspaceOperations":
+        return self._operation_container.all_operations[OperationTypes.WORKSPACES]
 
     @property
-    def jobs(self) -> JobOperations:
-        return self._jobs
+    def jobs(self) -> "JobOperations":
+        return self._operation_container.all_operations[OperationTypes.JOBS]
 
     @property
-    def computes(self) -> ComputeOperations:
-        return self._computes
+    def computes(self) -> "ComputeOperations":
+        return self._operation_container.all_operations[OperationTypes.COMPUTES]
 
     @property
-    def model(self) -> ModelOperations:
-        return self._model
+    def model(self) -> "ModelOperations":
+        return self._operation_container.all_operations[OperationTypes.MODELS]
 
     @property
-    def data(self) -> DataOperations:
-        return self._data
+    def data(self) -> "DataOperations":
+        return self._operation_container.all_operations[OperationTypes.DATASETS]
 
     @property
-    def endpoints(self) -> EndpointOperations:
-        return self._endpoints
+    def endpoints(self) -> "EndpointOperations":
+        return self._operation_container.all_operations[OperationTypes.ENDPOINTS]
 
     @property
-    def code(self) -> CodeOperations:
-        return self._code
+    def code(self) -> "CodeOperations":
+        return self._operation_container.all_operations[OperationTypes.CODES]
 
     @property
     def default_workspace_name(self) -> Optional[str]:
         return self._workspace_scope.workspace_name
 
     @property
-    def datastores(self) -> DatastoreOperations:
-        return self._datastores
+    def datastores(self) -> "DatastoreOperations":
+        return self._operation_container.all_operations[OperationTypes.DATASTORES]
 
     @property
-    def environments(self) -> EnvironmentOperations:
-        return self._environments
+    def environments(self) -> "EnvironmentOperations":
+        return self._operation_container.all_operations[OperationTypes.ENVIRONMENTS]
 
     @default_workspace_name.setter
     def default_workspace_name(self, value: str) -> None:
         self._workspace_scope.workspace_name = value
 
-    def _default_chained_credentials(self) -> ChainedTokenCredential:
-        managed_identity = ManagedIdentityCredential()
-        azure_cli = AzureCliCredential()
-        environment = EnvironmentCredential()
-        shared_token_cache = SharedTokenCacheCredential()
-        interactive_browser = InteractiveBrowserCredential()
+    def _default_chained_credentials(self) -> "ChainedTokenCredential":
+        from azure.ml._utils._credential_utils import create_default_credential
 
-        return ChainedTokenCredential(managed_identity, azure_cli, environment, shared_token_cache, interactive_browser)
+        # managed identity, Azure CLI, environment, shared token cache and interactive browser by default,
+        # starting with the credential that succeeded last time (see AZUREML_CREDENTIAL_ORDER)
+        return create_default_credential()
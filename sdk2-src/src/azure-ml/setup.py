@@ -71,4 +71,8 @@ setup(
         "pydash<=4.9.0",
         "azure-storage-file-share==12.*",
     ],
+    extras_require={
+        # azure.ml.aio and asynchronous artifact upload (azure.storage.blob.aio) need an async transport
+        "aio": ["aiohttp>=3.0"],
+    },
 )
@@ -8,7 +8,7 @@ from azure.ml import MLClient
 def test_environment_create_or_update_conda(client: MLClient) -> None:
     environment_name = _get_random_string()
     environment_version = 1
-    environment = client._environments.create_or_update(
+    environment = client.environments.create_or_update(
         environment_name=environment_name,
         environment_version=environment_version,
         file="./tests/test_configs/environment/environment_conda.yml",
@@ -25,7 +25,7 @@ def test_environment_create_or_update_conda(client: MLClient) -> None:
 def test_environment_create_or_update_conda_no_name(client: MLClient) -> None:
     environment_name = _get_random_string()
     environment_version = 1
-    environment = client._environments.create_or_update(
+    environment = client.environments.create_or_update(
         environment_name=environment_name,
         environment_version=environment_version,
         file="./tests/test_configs/environment/environment_conda_no_name.yml",
@@ -42,7 +42,7 @@ def test_environment_create_or_update_conda_no_name(client: MLClient) -> None:
 
 def test_environment_create_or_update_conda_no_name_exception(client: MLClient) -> None:
     with pytest.raises(NameError):
-        client._environments.create_or_update(
+        client.environments.create_or_update(
             environment_name=None,
             environment_version=1,
             file="./tests/test_configs/environment/environment_conda_no_name.yml",
@@ -53,7 +53,7 @@ def test_environment_create_or_update_conda_no_name_exception(client: MLClient)
 def test_environment_create_or_update_docker(client: MLClient) -> None:
     environment_name = _get_random_string()
     environment_version = 1
-    environment = client._environments.create_or_update(
+    environment = client.environments.create_or_update(
         environment_name=environment_name,
         environment_version=environment_version,
         file="./tests/test_configs/environment/environment_docker.yml",
@@ -73,7 +73,7 @@ def test_environment_create_or_update_docker_exception(client: MLClient) -> None
     environment_name = _get_random_string()
     environment_version = 1
     with pytest.raises(HttpResponseError) as error:
-        client._environments.create_or_update(
+        client.environments.create_or_update(
             environment_name=environment_name,
             environment_version=environment_version,
             file="./tests/test_configs/environment/environment_docker_bad_image.yml",
@@ -87,7 +87,7 @@ def test_environment_create_or_update_docker_exception(client: MLClient) -> None
 def test_environment_create_or_update_docker_file(client: MLClient) -> None:
     environment_name = _get_random_string()
     environment_version = 1
-    environment = client._environments.create_or_update(
+    environment = client.environments.create_or_update(
         environment_name=environment_name,
         environment_version=environment_version,
         file="./tests/test_configs/environment/environment_docker_file.yml",
@@ -104,7 +104,7 @@ def test_environment_create_or_update_docker_file(client: MLClient) -> None:
 
 @pytest.mark.e2etest
 def test_environment_list(client: MLClient) -> None:
-    environment_list = client._environments.list()
+    environment_list = client.environments.list()
     assert environment_list
 
 
@@ -115,7 +115,7 @@ def test_environment_get(client: MLClient) -> None:
     environment_id = _get_environment_arm_id(
         client=client, environment_name=environment_name, environment_version=environment_version
     )
-    environment = client._environments.get(environment_name=environment_name, environment_version=environment_version)
+    environment = client.environments.get(environment_name=environment_name, environment_version=environment_version)
 
     assert environment
     assert environment.id == environment_id
@@ -124,7 +124,7 @@ def test_environment_get(client: MLClient) -> None:
 @pytest.mark.e2etest
 def test_environment_get_latest(client: MLClient) -> None:
     environment_name = "AzureML-Minimal"
-    environment = client._environments.get_latest_version(environment_name=environment_name)
+    environment = client.environments.get_latest_version(environment_name=environment_name)
 
     assert environment
     environment_id = _get_environment_arm_id(
@@ -0,0 +1,94 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+_results = []  # type: List[Dict[str, object]]
+_startup_results = []  # type: List[Dict[str, object]]
+
+
+class BenchmarkRecorder(object):
+    """Times a workload and records its files/sec and MB/sec for the end of session report
+
+    Timings are only reported, never asserted on, as they vary too much between runners. With
+    `ideal_seconds`, the share of that ideal time the workload reached is reported as its efficiency.
+    """
+
+    @contextmanager
+    def measure(
+        self, name: str, file_count: int, total_bytes: int, ideal_seconds: Optional[float] = None
+    ) -> Iterator[Dict[str, object]]:
+        result = {"name": name, "files": file_count, "bytes": total_bytes}
+        start = time.perf_counter()
+        yield result
+        seconds = max(time.perf_counter() - start, 1e-9)
+        result.update(
+            seconds=seconds,
+            files_per_second=file_count / seconds,
+            megabytes_per_second=total_bytes / 2 ** 20 / seconds,
+            efficiency=ideal_seconds / seconds if ideal_seconds else None,
+        )
+        _results.append(result)
+
+
+class StartupRecorder(object):
+    """Times a workload repeated `iterations` times and records its milliseconds per iteration"""
+
+    @contextmanager
+    def measure(self, name: str, iterations: int) -> Iterator[Dict[str, object]]:
+        result = {"name": name, "iterations": iterations}
+        start = time.perf_counter()
+        yield result
+        self.record(result, time.perf_counter() - start)
+
+    def record(self, result: Dict[str, object], seconds: float) -> None:
+        """Records a workload timed elsewhere, e.g. in a child process"""
+        result.update(seconds=seconds, milliseconds_per_iteration=seconds * 1000 / result["iterations"])
+        _startup_results.append(result)
+
+
+def pytest_addoption(parser) -> None:  # type: ignore
+    parser.addoption(
+        "--storage-benchmark-json",
+        action="store",
+        default=None,
+        help="Write the storage benchmark results to this file.",
+    )
+
+
+@pytest.fixture
+def storage_benchmark() -> BenchmarkRecorder:
+    return BenchmarkRecorder()
+
+
+@pytest.fixture
+def startup_benchmark() -> StartupRecorder:
+    return StartupRecorder()
+
+
+def pytest_terminal_summary(terminalreporter, config) -> None:  # type: ignore
+    if _startup_results:
+        terminalreporter.section("client startup benchmarks")
+        terminalreporter.write_line(f"{'workload':<50} {'iterations':>10} {'ms/iteration':>13}")
+        for result in _startup_results:
+            terminalreporter.write_line(
+                f"{result['name']:<50} {result['iterations']:>10} {result['milliseconds_per_iteration']:>13.3f}"
+            )
+    if not _results:
+        return
+    terminalreporter.section("storage benchmarks")
+    terminalreporter.write_line(
+        f"{'workload':<40} {'files':>7} {'MB':>9} {'seconds':>9} {'files/s':>10} {'MB/s':>9} {'efficiency':>10}"
+    )
+    for result in _results:
+        efficiency = f"{result['efficiency']:>10.2f}" if result["efficiency"] is not None else f"{'-':>10}"
+        terminalreporter.write_line(
+            f"{result['name']:<40} {result['files']:>7} {result['bytes'] / 2 ** 20:>9.1f} {result['seconds']:>9.3f} "
+            f"{result['files_per_second']:>10.1f} {result['megabytes_per_second']:>9.1f} {efficiency}"
+        )
+    json_path = config.getoption("--storage-benchmark-json")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(_results, f, indent=2)
@@ -0,0 +1,326 @@
+"""
+In-process stand-ins for the blob and file share clients used by the artifact storage helpers.
+
+Content is kept in memory. Every request goes through a NetworkProfile, which adds a fixed latency
+and moves the request's bytes through a shared link of limited bandwidth, so the helpers can be
+benchmarked without a storage account.
+"""
+import posixpath
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+
+class NetworkProfile(object):
+    """Simulated network between the client and the storage account
+
+    :param latency: Seconds every request waits for its response.
+    :param bytes_per_second: Bandwidth of the link shared by all requests. None is unlimited.
+    """
+
+    def __init__(self, latency: float = 0.0, bytes_per_second: Optional[int] = None):
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.request_count = 0
+        self.bytes_transferred = 0
+        self._link_free_at = 0.0
+        self._lock = threading.Lock()
+
+    def request(self, nbytes: int = 0, raw_response_hook: Optional[Callable] = None, status_code: int = 200) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.bytes_transferred += nbytes
+            done_at = time.monotonic() + self.latency
+            if self.bytes_per_second and nbytes:
+                # the bytes queue behind the ones already on the link
+                self._link_free_at = max(self._link_free_at, time.monotonic()) + nbytes / self.bytes_per_second
+                done_at = max(done_at, self._link_free_at)
+        delay = done_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if raw_response_hook is not None:
+            raw_response_hook(_PipelineResponse(status_code))
+
+
+class _HttpResponse(object):
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}  # type: Dict[str, str]
+
+
+class _PipelineResponse(object):
+    def __init__(self, status_code: int):
+        self.http_response = _HttpResponse(status_code)
+
+
+class _Properties(dict):
+    """Dict that also allows attribute access, like the property models of the storage SDKs"""
+
+    def __getattr__(self, name: str) -> object:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        self[name] = value
+
+
+class _Downloader(object):
+    def __init__(self, content: bytes, network: NetworkProfile, raw_response_hook: Optional[Callable]):
+        self._content = content
+        self._network = network
+        self._raw_response_hook = raw_response_hook
+
+    def readinto(self, stream) -> int:
+        self._network.request(len(self._content), self._raw_response_hook)
+        stream.write(self._content)
+        return len(self._content)
+
+
+def _read_all(data: Union[bytes, str, Iterable[bytes]]) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode()
+    if hasattr(data, "read"):
+        return data.read()
+    return b"".join(data)
+
+
+class BlobServiceStandIn(object):
+    """Stand-in for BlobServiceClient"""
+
+    def __init__(self, network: NetworkProfile, account_url: str = "https://benchmark.blob.core.windows.net"):
+        self.url = account_url
+        self.network = network
+        self._containers = {}  # type: Dict[str, ContainerStandIn]
+        self._lock = threading.Lock()
+
+    def get_container_client(self, container: str) -> "ContainerStandIn":
+        with self._lock:
+            if container not in self._containers:
+                self._containers[container] = ContainerStandIn(self, container)
+            return self._containers[container]
+
+
+class ContainerStandIn(object):
+    """Stand-in for ContainerClient"""
+
+    def __init__(self, service: BlobServiceStandIn, name: str):
+        self.url = f"{service.url}/{name}"
+        self.network = service.network
+        self.blobs = {}  # type: Dict[str, _Properties]
+        self.uncommitted_blocks = {}  # type: Dict[str, Dict[str, bytes]]
+        self.lock = threading.Lock()
+
+    def put(self, name: str, content: bytes, metadata: Optional[Dict[str, str]] = None) -> None:
+        """Stores a blob without going through the network, to seed a benchmark"""
+        with self.lock:
+            self.blobs[name] = _Properties(name=name, content=content, size=len(content), metadata=metadata or {})
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, metadata: Optional[Dict[str, str]] = None,
+                    raw_response_hook: Optional[Callable] = None, **kwargs) -> Dict:
+        content = _read_all(data)
+        self.network.request(len(content), raw_response_hook, 201)
+        if not overwrite and name in self.blobs:
+            raise ResourceExistsError("The specified blob already exists.")
+        self.put(name, content, metadata)
+        return {}
+
+    def get_blob_client(self, blob: str) -> "BlobClientStandIn":
+        return BlobClientStandIn(self, blob)
+
+    def list_blobs(self, name_starts_with: Optional[str] = None, **kwargs) -> List[_Properties]:
+        self.network.request()
+        with self.lock:
+            return [blob for name, blob in sorted(self.blobs.items()) if name.startswith(name_starts_with or "")]
+
+    def download_blob(self, blob, raw_response_hook: Optional[Callable] = None, **kwargs) -> _Downloader:
+        return self.get_blob_client(getattr(blob, "name", blob)).download_blob(raw_response_hook=raw_response_hook)
+
+
+class BlobClientStandIn(object):
+    """Stand-in for BlobClient"""
+
+    def __init__(self, container: ContainerStandIn, name: str):
+        self.url = f"{container.url}/{name}"
+        self.container = container
+        self.name = name
+        self.network = container.network
+
+    def _get(self) -> _Properties:
+        try:
+            return self.container.blobs[self.name]
+        except KeyError:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+
+    def get_blob_properties(self, **kwargs) -> _Properties:
+        self.network.request()
+        blob = self._get()
+        return _Properties(name=self.name, size=blob.size, metadata=dict(blob.metadata),
+                           copy=_Properties(status="success"))
+
+    def set_blob_metadata(self, metadata: Dict[str, str], **kwargs) -> None:
+        self.network.request()
+        self._get().metadata = dict(metadata)
+
+    def download_blob(self, raw_response_hook: Optional[Callable] = None, **kwargs) -> _Downloader:
+        self.network.request()
+        return _Downloader(self._get().content, self.network, raw_response_hook)
+
+    def stage_block(self, block_id: str, data: bytes, raw_response_hook: Optional[Callable] = None, **kwargs) -> None:
+        self.network.request(len(data), raw_response_hook, 201)
+        with self.container.lock:
+            self.container.uncommitted_blocks.setdefault(self.name, {})[block_id] = data
+
+    def get_block_list(self, block_list_type: str = "committed", **kwargs) -> Tuple[List, List]:
+        self.network.request()
+        with self.container.lock:
+            if self.name not in self.container.blobs and self.name not in self.container.uncommitted_blocks:
+                raise ResourceNotFoundError("The specified blob does not exist.")
+            block_ids = list(self.container.uncommitted_blocks.get(self.name, {}))
+        return [], [_Properties(id=block_id) for block_id in block_ids]
+
+    def commit_block_list(self, block_list: List, raw_response_hook: Optional[Callable] = None, **kwargs) -> None:
+        self.network.request(0, raw_response_hook, 201)
+        with self.container.lock:
+            blocks = self.container.uncommitted_blocks.pop(self.name, {})
+        self.container.put(self.name, b"".join(blocks[block.id] for block in block_list))
+
+    def start_copy_from_url(self, source_url: str, metadata: Optional[Dict[str, str]] = None, **kwargs) -> Dict:
+        self.network.request()
+        source = BlobClientStandIn(self.container, source_url[len(self.container.url) + 1:])._get()
+        self.container.put(self.name, source.content, metadata)
+        return {"copy_status": "success"}
+
+
+class ShareStandIn(object):
+    """Content of a file share, shared by the directory and file stand-ins"""
+
+    def __init__(self, network: NetworkProfile, url: str = "https://benchmark.file.core.windows.net/share"):
+        self.url = url
+        self.network = network
+        self.directories = {"": {}}  # type: Dict[str, Dict[str, str]]
+        self.files = {}  # type: Dict[str, _Properties]
+        self.lock = threading.Lock()
+
+    def put(self, path: str, content: bytes) -> None:
+        """Stores a file and its parent directories without going through the network, to seed a benchmark"""
+        with self.lock:
+            parent = posixpath.dirname(path)
+            while parent not in self.directories:
+                self.directories[parent] = {}
+                parent = posixpath.dirname(parent)
+            self.files[path] = _Properties(content=content, metadata={})
+
+
+class ShareDirectoryStandIn(object):
+    """Stand-in for ShareDirectoryClient"""
+
+    def __init__(self, share: ShareStandIn, directory_path: str = ""):
+        self.share = share
+        self.directory_path = directory_path.strip("/")
+        self.url = f"{share.url}/{self.directory_path}"
+        self.network = share.network
+
+    def _child(self, name: str) -> str:
+        return posixpath.join(self.directory_path, name.strip("/")) if self.directory_path else name.strip("/")
+
+    def create_directory(self, **kwargs) -> None:
+        self.network.request(0, None, 201)
+        with self.share.lock:
+            if self.directory_path in self.share.directories:
+                raise ResourceExistsError("The specified resource already exists.")
+            if posixpath.dirname(self.directory_path) not in self.share.directories:
+                raise ResourceNotFoundError("The specified parent path does not exist.")
+            self.share.directories[self.directory_path] = {}
+
+    def get_subdirectory_client(self, directory_name: str) -> "ShareDirectoryStandIn":
+        return ShareDirectoryStandIn(self.share, self._child(directory_name))
+
+    def get_file_client(self, file_name: str) -> "ShareFileStandIn":
+        return ShareFileStandIn(self.share, self._child(file_name))
+
+    def upload_file(self, file_name: str, data, raw_response_hook: Optional[Callable] = None,
+                    **kwargs) -> "ShareFileStandIn":
+        file_client = self.get_file_client(file_name)
+        file_client.upload_file(data, raw_response_hook=raw_response_hook)
+        return file_client
+
+    def list_directories_and_files(self, name_starts_with: str = "", **kwargs) -> List[Dict]:
+        self.network.request()
+        with self.share.lock:
+            if self.directory_path not in self.share.directories:
+                raise ResourceNotFoundError("The specified resource does not exist.")
+            children = [(path, True) for path in self.share.directories if path]
+            children += [(path, False) for path in self.share.files]
+        return [
+            {"name": posixpath.basename(path), "is_directory": is_directory}
+            for path, is_directory in sorted(children)
+            if posixpath.dirname(path) == self.directory_path and posixpath.basename(path).startswith(name_starts_with)
+        ]
+
+    def get_directory_properties(self, **kwargs) -> _Properties:
+        self.network.request()
+        try:
+            return _Properties(metadata=dict(self.share.directories[self.directory_path]))
+        except KeyError:
+            raise ResourceNotFoundError("The specified resource does not exist.")
+
+    def set_directory_metadata(self, metadata: Dict[str, str], **kwargs) -> None:
+        self.network.request()
+        self.share.directories[self.directory_path] = dict(metadata)
+
+    def delete_file(self, file_name: str, **kwargs) -> None:
+        self.get_file_client(file_name).delete_file()
+
+    def delete_directory(self, **kwargs) -> None:
+        self.network.request()
+        with self.share.lock:
+            self.share.directories.pop(self.directory_path, None)
+
+
+class ShareFileStandIn(object):
+    """Stand-in for ShareFileClient"""
+
+    def __init__(self, share: ShareStandIn, file_path: str):
+        self.share = share
+        self.path = file_path
+        self.url = f"{share.url}/{file_path}"
+        self.network = share.network
+
+    def _get(self) -> _Properties:
+        try:
+            return self.share.files[self.path]
+        except KeyError:
+            raise ResourceNotFoundError("The specified resource does not exist.")
+
+    def upload_file(self, data, length: Optional[int] = None, raw_response_hook: Optional[Callable] = None,
+                    **kwargs) -> Dict:
+        content = _read_all(data)
+        self.network.request(len(content), raw_response_hook, 201)
+        if posixpath.dirname(self.path) not in self.share.directories:
+            raise ResourceNotFoundError("The specified parent path does not exist.")
+        with self.share.lock:
+            self.share.files[self.path] = _Properties(content=content, metadata={})
+        return {}
+
+    def download_file(self, raw_response_hook: Optional[Callable] = None, **kwargs) -> _Downloader:
+        self.network.request()
+        return _Downloader(self._get().content, self.network, raw_response_hook)
+
+    def get_file_properties(self, **kwargs) -> _Properties:
+        self.network.request()
+        return _Properties(metadata=dict(self._get().metadata), size=len(self._get().content))
+
+    def set_file_metadata(self, metadata: Dict[str, str], **kwargs) -> None:
+        self.network.request()
+        self._get().metadata = dict(metadata)
+
+    def delete_file(self, **kwargs) -> None:
+        self.network.request()
+        with self.share.lock:
+            self.share.files.pop(self.path, None)
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import Mock
+
+from azure.identity import DefaultAzureCredential
+from azure.ml import MLClient
+from constants import Test_Subscription, Test_Resource_Group, Test_Workspace_Name, Test_Base_Url
+
+pytestmark = pytest.mark.perftest
+
+ITERATIONS = 200
+OPERATION_GROUPS = [
+    "workspaces",
+    "computes",
+    "datastores",
+    "model",
+    "endpoints",
+    "data",
+    "code",
+    "jobs",
+    "environments",
+]
+
+
+def _create_client() -> MLClient:
+    return MLClient(
+        subscription_id=Test_Subscription,
+        resource_group_name=Test_Resource_Group,
+        default_workspace_name=Test_Workspace_Name,
+        base_url=Test_Base_Url,
+        credential=Mock(spec_set=DefaultAzureCredential),
+    )
+
+
+def _built_operation_groups(client: MLClient) -> int:
+    # the container only holds the operation groups that were built
+    return len(dict(client._operation_container.all_operations))
+
+
+class TestClientStartupBenchmarks:
+    def test_client_with_one_operation_group(self, startup_benchmark) -> None:  # type: ignore
+        with startup_benchmark.measure("MLClient() and jobs", ITERATIONS):
+            for _ in range(ITERATIONS):
+                client = _create_client()
+                client.jobs
+
+        assert _built_operation_groups(client) == 1
+
+    def test_client_with_every_operation_group(self, startup_benchmark) -> None:  # type: ignore
+        # the work MLClient() did before operation groups were built on first use
+        with startup_benchmark.measure("MLClient() and every operation group", ITERATIONS):
+            for _ in range(ITERATIONS):
+                client = _create_client()
+                for group in OPERATION_GROUPS:
+                    getattr(client, group)
+
+        assert _built_operation_groups(client) == len(OPERATION_GROUPS)
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from typing import List, Tuple
+
+import pytest
+
+pytestmark = pytest.mark.perftest
+
+RUNS = 5
+# loaded on first use of the client, never by `import azure.ml`
+DEFERRED_MODULES = [
+    "azure.identity",
+    "azure.storage",
+    "azure.ml._restclient",
+    "azure.ml._vendor",
+    "azure.ml._schema",
+    "azure.ml._arm_deployments",
+    "marshmallow",
+    "requests",
+    "pydash",
+    "tqdm",
+    "yaml",
+]
+_IMPORT_SCRIPT = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import azure.ml\n"
+    "print(time.perf_counter() - start)\n"
+    "print(' '.join(sys.modules))\n"
+)
+
+
+def _import_in_fresh_process() -> Tuple[float, List[str]]:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT], check=True, stdout=subprocess.PIPE, universal_newlines=True
+    ).stdout.splitlines()
+    return float(output[0]), output[1].split()
+
+
+class TestImportBenchmarks:
+    def test_import_time(self, startup_benchmark) -> None:  # type: ignore
+        # the fastest run is the least disturbed by the rest of the machine; the time is only reported,
+        # as it varies too much between runners, and test_import_defers_heavy_modules guards against regressions
+        seconds = min(_import_in_fresh_process()[0] for _ in range(RUNS))
+        startup_benchmark.record({"name": "import azure.ml", "iterations": 1}, seconds)
+
+    def test_import_defers_heavy_modules(self) -> None:
+        _, modules = _import_in_fresh_process()
+        loaded = [
+            module for module in DEFERRED_MODULES if any(m == module or m.startswith(module + ".") for m in modules)
+        ]
+
+        assert not loaded
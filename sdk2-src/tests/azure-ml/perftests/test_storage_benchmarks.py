@@ -0,0 +1,257 @@
+import os
+import time
+import pytest
+from pathlib import Path
+from typing import List
+
+from azure.ml._artifacts import _fileshare_storage_helper
+from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
+from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient
+from azure.ml._artifacts.constants import (
+    AZ_ML_ARTIFACT_DIRECTORY,
+    HASH_INDEX_DISABLE_ENV_VAR,
+    HASH_INDEX_MAX_ENTRIES,
+    HASH_INDEX_PATH_ENV_VAR,
+    MAX_CONCURRENCY,
+    UPLOAD_JOURNAL_DIRECTORY_ENV_VAR,
+)
+from azure.ml._utils import _asset_utils
+from azure.ml._utils._asset_utils import get_object_hash
+from storage_stand_in import BlobServiceStandIn, NetworkProfile, ShareDirectoryStandIn, ShareStandIn
+
+pytestmark = pytest.mark.perftest
+
+LATENCY = 0.005
+BANDWIDTH = 100 * 2 ** 20
+SMALL_FILE_COUNT = 400
+SMALL_FILE_SIZE = 4 * 1024
+HUGE_FILE_COUNT = 2
+HUGE_FILE_SIZE = 32 * 2 ** 20
+# more files than the hash index holds entries
+MANY_FILE_COUNT = HASH_INDEX_MAX_ENTRIES + 2000
+MANY_FILE_SIZE = 1024
+JOB_PREFIX = "ExperimentRun/dcid.benchmark/"
+
+
+@pytest.fixture(autouse=True)
+def local_state(tmp_path: Path, monkeypatch) -> None:  # type: ignore
+    monkeypatch.setenv(HASH_INDEX_DISABLE_ENV_VAR, "true")
+    monkeypatch.setenv(UPLOAD_JOURNAL_DIRECTORY_ENV_VAR, str(tmp_path / "journals"))
+    _fileshare_storage_helper._confirmed_assets.clear()
+
+
+@pytest.fixture
+def network() -> NetworkProfile:
+    return NetworkProfile(latency=LATENCY, bytes_per_second=BANDWIDTH)
+
+
+@pytest.fixture(scope="module")
+def small_files(tmpdir_factory) -> Path:  # type: ignore
+    root = Path(str(tmpdir_factory.mktemp("small_files")))
+    for i in range(SMALL_FILE_COUNT):
+        path = root / f"dir_{i % 10}" / f"file_{i}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(os.urandom(SMALL_FILE_SIZE))
+    return root
+
+
+@pytest.fixture(scope="module")
+def huge_files(tmpdir_factory) -> Path:  # type: ignore
+    root = Path(str(tmpdir_factory.mktemp("huge_files")))
+    for i in range(HUGE_FILE_COUNT):
+        (root / f"model_{i}.ckpt").write_bytes(os.urandom(HUGE_FILE_SIZE))
+    return root
+
+
+@pytest.fixture(scope="module")
+def many_files(tmpdir_factory) -> Path:  # type: ignore
+    root = Path(str(tmpdir_factory.mktemp("many_files")))
+    # files modified within the racy window are never cached by the hash index
+    past = time.time() - 60
+    for i in range(MANY_FILE_COUNT):
+        path = root / f"dir_{i % 100}" / f"file_{i}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(os.urandom(MANY_FILE_SIZE))
+        os.utime(str(path), (past, past))
+    return root
+
+
+@pytest.fixture
+def blob_blocks(monkeypatch) -> None:  # type: ignore
+    # block uploads of files a fraction of the production threshold, so the workload stays small
+    monkeypatch.setattr("azure.ml._artifacts._default_storage_helper.BLOCK_UPLOAD_THRESHOLD", 8 * 2 ** 20)
+    monkeypatch.setattr("azure.ml._artifacts._default_storage_helper.BLOB_BLOCK_SIZE", 4 * 2 ** 20)
+
+
+def _blob_client(network: NetworkProfile, container: str = "container") -> DefaultStorageClient:
+    service = BlobServiceStandIn(network)
+    return DefaultStorageClient(credential="key", container_name=container, account_url=service.url,
+                                service_client=service)
+
+
+def _file_client(network: NetworkProfile) -> FileStorageClient:
+    share = ShareStandIn(network)
+    return FileStorageClient(credential="key", file_share_name="share", account_url=share.url,
+                             directory_client=ShareDirectoryStandIn(share, AZ_ML_ARTIFACT_DIRECTORY))
+
+
+def _latency_bound_seconds(request_count: int) -> float:
+    """Ideal duration of a latency-bound workload: MAX_CONCURRENCY requests are in flight at all times"""
+    return request_count * LATENCY / MAX_CONCURRENCY
+
+
+def _bandwidth_bound_seconds(total_bytes: int) -> float:
+    """Ideal duration of a bandwidth-bound workload: its bytes use the whole link"""
+    return total_bytes / BANDWIDTH
+
+
+@pytest.fixture
+def hashed_files(monkeypatch) -> List[str]:  # type: ignore
+    """Records every file whose content is hashed"""
+    hashed = []  # type: List[str]
+    get_file_hash = _asset_utils._get_file_hash
+
+    def counting_get_file_hash(filename, hash):  # type: ignore
+        hashed.append(str(filename))
+        return get_file_hash(filename, hash)
+
+    monkeypatch.setattr(_asset_utils, "_get_file_hash", counting_get_file_hash)
+    return hashed
+
+
+class TestUploadBenchmarks:
+    def test_many_small_files_to_blob(  # type: ignore
+        self, network: NetworkProfile, small_files: Path, storage_benchmark
+    ) -> None:
+        client = _blob_client(network)
+        total_bytes = SMALL_FILE_COUNT * SMALL_FILE_SIZE
+        with storage_benchmark.measure("upload small files (blob)", SMALL_FILE_COUNT, total_bytes,
+                                       _latency_bound_seconds(SMALL_FILE_COUNT)):
+            client.upload(str(small_files), asset_hash="small", show_progress=False, max_concurrency=MAX_CONCURRENCY)
+
+        assert client.uploaded_file_count == SMALL_FILE_COUNT
+        assert network.bytes_transferred >= total_bytes
+
+    def test_many_small_files_to_file_share(  # type: ignore
+        self, network: NetworkProfile, small_files: Path, storage_benchmark
+    ) -> None:
+        client = _file_client(network)
+        total_bytes = SMALL_FILE_COUNT * SMALL_FILE_SIZE
+        with storage_benchmark.measure("upload small files (file share)", SMALL_FILE_COUNT, total_bytes,
+                                       _latency_bound_seconds(SMALL_FILE_COUNT)):
+            client.upload(str(small_files), asset_hash="small", show_progress=False, max_concurrency=MAX_CONCURRENCY)
+
+        assert client.uploaded_file_count == SMALL_FILE_COUNT
+        assert network.bytes_transferred >= total_bytes
+
+    def test_few_huge_files_to_blob(  # type: ignore
+        self, network: NetworkProfile, huge_files: Path, blob_blocks, storage_benchmark
+    ) -> None:
+        client = _blob_client(network)
+        total_bytes = HUGE_FILE_COUNT * HUGE_FILE_SIZE
+        with storage_benchmark.measure("upload huge files (blob)", HUGE_FILE_COUNT, total_bytes,
+                                       _bandwidth_bound_seconds(total_bytes)):
+            client.upload(str(huge_files), asset_hash="huge", show_progress=False, max_concurrency=MAX_CONCURRENCY)
+
+        assert client.uploaded_file_count == HUGE_FILE_COUNT
+        assert network.bytes_transferred >= total_bytes
+
+    def test_few_huge_files_to_file_share(  # type: ignore
+        self, network: NetworkProfile, huge_files: Path, storage_benchmark
+    ) -> None:
+        client = _file_client(network)
+        total_bytes = HUGE_FILE_COUNT * HUGE_FILE_SIZE
+        with storage_benchmark.measure("upload huge files (file share)", HUGE_FILE_COUNT, total_bytes,
+                                       _bandwidth_bound_seconds(total_bytes)):
+            client.upload(str(huge_files), asset_hash="huge", show_progress=False, max_concurrency=MAX_CONCURRENCY)
+
+        assert client.uploaded_file_count == HUGE_FILE_COUNT
+        assert network.bytes_transferred >= total_bytes
+
+
+class TestHashBenchmarks:
+    def test_hash_many_small_files(self, small_files: Path, hashed_files, storage_benchmark) -> None:  # type: ignore
+        with storage_benchmark.measure("hash small files", SMALL_FILE_COUNT, SMALL_FILE_COUNT * SMALL_FILE_SIZE):
+            digest = get_object_hash(small_files)
+        assert digest
+        assert len(hashed_files) == SMALL_FILE_COUNT
+
+    def test_hash_few_huge_files(self, huge_files: Path, hashed_files, storage_benchmark) -> None:  # type: ignore
+        with storage_benchmark.measure("hash huge files", HUGE_FILE_COUNT, HUGE_FILE_COUNT * HUGE_FILE_SIZE):
+            digest = get_object_hash(huge_files)
+        assert digest
+        assert len(hashed_files) == HUGE_FILE_COUNT
+
+    def test_hash_tree_larger_than_index(  # type: ignore
+        self, many_files: Path, tmp_path: Path, monkeypatch, hashed_files, storage_benchmark
+    ) -> None:
+        total_bytes = MANY_FILE_COUNT * MANY_FILE_SIZE
+        with storage_benchmark.measure("hash many files (no index)", MANY_FILE_COUNT, total_bytes):
+            get_object_hash(many_files)
+
+        monkeypatch.delenv(HASH_INDEX_DISABLE_ENV_VAR)
+        monkeypatch.setenv(HASH_INDEX_PATH_ENV_VAR, str(tmp_path / "hash_index.json"))
+        with storage_benchmark.measure("hash many files (cold index)", MANY_FILE_COUNT, total_bytes):
+            first_digest = get_object_hash(many_files)
+        assert len(hashed_files) == 2 * MANY_FILE_COUNT
+
+        changed_file = many_files / "dir_0" / "file_0.txt"
+        changed_file.write_bytes(os.urandom(MANY_FILE_SIZE))
+        past = time.time() - 30
+        os.utime(str(changed_file), (past, past))
+        del hashed_files[:]
+        with storage_benchmark.measure("hash many files (one changed)", MANY_FILE_COUNT, total_bytes):
+            assert get_object_hash(many_files) != first_digest
+
+        # the index filled by the cold run holds every other file, so only the changed one is read again
+        assert hashed_files == [str(changed_file)]
+
+
+class TestDownloadBenchmarks:
+    def test_many_small_files_from_blob(  # type: ignore
+        self, network: NetworkProfile, tmp_path: Path, storage_benchmark
+    ) -> None:
+        client = _blob_client(network, container="azureml")
+        for i in range(SMALL_FILE_COUNT):
+            client.container_client.put(f"{JOB_PREFIX}outputs/dir_{i % 10}/file_{i}.txt", os.urandom(SMALL_FILE_SIZE))
+
+        total_bytes = SMALL_FILE_COUNT * SMALL_FILE_SIZE
+        # the stand-in charges a round trip to open each download and another to read its content
+        with storage_benchmark.measure("download small files (blob)", SMALL_FILE_COUNT, total_bytes,
+                                       _latency_bound_seconds(2 * SMALL_FILE_COUNT)):
+            client.download(starts_with=JOB_PREFIX, destination=str(tmp_path))
+
+        assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == SMALL_FILE_COUNT
+        assert network.bytes_transferred == total_bytes
+
+    def test_few_huge_files_from_blob(  # type: ignore
+        self, network: NetworkProfile, tmp_path: Path, storage_benchmark
+    ) -> None:
+        client = _blob_client(network, container="azureml")
+        for i in range(HUGE_FILE_COUNT):
+            client.container_client.put(f"{JOB_PREFIX}outputs/model_{i}.ckpt", os.urandom(HUGE_FILE_SIZE))
+
+        total_bytes = HUGE_FILE_COUNT * HUGE_FILE_SIZE
+        with storage_benchmark.measure("download huge files (blob)", HUGE_FILE_COUNT, total_bytes,
+                                       _bandwidth_bound_seconds(total_bytes)):
+            client.download(starts_with=JOB_PREFIX, destination=str(tmp_path))
+
+        assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == HUGE_FILE_COUNT
+        assert network.bytes_transferred == total_bytes
+
+    def test_many_small_files_from_file_share(  # type: ignore
+        self, network: NetworkProfile, tmp_path: Path, storage_benchmark
+    ) -> None:
+        client = _file_client(network)
+        for i in range(SMALL_FILE_COUNT):
+            client.directory_client.share.put(
+                f"{AZ_ML_ARTIFACT_DIRECTORY}/{JOB_PREFIX}outputs/dir_{i % 10}/file_{i}.txt", os.urandom(SMALL_FILE_SIZE)
+            )
+
+        total_bytes = SMALL_FILE_COUNT * SMALL_FILE_SIZE
+        with storage_benchmark.measure("download small files (file share)", SMALL_FILE_COUNT, total_bytes,
+                                       _latency_bound_seconds(2 * SMALL_FILE_COUNT)):
+            client.download(destination=str(tmp_path))
+
+        assert len([p for p in tmp_path.rglob("*") if p.is_file()]) == SMALL_FILE_COUNT
+        assert network.bytes_transferred == total_bytes
@@ -0,0 +1,53 @@
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from azure.ml._artifacts._artifact_utilities import _upload_to_datastore
+from azure.ml._operations import DatastoreOperations
+from azure.ml._workspace_dependent_operations import WorkspaceScope
+
+
+@pytest.fixture
+def mock_datastore_operation(mock_workspace_scope: WorkspaceScope, mock_aml_services: Mock) -> DatastoreOperations:
+    yield DatastoreOperations(workspace_scope=mock_workspace_scope, service_client=mock_aml_services)
+
+
+@pytest.fixture
+def model_dir(tmp_path: Path) -> Path:
+    (tmp_path / "model").mkdir()
+    (tmp_path / "model" / "weights.bin").write_bytes(b"weights")
+    return tmp_path / "model"
+
+
+class TestUploadToDatastore:
+    def test_same_content_is_uploaded_once(
+        self, mock_workspace_scope: WorkspaceScope, mock_datastore_operation: DatastoreOperations, model_dir: Path
+    ) -> None:
+        with patch("azure.ml._artifacts._artifact_utilities.upload_artifact") as upload, patch(
+            "azure.ml._artifacts._artifact_utilities.get_datastore_arm_id", return_value="datastore_id"
+        ):
+            first = _upload_to_datastore(
+                mock_workspace_scope, mock_datastore_operation, model_dir, "workspaceblobstore"
+            )
+            second = _upload_to_datastore(
+                mock_workspace_scope, mock_datastore_operation, str(model_dir / ".." / "model"), "workspaceblobstore"
+            )
+            assert first == second
+            assert upload.call_count == 1
+
+            # another datastore or changed content is uploaded again
+            _upload_to_datastore(mock_workspace_scope, mock_datastore_operation, model_dir, "other_datastore")
+            (model_dir / "weights.bin").write_bytes(b"new weights")
+            _upload_to_datastore(mock_workspace_scope, mock_datastore_operation, model_dir, "workspaceblobstore")
+            assert upload.call_count == 3
+
+    def test_failed_upload_is_retried(
+        self, mock_workspace_scope: WorkspaceScope, mock_datastore_operation: DatastoreOperations, model_dir: Path
+    ) -> None:
+        with patch(
+            "azure.ml._artifacts._artifact_utilities.upload_artifact", side_effect=[Exception("upload failed"), "path"]
+        ) as upload, patch("azure.ml._artifacts._artifact_utilities.get_datastore_arm_id"):
+            with pytest.raises(Exception, match="upload failed"):
+                _upload_to_datastore(mock_workspace_scope, mock_datastore_operation, model_dir, "workspaceblobstore")
+            _upload_to_datastore(mock_workspace_scope, mock_datastore_operation, model_dir, "workspaceblobstore")
+            assert upload.call_count == 2
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ml._artifacts.aio import _default_storage_helper
+from azure.ml._artifacts.aio._default_storage_helper import DefaultStorageClient
+from azure.ml._artifacts.constants import UPLOAD_CONFIRMATION
+from azure.ml._utils import _asset_utils
+
+
+async def _completed(*args, **kwargs) -> None:
+    return None
+
+
+async def _not_found(*args, **kwargs) -> None:
+    raise ResourceNotFoundError("not found")
+
+
+@pytest.fixture
+def artifact_dir(tmpdir_factory) -> str:  # type: ignore
+    root = tmpdir_factory.mktemp("async_artifact_dir")
+    for i in range(20):
+        root.join(f"file_{i}.txt").write(f"content {i}")
+    return str(root)
+
+
+@pytest.fixture
+def mock_storage_client() -> DefaultStorageClient:
+    with patch("azure.ml._artifacts.aio._default_storage_helper.BlobServiceClient"):
+        client = DefaultStorageClient(credential="key", container_name="container", account_url="https://account")
+    client.container_client.upload_blob = Mock(side_effect=_completed)
+    blob_client = client.container_client.get_blob_client.return_value
+    blob_client.get_blob_properties = Mock(side_effect=_not_found)
+    blob_client.set_blob_metadata = Mock(side_effect=_completed)
+    yield client
+
+
+class TestAsyncDefaultStorageClient:
+    def test_upload_dir(self, mock_storage_client: DefaultStorageClient, artifact_dir: str) -> None:
+        asyncio.get_event_loop().run_until_complete(
+            mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, max_concurrency=5)
+        )
+
+        assert mock_storage_client.container_client.upload_blob.call_count == 20
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.set_blob_metadata.assert_called_once_with(UPLOAD_CONFIRMATION)
+
+    def test_upload_dir_failure_skips_confirmation(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str
+    ) -> None:
+        async def _fail(*args, **kwargs) -> None:
+            raise Exception("upload failed")
+
+        mock_storage_client.container_client.upload_blob = Mock(side_effect=_fail)
+        with pytest.raises(Exception, match="upload failed"):
+            asyncio.get_event_loop().run_until_complete(
+                mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False)
+            )
+
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.set_blob_metadata.assert_not_called()
+
+    def test_upload_dir_reads_off_the_event_loop(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str
+    ) -> None:
+        walk_threads = []
+
+        def get_directory_upload_paths(*args):  # type: ignore
+            walk_threads.append(threading.current_thread())
+            return _asset_utils.get_directory_upload_paths(*args)
+
+        with patch.object(_default_storage_helper, "get_directory_upload_paths", get_directory_upload_paths):
+            asyncio.get_event_loop().run_until_complete(
+                mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False)
+            )
+
+        assert walk_threads and threading.main_thread() not in walk_threads
+        uploaded = {c[1]["name"]: c[1]["data"] for c in mock_storage_client.container_client.upload_blob.call_args_list}
+        assert uploaded[f"az-ml-artifacts/hash/{Path(artifact_dir).name}/file_3.txt"] == b"content 3"
+
+    def test_large_file_uploaded_in_blocks(  # type: ignore
+        self, mock_storage_client: DefaultStorageClient, tmp_path: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setattr(_default_storage_helper, "BLOB_BLOCK_SIZE", 10)
+        large_file = tmp_path / "model.ckpt"
+        large_file.write_bytes(bytes(range(95)))
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.stage_block = Mock(side_effect=_completed)
+        blob_client.commit_block_list = Mock(side_effect=_completed)
+
+        asyncio.get_event_loop().run_until_complete(
+            mock_storage_client.upload(str(large_file), asset_hash="hash", show_progress=False, max_concurrency=4)
+        )
+
+        mock_storage_client.container_client.upload_blob.assert_not_called()
+        staged = {c[1]["block_id"]: c[1]["data"] for c in blob_client.stage_block.call_args_list}
+        committed = [block.id for block in blob_client.commit_block_list.call_args[0][0]]
+        assert len(committed) == 10
+        assert b"".join(staged[block_id] for block_id in committed) == large_file.read_bytes()
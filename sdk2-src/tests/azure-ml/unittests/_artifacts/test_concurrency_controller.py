@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import Mock, patch
+
+from azure.core.exceptions import HttpResponseError
+from azure.ml._artifacts._concurrency_controller import AdaptiveConcurrencyController, RateLimiter, get_retry_after
+from azure.ml._artifacts.constants import ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR, UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR
+
+
+def _throttled_response(status_code: int = 429, retry_after: str = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return response
+
+
+def _complete_requests(controller: AdaptiveConcurrencyController, count: int, nbytes: int = 1024) -> None:
+    for _ in range(count):
+        controller.acquire()
+        controller.release(nbytes, duration=0.01)
+
+
+@pytest.fixture(autouse=True)
+def no_environment(monkeypatch) -> None:  # type: ignore
+    monkeypatch.delenv(ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR, raising=False)
+    monkeypatch.delenv(UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR, raising=False)
+
+
+class TestAdaptiveConcurrencyController:
+    def test_limit_grows_while_throughput_holds(self) -> None:
+        controller = AdaptiveConcurrencyController(2, max_limit=4)
+        with patch("azure.ml._artifacts._concurrency_controller.time.monotonic", side_effect=range(1, 1000)):
+            _complete_requests(controller, 50)
+        assert controller.limit == 4
+
+    def test_throttled_response_halves_limit(self) -> None:
+        controller = AdaptiveConcurrencyController(8)
+        pipeline_response = Mock(http_response=_throttled_response(503, retry_after="0"))
+
+        controller.on_response(pipeline_response)
+        assert controller.limit == 4
+        assert controller.throttle_count == 1
+
+        # requests in flight during the same throttling episode do not reduce the limit again
+        controller.on_response(pipeline_response)
+        assert controller.limit == 4
+        assert controller.throttle_count == 2
+
+    def test_run_retries_throttled_request(self) -> None:
+        controller = AdaptiveConcurrencyController(4)
+        error = HttpResponseError(message="server busy", response=_throttled_response(429, retry_after="0"))
+        func = Mock(side_effect=[error, "done"])
+
+        assert controller.run(func, nbytes=10) == "done"
+        assert func.call_count == 2
+        assert controller.limit == 2
+
+    def test_run_gives_up_after_max_attempts(self) -> None:
+        controller = AdaptiveConcurrencyController(4, max_attempts=2)
+        error = HttpResponseError(message="server busy", response=_throttled_response(429, retry_after="0"))
+        func = Mock(side_effect=error)
+
+        with pytest.raises(HttpResponseError):
+            controller.run(func)
+        assert func.call_count == 2
+
+    def test_run_does_not_retry_other_errors(self) -> None:
+        controller = AdaptiveConcurrencyController(4)
+        func = Mock(side_effect=HttpResponseError(message="forbidden", response=_throttled_response(403)))
+
+        with pytest.raises(HttpResponseError):
+            controller.run(func)
+        assert func.call_count == 1
+        assert controller.limit == 4
+
+    def test_disabled_controller_keeps_initial_limit(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setenv(ADAPTIVE_CONCURRENCY_DISABLE_ENV_VAR, "true")
+        controller = AdaptiveConcurrencyController.from_environment(3)
+
+        _complete_requests(controller, 30)
+        controller.on_response(Mock(http_response=_throttled_response(429, retry_after="0")))
+        assert controller.limit == controller.max_limit == 3
+
+    def test_bytes_per_second_cap_from_environment(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setenv(UPLOAD_MAX_BYTES_PER_SECOND_ENV_VAR, "100")
+        controller = AdaptiveConcurrencyController.from_environment(2)
+        stream = Mock()
+        stream.read.return_value = b"x" * 150
+
+        with patch("azure.ml._artifacts._concurrency_controller.time.sleep") as mock_sleep:
+            assert controller.throttled_reader(stream).read(150) == b"x" * 150
+        assert mock_sleep.call_args[0][0] == pytest.approx(0.5, abs=0.05)
+
+    def test_no_cap_returns_stream_unchanged(self) -> None:
+        stream = Mock()
+        assert AdaptiveConcurrencyController(2).throttled_reader(stream) is stream
+
+
+class TestRetryAfter:
+    def test_seconds(self) -> None:
+        assert get_retry_after(_throttled_response(retry_after="7")) == 7
+
+    def test_http_date_in_the_past(self) -> None:
+        assert get_retry_after(_throttled_response(retry_after="Wed, 21 Oct 2015 07:28:00 GMT")) == 0
+
+    def test_missing_or_invalid(self) -> None:
+        assert get_retry_after(_throttled_response()) is None
+        assert get_retry_after(_throttled_response(retry_after="soon")) is None
+        assert get_retry_after(None) is None
+
+
+class TestRateLimiter:
+    def test_burst_within_one_second_is_not_delayed(self) -> None:
+        limiter = RateLimiter(1000)
+        with patch("azure.ml._artifacts._concurrency_controller.time.sleep") as mock_sleep:
+            limiter.consume(500)
+            limiter.consume(400)
+        mock_sleep.assert_not_called()
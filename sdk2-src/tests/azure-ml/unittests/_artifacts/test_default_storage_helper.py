@@ -0,0 +1,307 @@
+import hashlib
+import io
+import json
+import shutil
+import tarfile
+import threading
+import time
+import pytest
+from pathlib import Path
+from typing import Dict
+from unittest.mock import Mock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobBlock
+from azure.ml._artifacts._artifact_utilities import upload_artifact
+from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
+from azure.ml._artifacts._transfer_metrics import TransferMetrics
+from azure.ml._artifacts.constants import (
+    UPLOAD_CONFIRMATION,
+    UPLOAD_JOURNAL_DIRECTORY_ENV_VAR,
+    HASH_INDEX_DISABLE_ENV_VAR,
+    DEDUPE_ENV_VAR,
+)
+
+
+@pytest.fixture(autouse=True)
+def local_state(tmp_path: Path, monkeypatch) -> None:  # type: ignore
+    monkeypatch.setenv(HASH_INDEX_DISABLE_ENV_VAR, "true")
+    monkeypatch.setenv(UPLOAD_JOURNAL_DIRECTORY_ENV_VAR, str(tmp_path / "journals"))
+
+
+@pytest.fixture
+def artifact_dir(tmpdir_factory) -> str:  # type: ignore
+    root = tmpdir_factory.mktemp("artifact_dir")
+    for i in range(25):
+        root.join(f"file_{i}.txt").write(f"content {i}")
+    sub_dir = root.mkdir("sub_dir")
+    for i in range(5):
+        sub_dir.join(f"nested_{i}.txt").write(f"nested {i}")
+    return str(root)
+
+
+@pytest.fixture
+def large_file(tmp_path: Path, monkeypatch) -> str:  # type: ignore
+    monkeypatch.setattr("azure.ml._artifacts._default_storage_helper.BLOCK_UPLOAD_THRESHOLD", 64)
+    monkeypatch.setattr("azure.ml._artifacts._default_storage_helper.BLOB_BLOCK_SIZE", 10)
+    path = tmp_path / "model.ckpt"
+    path.write_bytes(bytes(range(95)))
+    return str(path)
+
+
+@pytest.fixture
+def mock_storage_client() -> DefaultStorageClient:
+    with patch("azure.ml._artifacts._default_storage_helper.BlobServiceClient"):
+        client = DefaultStorageClient(credential="key", container_name="container", account_url="https://account")
+    client.service_client.url = "https://account"
+    blob_client = client.container_client.get_blob_client.return_value
+    blob_client.get_blob_properties.side_effect = ResourceNotFoundError("not found")
+    yield client
+
+
+class TestDefaultStorageClient:
+    def test_upload_dir_uploads_every_file(self, mock_storage_client: DefaultStorageClient, artifact_dir: str) -> None:
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, max_concurrency=4)
+
+        uploaded = sorted(c[1]["name"] for c in mock_storage_client.container_client.upload_blob.call_args_list)
+        assert len([name for name in uploaded if name.startswith("az-ml-artifacts/hash/")]) == 30
+        assert mock_storage_client.uploaded_file_count == mock_storage_client.total_file_count == 30
+        assert f"az-ml-artifacts/hash/{Path(artifact_dir).name}/sub_dir/nested_0.txt" in uploaded
+
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.set_blob_metadata.assert_called_once_with(UPLOAD_CONFIRMATION)
+
+    def test_upload_dir_records_metrics(self, mock_storage_client: DefaultStorageClient, artifact_dir: str) -> None:
+        throttled = Mock(http_response=Mock(status_code=503, headers={"Retry-After": "0"}))
+
+        def upload_blob(name, data, raw_response_hook=None, **kwargs):  # type: ignore
+            if name.endswith("file_3.txt") and raw_response_hook:
+                raw_response_hook(throttled)
+
+        mock_storage_client.container_client.upload_blob.side_effect = upload_blob
+        callback = Mock()
+        metrics = TransferMetrics(callback=callback)
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, metrics=metrics)
+
+        assert metrics.file_count == callback.call_count == 30
+        assert metrics.total_bytes == sum(p.stat().st_size for p in Path(artifact_dir).rglob("*") if p.is_file())
+        assert metrics.retries == 1
+        assert [f.retries for f in metrics.files if f.remote_path.endswith("/file_3.txt")] == [1]
+
+    def test_upload_dir_failure_skips_confirmation(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str
+    ) -> None:
+        mock_storage_client.container_client.upload_blob.side_effect = Exception("upload failed")
+
+        with pytest.raises(Exception, match="upload failed"):
+            mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, max_concurrency=4)
+
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.set_blob_metadata.assert_not_called()
+
+    def test_upload_skipped_when_confirmed(self, mock_storage_client: DefaultStorageClient, artifact_dir: str) -> None:
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.get_blob_properties.side_effect = None
+        blob_client.get_blob_properties.return_value = {"metadata": UPLOAD_CONFIRMATION}
+
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False)
+
+        mock_storage_client.container_client.upload_blob.assert_not_called()
+        blob_client.set_blob_metadata.assert_not_called()
+
+    def test_large_file_uploaded_in_blocks(self, mock_storage_client: DefaultStorageClient, large_file: str) -> None:
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.get_block_list.return_value = ([], [])
+
+        mock_storage_client.upload(large_file, asset_hash="hash", show_progress=False, max_concurrency=4)
+
+        mock_storage_client.container_client.upload_blob.assert_not_called()
+        assert blob_client.stage_block.call_count == 10
+        committed = blob_client.commit_block_list.call_args[0][0]
+        assert len(committed) == 10
+        assert committed == sorted(committed, key=lambda block: block.id)
+        blob_client.set_blob_metadata.assert_called_once_with(UPLOAD_CONFIRMATION)
+
+    def test_interrupted_block_upload_resumes(
+        self, mock_storage_client: DefaultStorageClient, large_file: str
+    ) -> None:
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.get_block_list.return_value = ([], [])
+        staged = []
+
+        def stage_block(block_id, data, **kwargs):  # type: ignore
+            if len(staged) == 4:
+                raise Exception("connection reset")
+            staged.append(block_id)
+
+        blob_client.stage_block.side_effect = stage_block
+        with pytest.raises(Exception, match="connection reset"):
+            mock_storage_client.upload(large_file, asset_hash="hash", show_progress=False, max_concurrency=1)
+        blob_client.commit_block_list.assert_not_called()
+
+        blob_client.stage_block.reset_mock()
+        blob_client.stage_block.side_effect = None
+        blob_client.get_block_list.return_value = ([], [BlobBlock(block_id=block_id) for block_id in staged])
+        mock_storage_client.upload(large_file, asset_hash="hash", show_progress=False, max_concurrency=1)
+
+        assert blob_client.stage_block.call_count == 6
+        assert not {c[1]["block_id"] for c in blob_client.stage_block.call_args_list} & set(staged)
+        assert len(blob_client.commit_block_list.call_args[0][0]) == 10
+
+    def test_large_file_in_directory_stages_blocks_in_parallel(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str, large_file: str
+    ) -> None:
+        shutil.copy(large_file, artifact_dir)
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.get_block_list.return_value = ([], [])
+        lock = threading.Lock()
+        staging = {"active": 0, "max_active": 0}
+
+        def stage_block(block_id, data, **kwargs):  # type: ignore
+            with lock:
+                staging["active"] += 1
+                staging["max_active"] = max(staging["max_active"], staging["active"])
+            time.sleep(0.05)
+            with lock:
+                staging["active"] -= 1
+
+        blob_client.stage_block.side_effect = stage_block
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, max_concurrency=4)
+
+        assert blob_client.stage_block.call_count == 10
+        assert staging["max_active"] > 1
+        assert mock_storage_client.uploaded_file_count == mock_storage_client.total_file_count == 31
+
+    def _mock_stored_content(  # type: ignore
+        self, storage_client: DefaultStorageClient, artifact_dir: str, monkeypatch, copied_md5: bytes = None
+    ) -> Dict[str, Mock]:
+        """Serves file_0.txt as content already stored in the container, copied with `copied_md5`"""
+        monkeypatch.setattr("azure.ml._artifacts._default_storage_helper.DEDUPE_MIN_FILE_SIZE", 0)
+        stored_digest = hashlib.md5(Path(artifact_dir, "file_0.txt").read_bytes()).hexdigest()
+        copied_md5 = bytearray.fromhex(stored_digest) if copied_md5 is None else copied_md5
+        storage_client.service_client.credential = Mock(account_name="account", account_key="a2V5")
+        blob_clients = {}
+
+        def get_blob_client(blob: str) -> Mock:
+            if blob not in blob_clients:
+                client = blob_clients[blob] = Mock(blob_name=blob, url=f"https://account/container/{blob}")
+                if blob == "az-ml-artifacts/content/" + stored_digest:
+                    client.get_blob_properties.return_value.metadata = {"path": "az-ml-artifacts/old/file_0.txt"}
+                else:
+                    copied_properties = Mock()
+                    copied_properties.content_settings.content_md5 = copied_md5
+
+                    def get_blob_properties() -> Mock:
+                        if not client.start_copy_from_url.called:
+                            raise ResourceNotFoundError("not found")
+                        return copied_properties
+
+                    client.get_blob_properties.side_effect = get_blob_properties
+                client.start_copy_from_url.return_value = {"copy_status": "success"}
+            return blob_clients[blob]
+
+        storage_client.container_client.get_blob_client.side_effect = get_blob_client
+        return blob_clients
+
+    def test_dedupe_copies_stored_content(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str, monkeypatch
+    ) -> None:  # type: ignore
+        blob_clients = self._mock_stored_content(mock_storage_client, artifact_dir, monkeypatch)
+        stored_digest = hashlib.md5(Path(artifact_dir, "file_0.txt").read_bytes()).hexdigest()
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, dedupe=True)
+
+        asset_prefix = f"az-ml-artifacts/hash/{Path(artifact_dir).name}/"
+        uploaded = [c[1]["name"] for c in mock_storage_client.container_client.upload_blob.call_args_list]
+        assert asset_prefix + "file_0.txt" not in uploaded
+        assert len([name for name in uploaded if name.startswith(asset_prefix)]) == 29
+        # the source of the copy is authorized by a SAS signed with the account key
+        source_url = blob_clients[asset_prefix + "file_0.txt"].start_copy_from_url.call_args[0][0]
+        assert source_url.startswith("https://account/container/az-ml-artifacts/old/file_0.txt?")
+        assert "sig=" in source_url and "sp=r" in source_url
+        # pointers are only published for content that was uploaded
+        assert len([name for name in uploaded if name.startswith("az-ml-artifacts/content/")]) == 29
+        uploaded_md5 = [c[1]["content_settings"].content_md5 for c in
+                        mock_storage_client.container_client.upload_blob.call_args_list if c[1]["name"] in uploaded
+                        and c[1]["name"].startswith(asset_prefix)]
+        assert all(len(md5) == 16 for md5 in uploaded_md5)
+
+        manifest_call = [c for c in mock_storage_client.container_client.upload_blob.call_args_list
+                         if c[1]["name"] == "az-ml-artifacts/manifests/hash.json"][0]
+        manifest = json.loads(manifest_call[1]["data"])
+        assert len(manifest["files"]) == 30
+        assert manifest["files"][f"{Path(artifact_dir).name}/file_0.txt"]["md5"] == stored_digest
+
+    def test_dedupe_uploads_when_copy_does_not_match(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str, monkeypatch
+    ) -> None:  # type: ignore
+        blob_clients = self._mock_stored_content(mock_storage_client, artifact_dir, monkeypatch, b"\0" * 16)
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, dedupe=True)
+
+        copied_blob = f"az-ml-artifacts/hash/{Path(artifact_dir).name}/file_0.txt"
+        blob_clients[copied_blob].delete_blob.assert_called_once()
+        uploaded = [c[1]["name"] for c in mock_storage_client.container_client.upload_blob.call_args_list]
+        assert copied_blob in uploaded
+
+    def test_dedupe_is_opt_in(self, mock_storage_client: DefaultStorageClient, artifact_dir: str, monkeypatch) -> None:
+        blob_clients = self._mock_stored_content(mock_storage_client, artifact_dir, monkeypatch)
+        mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False)
+
+        assert not any(client.start_copy_from_url.called for client in blob_clients.values())
+        uploaded = [c[1]["name"] for c in mock_storage_client.container_client.upload_blob.call_args_list]
+        assert not any(name.startswith("az-ml-artifacts/manifests/") for name in uploaded)
+
+    def test_upload_artifact_copies_unchanged_files(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str, monkeypatch
+    ) -> None:  # type: ignore
+        blob_clients = self._mock_stored_content(mock_storage_client, artifact_dir, monkeypatch)
+        monkeypatch.setenv(DEDUPE_ENV_VAR, "true")
+        with patch(
+            "azure.ml._artifacts._artifact_utilities.get_storage_client", return_value=mock_storage_client
+        ), patch(
+            "azure.ml._artifacts._artifact_utilities.get_datastore_info", return_value={"container_name": "container"}
+        ):
+            upload_artifact(artifact_dir, Mock(), "workspaceblobstore", asset_hash="hash", show_progress=False)
+
+        copied_blob = f"az-ml-artifacts/hash/{Path(artifact_dir).name}/file_0.txt"
+        blob_clients[copied_blob].start_copy_from_url.assert_called_once()
+        uploaded = [c[1]["name"] for c in mock_storage_client.container_client.upload_blob.call_args_list]
+        assert copied_blob not in uploaded
+
+    def test_snapshot_upload_sends_single_archive(
+        self, mock_storage_client: DefaultStorageClient, artifact_dir: str
+    ) -> None:
+        archives = {}
+
+        def upload_blob(name, data, **kwargs):  # type: ignore
+            archives[name] = b"".join(data)
+
+        mock_storage_client.container_client.upload_blob.side_effect = upload_blob
+        dest = mock_storage_client.upload(artifact_dir, asset_hash="hash", show_progress=False, snapshot=True)
+
+        assert dest == f"az-ml-artifacts/hash.snapshot/{Path(artifact_dir).name}.tar.gz"
+        assert list(archives) == [dest]
+        with tarfile.open(fileobj=io.BytesIO(archives[dest]), mode="r:gz") as tar:
+            assert len(tar.getnames()) == 31
+            assert tar.extractfile("sub_dir/nested_0.txt").read() == b"nested 0"
+        mock_storage_client.container_client.get_blob_client.assert_called_with(blob=dest)
+        blob_client = mock_storage_client.container_client.get_blob_client.return_value
+        blob_client.set_blob_metadata.assert_called_once_with(UPLOAD_CONFIRMATION)
+
+    def test_download_streams_blobs_to_disk(self, mock_storage_client: DefaultStorageClient, tmp_path: Path) -> None:
+        prefix = "ExperimentRun/dcid.job/"
+        blobs = [Mock() for _ in range(12)]
+        for i, blob in enumerate(blobs):
+            blob.name = f"{prefix}outputs/file_{i}.txt"
+        mock_storage_client.container_client.list_blobs.return_value = blobs
+
+        def download_blob(item, **kwargs):  # type: ignore
+            downloader = Mock()
+            downloader.readinto.side_effect = lambda stream: stream.write(item.name.encode())
+            return downloader
+
+        mock_storage_client.container_client.download_blob.side_effect = download_blob
+        mock_storage_client.download(starts_with=prefix, destination=str(tmp_path), max_workers=4)
+
+        downloaded = sorted((tmp_path / "job" / "outputs").iterdir())
+        assert len(downloaded) == 12
+        assert (tmp_path / "job" / "outputs" / "file_3.txt").read_text() == f"{prefix}outputs/file_3.txt"
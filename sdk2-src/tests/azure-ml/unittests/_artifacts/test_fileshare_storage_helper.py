@@ -0,0 +1,225 @@
+import pytest
+from pathlib import Path
+from typing import Dict
+from unittest.mock import Mock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ml._artifacts import _fileshare_storage_helper
+from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient, plan_directory_tree
+from azure.ml._artifacts._transfer_metrics import TransferMetrics
+from azure.ml._artifacts.constants import UPLOAD_CONFIRMATION
+from azure.storage.fileshare import ShareFileClient
+
+
+def _make_directory_client(tree: Dict) -> Mock:
+    """Builds a mock directory client serving a nested dict of file name -> content"""
+    client = Mock()
+
+    def list_directories_and_files(name_starts_with: str = "") -> list:
+        return [
+            {"name": name, "is_directory": isinstance(value, dict)}
+            for name, value in tree.items()
+            if name.startswith(name_starts_with)
+        ]
+
+    def get_file_client(name: str) -> Mock:
+        file_client = Mock()
+        content = tree[name].encode()
+        file_client.download_file.return_value.readinto.side_effect = lambda stream: stream.write(content)
+        return file_client
+
+    client.list_directories_and_files.side_effect = list_directories_and_files
+    client.get_file_client.side_effect = get_file_client
+    client.get_subdirectory_client.side_effect = lambda name: _make_directory_client(tree[name])
+    return client
+
+
+@pytest.fixture
+def artifact_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "code"
+    for sub_dir in ["a/deeper", "b", "empty"]:
+        (root / sub_dir).mkdir(parents=True)
+    for path in ["root.txt", "a/file_a.txt", "a/deeper/file_d.txt", "b/file_b.txt"]:
+        (root / path).write_text(path)
+    return root
+
+
+@pytest.fixture
+def mock_file_storage_client() -> FileStorageClient:
+    _fileshare_storage_helper._confirmed_assets.clear()
+    with patch("azure.ml._artifacts._fileshare_storage_helper.ShareDirectoryClient"):
+        client = FileStorageClient(credential="key", file_share_name="share", account_url="https://account")
+    yield client
+
+
+class TestFileStorageClient:
+    def test_download_keeps_sibling_directories_apart(
+        self, mock_file_storage_client: FileStorageClient, tmp_path: Path
+    ) -> None:
+        tree = {
+            "run_1": {
+                "a": {"file_a.txt": "a", "deeper": {"file_d.txt": "d"}},
+                "b": {"file_b.txt": "b"},
+                "root.txt": "root",
+            },
+            "other_run": {"file_x.txt": "x"},
+        }
+        mock_file_storage_client.directory_client = _make_directory_client(tree)
+
+        mock_file_storage_client.download(starts_with="run_", destination=str(tmp_path), max_workers=4)
+
+        downloaded = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*") if p.is_file())
+        assert downloaded == [
+            "run_1/a/deeper/file_d.txt",
+            "run_1/a/file_a.txt",
+            "run_1/b/file_b.txt",
+            "run_1/root.txt",
+        ]
+        assert (tmp_path / "run_1" / "b" / "file_b.txt").read_text() == "b"
+
+    def test_download_records_metrics(self, mock_file_storage_client: FileStorageClient, tmp_path: Path) -> None:
+        tree = {"run_1": {"a": {"file_a.txt": "aaa"}, "root.txt": "root"}}
+        mock_file_storage_client.directory_client = _make_directory_client(tree)
+        metrics = TransferMetrics()
+
+        mock_file_storage_client.download(starts_with="run_", destination=str(tmp_path), metrics=metrics)
+
+        assert metrics.file_count == 2
+        assert metrics.total_bytes == 7
+        assert sorted(Path(f.local_path).name for f in metrics.files) == ["file_a.txt", "root.txt"]
+
+    def test_download_failure_removes_partial_file(
+        self, mock_file_storage_client: FileStorageClient, tmp_path: Path
+    ) -> None:
+        directory_client = _make_directory_client({"run": {"file.txt": "content"}})
+        sub_client = Mock()
+        sub_client.list_directories_and_files.return_value = [{"name": "file.txt", "is_directory": False}]
+        sub_client.get_file_client.return_value.download_file.return_value.readinto.side_effect = Exception("reset")
+        directory_client.get_subdirectory_client.side_effect = lambda name: sub_client
+        mock_file_storage_client.directory_client = directory_client
+
+        with pytest.raises(Exception, match="unsuccessful"):
+            mock_file_storage_client.download(destination=str(tmp_path))
+        assert not (tmp_path / "run" / "file.txt").exists()
+
+    def test_exists_looks_up_asset_directly(self, mock_file_storage_client: FileStorageClient) -> None:
+        directory_client = mock_file_storage_client.directory_client
+        subdirectory_client = directory_client.get_subdirectory_client.return_value
+        subdirectory_client.get_directory_properties.return_value = {"metadata": UPLOAD_CONFIRMATION}
+
+        assert mock_file_storage_client.exists("asset_id")
+        directory_client.list_directories_and_files.assert_not_called()
+
+        # confirmed assets are answered from the existence cache
+        assert mock_file_storage_client.exists("asset_id")
+        subdirectory_client.get_directory_properties.assert_called_once()
+
+    def test_exists_checks_file_when_no_directory(self, mock_file_storage_client: FileStorageClient) -> None:
+        directory_client = mock_file_storage_client.directory_client
+        subdirectory_client = directory_client.get_subdirectory_client.return_value
+        subdirectory_client.get_directory_properties.side_effect = ResourceNotFoundError("not found")
+        file_client = directory_client.get_file_client.return_value = Mock(spec=ShareFileClient)
+        file_client.get_file_properties.side_effect = ResourceNotFoundError("not found")
+
+        assert not mock_file_storage_client.exists("asset_id")
+
+        file_client.get_file_properties.side_effect = None
+        file_client.get_file_properties.return_value = {"metadata": {}}
+        assert not mock_file_storage_client.exists("asset_id")
+        # unconfirmed uploads are removed so they can be re-attempted
+        file_client.delete_file.assert_called_once()
+
+    def test_plan_directory_tree_orders_parents_first(self, artifact_dir: Path) -> None:
+        levels = plan_directory_tree(artifact_dir, "asset_id", "asset_id/code/")
+        assert levels == [
+            ["asset_id"],
+            ["asset_id/code"],
+            ["asset_id/code/a", "asset_id/code/b", "asset_id/code/empty"],
+            ["asset_id/code/a/deeper"],
+        ]
+
+    def test_upload_dir_creates_tree_and_uploads_every_file(
+        self, mock_file_storage_client: FileStorageClient, artifact_dir: Path
+    ) -> None:
+        subdirectory_clients = {}  # type: Dict[str, Mock]
+        directory_client = mock_file_storage_client.directory_client
+        directory_client.get_subdirectory_client.side_effect = lambda path: subdirectory_clients.setdefault(
+            path, Mock()
+        )
+
+        mock_file_storage_client.upload_dir(
+            str(artifact_dir), "asset_id", msg="", show_progress=False, max_concurrency=4
+        )
+
+        created = sorted(
+            path for path, client in subdirectory_clients.items() if client.create_directory.called
+        )
+        assert created == [
+            "asset_id",
+            "asset_id/code",
+            "asset_id/code/a",
+            "asset_id/code/a/deeper",
+            "asset_id/code/b",
+            "asset_id/code/empty",
+        ]
+        uploaded = sorted(
+            f"{path}/{c[1]['file_name']}"
+            for path, client in subdirectory_clients.items()
+            for c in client.upload_file.call_args_list
+        )
+        assert uploaded == [
+            "asset_id/code/a/deeper/file_d.txt",
+            "asset_id/code/a/file_a.txt",
+            "asset_id/code/b/file_b.txt",
+            "asset_id/code/root.txt",
+        ]
+        assert mock_file_storage_client.uploaded_file_count == mock_file_storage_client.total_file_count == 4
+
+    def test_snapshot_upload_sends_single_archive(
+        self, mock_file_storage_client: FileStorageClient, artifact_dir: Path
+    ) -> None:
+        directory_client = mock_file_storage_client.directory_client
+        directory_client.get_subdirectory_client.return_value.get_directory_properties.side_effect = (
+            ResourceNotFoundError("not found")
+        )
+        file_client = directory_client.get_file_client.return_value
+        file_client.get_file_properties.side_effect = ResourceNotFoundError("not found")
+        archived = []
+        file_client.upload_file.side_effect = lambda data, length, **kwargs: archived.append(data.read(length))
+
+        dest = mock_file_storage_client.upload(str(artifact_dir), asset_hash="hash", show_progress=False, snapshot=True)
+
+        assert dest == "hash.snapshot/code.tar.gz"
+        directory_client.get_file_client.assert_called_with(dest)
+        assert len(archived) == 1 and archived[0][:2] == b"\x1f\x8b"
+        file_client.set_file_metadata.assert_called_once_with(UPLOAD_CONFIRMATION)
+        directory_client.get_subdirectory_client.return_value.set_directory_metadata.assert_not_called()
+
+    def test_unconfirmed_directory_cleanup_keeps_archive(
+        self, mock_file_storage_client: FileStorageClient, artifact_dir: Path
+    ) -> None:
+        directory_client = mock_file_storage_client.directory_client
+        subdirectory_clients = {}  # type: Dict[str, Mock]
+
+        def get_subdirectory_client(path: str) -> Mock:
+            if path not in subdirectory_clients:
+                subdirectory_clients[path] = Mock()
+                # only the directory of the regular upload exists, left unconfirmed
+                if path == "hash":
+                    subdirectory_clients[path].get_directory_properties.return_value = {"metadata": {}}
+                else:
+                    subdirectory_clients[path].get_directory_properties.side_effect = ResourceNotFoundError("")
+            return subdirectory_clients[path]
+
+        directory_client.get_subdirectory_client.side_effect = get_subdirectory_client
+        directory_client.get_file_client.return_value.get_file_properties.side_effect = ResourceNotFoundError("")
+        directory_client.get_file_client.return_value.upload_file.side_effect = lambda data, length, **kwargs: None
+        archive_path = mock_file_storage_client.upload(
+            str(artifact_dir), asset_hash="hash", show_progress=False, snapshot=True
+        )
+
+        # a partial regular upload of the same content is cleaned up without reaching the archive
+        with patch("azure.ml._artifacts._fileshare_storage_helper.delete") as mock_delete:
+            assert not mock_file_storage_client.exists("hash")
+        mock_delete.assert_called_once_with(subdirectory_clients["hash"])
+        assert not archive_path.startswith("hash/")
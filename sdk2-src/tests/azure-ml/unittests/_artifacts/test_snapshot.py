@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import tarfile
+import time
+import pytest
+from pathlib import Path
+
+from azure.ml._artifacts._snapshot import SnapshotArchive, use_snapshot_archive
+from azure.ml._artifacts.constants import SNAPSHOT_ENV_VAR, SNAPSHOT_MANIFEST_NAME
+
+
+@pytest.fixture
+def code_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "src"
+    (root / "pkg").mkdir(parents=True)
+    for i in range(200):
+        (root / "pkg" / f"module_{i}.py").write_text(f"value = {i}\n" * 50)
+    (root / "train.py").write_text("print('train')\n")
+    (root / "big.bin").write_bytes(bytes(range(256)) * 20000)
+    (root / "debug.log").write_text("ignored")
+    (root / ".amlignore").write_text("*.log\n")
+    return root
+
+
+class TestSnapshotArchive:
+    def test_archive_round_trip(self, code_dir: Path) -> None:
+        archive = SnapshotArchive(code_dir)
+        data = b"".join(archive.chunks())
+
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+            members = tar.getnames()
+            assert members[0] == SNAPSHOT_MANIFEST_NAME
+            manifest = json.load(tar.extractfile(SNAPSHOT_MANIFEST_NAME))
+            assert tar.extractfile("pkg/module_7.py").read() == (code_dir / "pkg" / "module_7.py").read_bytes()
+
+        assert sorted(members[1:]) == sorted(f["path"] for f in manifest["files"])
+        assert len(members) == archive.file_count + 1 == 204
+        assert "debug.log" not in members
+        assert archive.total_size == sum(f["size"] for f in manifest["files"])
+        assert len(data) < archive.total_size
+
+    def test_archive_is_deterministic(self, code_dir: Path) -> None:
+        assert b"".join(SnapshotArchive(code_dir).chunks()) == b"".join(SnapshotArchive(code_dir).chunks())
+
+    def test_archive_ignores_file_times_and_owners(self, code_dir: Path) -> None:
+        first = b"".join(SnapshotArchive(code_dir).chunks())
+        touched = time.time() - 3600
+        for path in code_dir.rglob("*"):
+            os.utime(str(path), (touched, touched))
+        second = b"".join(SnapshotArchive(code_dir).chunks())
+
+        assert first == second
+        with tarfile.open(fileobj=io.BytesIO(second), mode="r:gz") as tar:
+            for member in tar.getmembers():
+                assert (member.mtime, member.uid, member.gid, member.uname, member.gname) == (0, 0, 0, "", "")
+
+    def test_closing_chunks_stops_writer(self, code_dir: Path) -> None:
+        chunks = SnapshotArchive(code_dir).chunks()
+        next(chunks)
+        chunks.close()
+
+    def test_use_snapshot_archive(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.delenv(SNAPSHOT_ENV_VAR, raising=False)
+        assert not use_snapshot_archive()
+        monkeypatch.setenv(SNAPSHOT_ENV_VAR, "true")
+        assert use_snapshot_archive()
+        assert not use_snapshot_archive(False)
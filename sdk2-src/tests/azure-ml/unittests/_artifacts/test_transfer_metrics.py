@@ -0,0 +1,51 @@
+from unittest.mock import Mock, patch
+
+from azure.ml._artifacts._transfer_metrics import UPLOAD, FileTransfer, TransferMetrics
+
+
+def _pipeline_response(status_code: int) -> Mock:
+    return Mock(http_response=Mock(status_code=status_code))
+
+
+class TestTransferMetrics:
+    def test_retryable_responses_count_as_retries(self) -> None:
+        hook = Mock()
+        transfer = FileTransfer("local.txt", "remote.txt", UPLOAD, response_hook=hook)
+
+        for status_code in (503, 201, 429, 404):
+            transfer.on_response(_pipeline_response(status_code))
+
+        assert transfer.retries == 2
+        assert hook.call_count == 4
+
+    def test_restarted_transfer_keeps_first_start_time(self) -> None:
+        transfer = FileTransfer("local.txt", "remote.txt", UPLOAD)
+        with patch("azure.ml._artifacts._transfer_metrics.time.monotonic", side_effect=[10.0, 14.0]):
+            transfer.start()
+            transfer.start()
+            transfer.finish(100)
+
+        assert transfer.duration == 4.0
+        assert transfer.bytes_per_second == 25.0
+
+    def test_totals_and_callback(self) -> None:
+        callback = Mock()
+        metrics = TransferMetrics(callback=callback)
+        for i, (start, end) in enumerate([(0.0, 2.0), (1.0, 4.0)]):
+            transfer = FileTransfer(f"local_{i}", f"remote_{i}", UPLOAD)
+            transfer.start_time, transfer.end_time, transfer.bytes, transfer.retries = start, end, 200, i
+            metrics.record(transfer)
+
+        assert callback.call_count == 2
+        assert metrics.summary() == {
+            "file_count": 2,
+            "bytes": 400,
+            "duration": 4.0,
+            "retries": 1,
+            "bytes_per_second": 100.0,
+        }
+        assert metrics.files[1].as_dict()["remote_path"] == "remote_1"
+
+    def test_empty_metrics(self) -> None:
+        metrics = TransferMetrics()
+        assert metrics.file_count == metrics.total_bytes == metrics.duration == 0
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ml._operations.operation_orchestrator import DependencyResolutionError
+from azure.ml._workspace_dependent_operations import WorkspaceScope
+from azure.ml.aio._operations import CodeOperations, DatastoreOperations
+from azure.ml.aio._operations.operation_orchestrator import OperationOrchestrator
+
+
+def _run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+async def _not_found(*args, **kwargs) -> None:
+    raise ResourceNotFoundError("not found")
+
+
+@pytest.fixture
+def mock_datastore_operation(mock_workspace_scope: WorkspaceScope) -> DatastoreOperations:
+    yield DatastoreOperations(workspace_scope=mock_workspace_scope, service_client=Mock())
+
+
+@pytest.fixture
+def mock_code_operation(mock_workspace_scope: WorkspaceScope) -> CodeOperations:
+    yield CodeOperations(workspace_scope=mock_workspace_scope, service_client=Mock(), datastore_operations=Mock())
+
+
+@pytest.fixture
+def code_dir(tmpdir_factory) -> str:  # type: ignore
+    root = tmpdir_factory.mktemp("async_code_dir")
+    root.join("train.py").write("print('hello')")
+    return str(root)
+
+
+class TestAsyncDatastoreOperations:
+    def test_concurrent_show_gets_once(self, mock_datastore_operation: DatastoreOperations, randstr: str) -> None:
+        async def _get(*args, **kwargs) -> Mock:
+            await asyncio.sleep(0.01)
+            return Mock(name=randstr)
+
+        mock_datastore_operation._operation.get = Mock(side_effect=_get)
+
+        async def show_many() -> list:
+            return await asyncio.gather(*(mock_datastore_operation.show(randstr) for _ in range(5)))
+
+        assert len(_run(show_many())) == 5
+        mock_datastore_operation._operation.get.assert_called_once()
+
+    def test_delete_invalidates_cache(self, mock_datastore_operation: DatastoreOperations, randstr: str) -> None:
+        async def _completed(*args, **kwargs) -> Mock:
+            return Mock(name=randstr)
+
+        mock_datastore_operation._operation.get = Mock(side_effect=_completed)
+        mock_datastore_operation._operation.delete = Mock(side_effect=_completed)
+        _run(mock_datastore_operation.show(randstr))
+        _run(mock_datastore_operation.delete(randstr))
+        _run(mock_datastore_operation.show(randstr))
+        assert mock_datastore_operation._operation.get.call_count == 2
+
+
+class TestAsyncCodeOperations:
+    def test_get_or_create_reuses_registered_content(self, mock_code_operation: CodeOperations, code_dir: str) -> None:
+        registered = Mock()
+
+        async def _get(*args, **kwargs) -> Mock:
+            return registered
+
+        mock_code_operation._version_operation.get = Mock(side_effect=_get)
+        with patch("azure.ml.aio._operations.code_operations._upload_to_datastore") as mock_upload:
+            assert _run(mock_code_operation._get_or_create(code_dir)) is registered
+            assert _run(mock_code_operation._get_or_create(code_dir)) is registered
+        mock_upload.assert_not_called()
+        mock_code_operation._version_operation.get.assert_called_once()
+
+    def test_get_or_create_registers_new_content(self, mock_code_operation: CodeOperations, code_dir: str) -> None:
+        async def _upload(*args, **kwargs) -> tuple:
+            return "path", "datastore_id"
+
+        async def _create(*args, **kwargs) -> Mock:
+            return Mock()
+
+        mock_code_operation._version_operation.get = Mock(side_effect=_not_found)
+        mock_code_operation._version_operation.create_or_update = Mock(side_effect=_create)
+        with patch(
+            "azure.ml.aio._operations.code_operations._upload_to_datastore", side_effect=_upload
+        ) as mock_upload:
+            _run(mock_code_operation._get_or_create(code_dir))
+        mock_upload.assert_called_once()
+        mock_code_operation._version_operation.create_or_update.assert_called_once()
+
+
+class TestAsyncOperationOrchestrator:
+    def test_resolve_all_collects_every_failure(self, mock_workspace_scope: WorkspaceScope) -> None:
+        orchestrator = OperationOrchestrator(MagicMock(), mock_workspace_scope)
+
+        async def _fail() -> None:
+            raise Exception("failed")
+
+        with pytest.raises(DependencyResolutionError):
+            _run(orchestrator.resolve_all({"code": _fail, "environment": _fail}))
+
+    def test_resolve_all_runs_concurrently(self, mock_workspace_scope: WorkspaceScope) -> None:
+        orchestrator = OperationOrchestrator(MagicMock(), mock_workspace_scope)
+        started = []
+
+        async def _resolve(name: str) -> str:
+            started.append(name)
+            await asyncio.sleep(0.01)
+            # both resolutions have started before either of them finishes
+            assert len(started) == 2
+            return name
+
+        resolved = _run(orchestrator.resolve_all({"a": lambda: _resolve("a"), "b": lambda: _resolve("b")}))
+        assert resolved == {"a": "a", "b": "b"}
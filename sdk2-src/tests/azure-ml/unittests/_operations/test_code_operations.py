@@ -1,4 +1,5 @@
 import pytest
+from azure.core.exceptions import ResourceNotFoundError
 from pytest_mock import MockFixture
 from unittest.mock import Mock, patch
 from azure.ml._workspace_dependent_operations import WorkspaceScope
@@ -42,6 +43,13 @@ class TestCodeOperations:
         mock_code_operation._version_operation.create_or_update.assert_called_once()
         assert "version=1" in str(mock_code_operation._version_operation.create_or_update.call_args)
 
+    def test_create_applies_gitignore(self, mock_code_operation: CodeOperations, uuid_name: str, tmp_path) -> None:
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        with patch("azure.ml._operations.code_operations._upload_to_datastore", return_value=(None, None)) as upload:
+            mock_code_operation.create(name=uuid_name, directory=str(tmp_path))
+
+        assert upload.call_args[1]["ignore_file"].path == tmp_path / ".gitignore"
+
     def test_show(self, mock_code_operation: CodeOperations, randstr: str) -> None:
         mock_code_operation.show(name=f"{randstr}:1")
         mock_code_operation._version_operation.get.assert_called_once()
@@ -54,3 +62,47 @@ class TestCodeOperations:
     def test_version_not_int(self, mock_code_operation: CodeOperations, uuid_name: str, artifact_path: str) -> None:
         with pytest.raises(Exception):
             mock_code_operation.create(name=uuid_name, version="1.0", directory=artifact_path)
+
+    def test_get_or_create_registers_same_content_once(
+        self, mock_code_operation: CodeOperations, artifact_path: str
+    ) -> None:
+        mock_code_operation._version_operation.get.side_effect = ResourceNotFoundError("not found")
+        with patch("azure.ml._operations.code_operations._upload_to_datastore", return_value=(None, None)) as upload:
+            first = mock_code_operation._get_or_create(artifact_path)
+            assert mock_code_operation._get_or_create(artifact_path) is first
+            assert upload.call_count == 1
+            assert mock_code_operation._version_operation.create_or_update.call_count == 1
+
+            with open(artifact_path, "w") as f:
+                f.write("changed content")
+            mock_code_operation._get_or_create(artifact_path)
+            assert upload.call_count == 2
+            assert mock_code_operation._version_operation.create_or_update.call_count == 2
+
+    def test_get_or_create_reuses_registered_content(
+        self, mock_code_operation: CodeOperations, artifact_path: str
+    ) -> None:
+        with patch("azure.ml._operations.code_operations._upload_to_datastore") as upload:
+            registered = mock_code_operation._get_or_create(artifact_path)
+
+        assert registered is mock_code_operation._version_operation.get.return_value
+        assert upload.call_count == 0
+        assert mock_code_operation._version_operation.create_or_update.call_count == 0
+
+    def test_get_or_create_names_code_by_content(
+        self, mock_code_operation: CodeOperations, artifact_path: str, tmp_path
+    ) -> None:
+        copy = tmp_path / "artifact_file.txt"
+        copy.write_text("content")
+        renamed = tmp_path / "renamed_file.txt"
+        renamed.write_text("content")
+
+        names = []
+        for path in (artifact_path, copy, renamed):
+            mock_code_operation._get_or_create(path)
+            name = mock_code_operation._version_operation.get.call_args[1]["name"]
+            uuid.UUID(name)
+            names.append(name)
+
+        # the same file anywhere maps to the same code asset, another file name to another asset path
+        assert names[0] == names[1] != names[2]
@@ -73,3 +73,54 @@ class TestDatastoreOperations:
         mock_datastore_operation._operation.list.assert_called_once()
         assert "is_default=True" in str(mock_datastore_operation._operation.list.call_args)
         mock_datastore_operation._operation.list_secrets.assert_called_once()
+
+    def test_show_is_cached(self, mock_datastore_operation: DatastoreOperations, randstr: str) -> None:
+        first = mock_datastore_operation.show(randstr, include_secrets=True)
+        second = mock_datastore_operation.show(randstr, include_secrets=True)
+        mock_datastore_operation._operation.get.assert_called_once()
+        mock_datastore_operation._operation.list_secrets.assert_called_once()
+        assert first is not second
+
+        mock_datastore_operation.invalidate_cache(randstr)
+        mock_datastore_operation.show(randstr)
+        assert mock_datastore_operation._operation.get.call_count == 2
+
+    def test_get_default_is_cached(self, mock_datastore_operation: DatastoreOperations) -> None:
+        mock_datastore_operation._operation.list.return_value.next.return_value.name = "workspaceblobstore"
+        for _ in range(3):
+            mock_datastore_operation.get_default(include_secrets=True)
+        mock_datastore_operation.show("workspaceblobstore")
+
+        mock_datastore_operation._operation.list.assert_called_once()
+        mock_datastore_operation._operation.list_secrets.assert_called_once()
+        mock_datastore_operation._operation.get.assert_not_called()
+
+    def test_cache_dropped_on_attach(
+        self, mock_datastore_operation: DatastoreOperations, datastore_name: str
+    ) -> None:
+        mock_datastore_operation.show(datastore_name)
+        mock_datastore_operation.attach_azure_blob_storage(datastore_name, "container", "account")
+        mock_datastore_operation.show(datastore_name)
+        assert mock_datastore_operation._operation.get.call_count == 2
+
+    def test_cache_disabled(
+        self, mock_workspace_scope: WorkspaceScope, mock_aml_services: Mock, randstr: str, monkeypatch
+    ) -> None:  # type: ignore
+        monkeypatch.setenv("AZUREML_DATASTORE_CACHE_TTL_SECONDS", "0")
+        datastore_operation = DatastoreOperations(
+            workspace_scope=mock_workspace_scope, service_client=mock_aml_services
+        )
+        datastore_operation.show(randstr)
+        datastore_operation.show(randstr)
+        assert datastore_operation._operation.get.call_count == 2
+
+    def test_invalid_cache_ttl_falls_back_to_default(
+        self, mock_workspace_scope: WorkspaceScope, mock_aml_services: Mock, randstr: str, monkeypatch
+    ) -> None:  # type: ignore
+        monkeypatch.setenv("AZUREML_DATASTORE_CACHE_TTL_SECONDS", "5m")
+        datastore_operation = DatastoreOperations(
+            workspace_scope=mock_workspace_scope, service_client=mock_aml_services
+        )
+        datastore_operation.show(randstr)
+        datastore_operation.show(randstr)
+        assert datastore_operation._operation.get.call_count == 1
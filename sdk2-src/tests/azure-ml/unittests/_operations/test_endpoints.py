@@ -229,15 +229,45 @@ class TestEndpointsOperations:
             "azure.ml._operations.endpoint_operations.EndpointOperations._get_workspace_location", return_value="xxx"
         )
         mocker.patch(
-            "azure.ml._operations.endpoint_operations.OnlineEndpointArmGenerator.generate_online_endpoint_template",
+            "azure.ml._arm_deployments.OnlineEndpointArmGenerator.generate_online_endpoint_template",
             return_value=("xxx", []),
         )
-        mocker.patch(
-            "azure.ml._operations.endpoint_operations.ArmDeploymentExecutor.deploy_resource", return_value="xxx"
-        )
+        mocker.patch("azure.ml._arm_deployments.ArmDeploymentExecutor.deploy_resource", return_value="xxx")
         mock_endpoint_operations._credentials = Mock(spec_set=DefaultAzureCredential)
         mock_endpoint_operations.create(type=ONLINE_ENDPOINT_TYPE, name=randstr, file=create_yaml_happy_path)
 
+    def test_load_code_configuration_resolves_shared_dependencies_once(
+        self, mock_endpoint_operations: EndpointOperations, mocker: MockFixture
+    ) -> None:
+        get_code = mocker.patch(
+            "azure.ml._operations.endpoint_operations.OperationOrchestrator.get_code_asset_arm_id",
+            side_effect=lambda code_asset, register_asset: f"code_{code_asset.name}",
+        )
+        get_environment = mocker.patch(
+            "azure.ml._operations.endpoint_operations.OperationOrchestrator.get_environment_arm_id",
+            return_value="environment_id",
+        )
+        get_model = mocker.patch(
+            "azure.ml._operations.endpoint_operations.OperationOrchestrator.get_model_arm_id", return_value="model_id"
+        )
+        model = Mock()
+        deployments = {}
+        for name in ["blue", "green"]:
+            code = Mock()
+            code.name = name
+            deployments[name] = Mock(environment="azureml:env:1", model=model)
+            deployments[name].code_configuration.code = code
+        endpoint = Mock(deployments=deployments)
+
+        mock_endpoint_operations._load_code_configuration(endpoint)
+
+        assert get_code.call_count == 2
+        get_environment.assert_called_once()
+        get_model.assert_called_once()
+        assert deployments["green"].code_configuration.code == "code_green"
+        assert deployments["green"].environment == "environment_id"
+        assert deployments["blue"].model == "model_id"
+
     def test_online_get_deployment_logs(
         self,
         mock_endpoint_operations: EndpointOperations,
@@ -0,0 +1,73 @@
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from azure.ml._operations.code_operations import _code_asset_name
+from azure.ml._operations.operation_orchestrator import DependencyResolutionError, OperationOrchestrator
+from azure.ml._schema.code_asset import InternalCodeAsset
+from azure.ml._utils._asset_utils import get_object_hash
+from azure.ml._workspace_dependent_operations import WorkspaceScope
+
+
+@pytest.fixture
+def orchestrator(mock_workspace_scope: WorkspaceScope) -> OperationOrchestrator:
+    yield OperationOrchestrator(operation_container=MagicMock(), workspace_scope=mock_workspace_scope)
+
+
+class TestOperationOrchestrator:
+    def test_resolve_all_runs_resolvers_concurrently(self, orchestrator: OperationOrchestrator) -> None:
+        # each resolver waits for the other one, so they only finish if they run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        def resolver(value: str):  # type: ignore
+            def resolve() -> str:
+                barrier.wait()
+                return value
+
+            return resolve
+
+        resolved = orchestrator.resolve_all({"code": resolver("code_id"), "environment": resolver("env_id")})
+        assert resolved == {"code": "code_id", "environment": "env_id"}
+
+    def test_resolve_all_reraises_single_failure(self, orchestrator: OperationOrchestrator) -> None:
+        def fail() -> str:
+            raise ValueError("environment not found")
+
+        with pytest.raises(ValueError, match="environment not found"):
+            orchestrator.resolve_all({"code": lambda: "code_id", "environment": fail})
+
+    def test_resolve_all_aggregates_failures(self, orchestrator: OperationOrchestrator) -> None:
+        completed = []
+
+        def fail(message: str):  # type: ignore
+            def resolve() -> str:
+                raise Exception(message)
+
+            return resolve
+
+        resolvers = {
+            "code of deployment blue": fail("upload failed"),
+            "model of deployment blue": lambda: completed.append("model"),
+            "environment of deployment green": fail("registration failed"),
+        }
+        with pytest.raises(DependencyResolutionError) as e:
+            orchestrator.resolve_all(resolvers, max_workers=1)
+
+        assert sorted(e.value.errors) == ["code of deployment blue", "environment of deployment green"]
+        assert "code of deployment blue: upload failed" in str(e.value)
+        # a failure does not stop the other dependencies from being resolved
+        assert completed == ["model"]
+
+    def test_uploaded_code_is_named_by_content(self, orchestrator: OperationOrchestrator, tmp_path: Path) -> None:
+        (tmp_path / "train.py").write_text("print('train')")
+        code_asset = InternalCodeAsset(base_path=str(tmp_path), directory=".")
+        with patch(
+            "azure.ml._operations.operation_orchestrator._upload_to_datastore", return_value=("path", "datastore_id")
+        ) as upload:
+            orchestrator.get_code_asset_arm_id(code_asset, register_asset=False)
+
+        # the same name CodeOperations._get_or_create registers the same content under
+        asset_hash = upload.call_args[1]["asset_hash"]
+        assert asset_hash == get_object_hash(tmp_path)
+        assert code_asset.name == _code_asset_name(asset_hash, tmp_path, False)
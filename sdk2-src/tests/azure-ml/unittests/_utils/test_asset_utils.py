@@ -0,0 +1,55 @@
+import hashlib
+import pytest
+from pathlib import Path
+
+from azure.ml._artifacts.constants import HASH_INDEX_DISABLE_ENV_VAR
+from azure.ml._utils._asset_utils import get_object_hash
+
+
+def _legacy_md5(path: Path, hash=None) -> "hashlib._Hash":
+    # reference implementation of the original 1 KB chunked, single stream directory hash
+    hash = hash or hashlib.md5()
+    for child in sorted(path.iterdir(), key=lambda p: str(p).lower()):
+        hash.update(child.name.encode())
+        if child.is_file():
+            hash.update(child.read_bytes())
+        elif child.is_dir():
+            _legacy_md5(child, hash)
+    return hash
+
+
+@pytest.fixture(autouse=True)
+def disable_hash_index(monkeypatch) -> None:  # type: ignore
+    monkeypatch.setenv(HASH_INDEX_DISABLE_ENV_VAR, "true")
+
+
+@pytest.fixture
+def asset_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "asset"
+    (root / "Sub_dir" / "empty").mkdir(parents=True)
+    (root / "a.txt").write_text("a")
+    (root / "B.bin").write_bytes(bytes(range(256)) * 10000)
+    (root / "Sub_dir" / "c.txt").write_text("c")
+    return root
+
+
+class TestObjectHash:
+    def test_file_hash_is_content_md5(self, asset_dir: Path) -> None:
+        path = asset_dir / "B.bin"
+        assert get_object_hash(path) == hashlib.md5(path.read_bytes()).hexdigest()
+        assert get_object_hash(path, compatibility_mode=True) == hashlib.md5(path.read_bytes()).hexdigest()
+
+    def test_compatibility_mode_matches_legacy_digest(self, asset_dir: Path) -> None:
+        assert get_object_hash(asset_dir, compatibility_mode=True) == _legacy_md5(asset_dir).hexdigest()
+
+    def test_parallel_hash_is_deterministic(self, asset_dir: Path) -> None:
+        digests = {get_object_hash(asset_dir, max_workers=workers) for workers in (1, 2, 8)}
+        assert len(digests) == 1
+
+    def test_parallel_hash_tracks_content_and_names(self, asset_dir: Path) -> None:
+        original = get_object_hash(asset_dir)
+        (asset_dir / "Sub_dir" / "c.txt").write_text("changed")
+        changed_content = get_object_hash(asset_dir)
+        (asset_dir / "Sub_dir" / "c.txt").rename(asset_dir / "Sub_dir" / "d.txt")
+        renamed = get_object_hash(asset_dir)
+        assert len({original, changed_content, renamed}) == 3
@@ -0,0 +1,111 @@
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import CredentialUnavailableError
+
+from azure.ml._utils import _credential_utils
+from azure.ml._utils._credential_utils import (
+    HintedChainedTokenCredential,
+    get_credential_hint_path,
+    get_credential_order,
+)
+from azure.ml.constants import CREDENTIAL_HINT_DISABLE_ENV_VAR, CREDENTIAL_ORDER_ENV_VAR
+
+SCOPE = "https://management.azure.com/.default"
+NAMES = ["managed_identity", "azure_cli", "environment"]
+
+
+@pytest.fixture
+def credentials(monkeypatch) -> dict:  # type: ignore
+    mocks = {}
+    for name in NAMES:
+        mocks[name] = Mock(name=name)
+        mocks[name].get_token.side_effect = CredentialUnavailableError(message=f"{name} is unavailable")
+        monkeypatch.setitem(_credential_utils.CREDENTIAL_TYPES, name, Mock(return_value=mocks[name]))
+    return mocks
+
+
+@pytest.fixture
+def hint_path(tmp_path: Path) -> Path:
+    return tmp_path / "credential_hint"
+
+
+def _succeed(credential: Mock) -> None:
+    credential.get_token.side_effect = None
+    credential.get_token.return_value = AccessToken("token", int(time.time()) + 3600)
+
+
+class TestHintedChainedTokenCredential:
+    def test_winning_credential_is_remembered(self, credentials: dict, hint_path: Path) -> None:
+        _succeed(credentials["azure_cli"])
+        HintedChainedTokenCredential(NAMES, hint_path).get_token(SCOPE)
+
+        assert hint_path.read_text() == "azure_cli"
+        credentials["managed_identity"].get_token.reset_mock()
+        HintedChainedTokenCredential(NAMES, hint_path).get_token(SCOPE)
+        credentials["managed_identity"].get_token.assert_not_called()
+
+    def test_stale_hint_falls_back_to_chain(self, credentials: dict, hint_path: Path) -> None:
+        hint_path.write_text("environment")
+        credentials["environment"].get_token.side_effect = Exception("expired secret")
+        _succeed(credentials["azure_cli"])
+
+        assert HintedChainedTokenCredential(NAMES, hint_path).get_token(SCOPE).token == "token"
+        assert hint_path.read_text() == "azure_cli"
+
+    def test_failure_reports_every_credential(self, credentials: dict, hint_path: Path) -> None:
+        with pytest.raises(ClientAuthenticationError) as e:
+            HintedChainedTokenCredential(NAMES, hint_path).get_token(SCOPE)
+        assert all(f"{name} is unavailable" in e.value.message for name in NAMES)
+        assert not hint_path.exists()
+
+    def test_authentication_error_stops_chain(self, credentials: dict) -> None:
+        credentials["managed_identity"].get_token.side_effect = Exception("forbidden")
+        with pytest.raises(ClientAuthenticationError):
+            HintedChainedTokenCredential(NAMES).get_token(SCOPE)
+        credentials["azure_cli"].get_token.assert_not_called()
+
+    def test_unknown_hint_is_ignored(self, credentials: dict, hint_path: Path) -> None:
+        hint_path.write_text("interactive_browser")
+        _succeed(credentials["environment"])
+        HintedChainedTokenCredential(NAMES, hint_path).get_token(SCOPE)
+        credentials["managed_identity"].get_token.assert_called_once()
+
+    def test_interactive_credential_is_never_remembered(  # type: ignore
+        self, credentials: dict, hint_path: Path, monkeypatch
+    ) -> None:
+        names = NAMES + ["interactive_browser"]
+        browser = Mock(name="interactive_browser")
+        monkeypatch.setitem(_credential_utils.CREDENTIAL_TYPES, "interactive_browser", Mock(return_value=browser))
+        _succeed(browser)
+        HintedChainedTokenCredential(names, hint_path).get_token(SCOPE)
+        assert not hint_path.exists()
+
+        # once another credential is available, it is tried before the browser prompt
+        hint_path.write_text("interactive_browser")
+        _succeed(credentials["azure_cli"])
+        browser.get_token.reset_mock()
+        HintedChainedTokenCredential(names, hint_path).get_token(SCOPE)
+        browser.get_token.assert_not_called()
+        assert hint_path.read_text() == "azure_cli"
+
+
+class TestCredentialOrder:
+    def test_explicit_order(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setenv(CREDENTIAL_ORDER_ENV_VAR, "Azure_CLI, environment")
+        assert get_credential_order() == ["azure_cli", "environment"]
+        assert get_credential_hint_path() is None
+
+    def test_unknown_credential_in_order(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setenv(CREDENTIAL_ORDER_ENV_VAR, "azure_cli,device_code")
+        with pytest.raises(Exception, match="Unsupported credential order"):
+            get_credential_order()
+
+    def test_hint_can_be_disabled(self, monkeypatch) -> None:  # type: ignore
+        monkeypatch.delenv(CREDENTIAL_ORDER_ENV_VAR, raising=False)
+        monkeypatch.setenv(CREDENTIAL_HINT_DISABLE_ENV_VAR, "true")
+        assert get_credential_hint_path() is None
@@ -0,0 +1,134 @@
+import os
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from azure.ml._artifacts.constants import HASH_INDEX_DISABLE_ENV_VAR, HASH_INDEX_PATH_ENV_VAR
+from azure.ml._utils._asset_utils import _get_file_hash, get_object_hash
+from azure.ml._utils._hash_index import HashIndex, get_directory_signature
+
+
+def _age(path: Path) -> None:
+    # files written within the racy window are never cached
+    past = time.time() - 60
+    for p in [path, *path.rglob("*")]:
+        os.utime(str(p), (past, past))
+
+
+@pytest.fixture
+def hash_index_path(tmp_path: Path, monkeypatch) -> Path:  # type: ignore
+    index_path = tmp_path / "index" / "hash_index.json"
+    monkeypatch.setenv(HASH_INDEX_PATH_ENV_VAR, str(index_path))
+    monkeypatch.delenv(HASH_INDEX_DISABLE_ENV_VAR, raising=False)
+    return index_path
+
+
+@pytest.fixture
+def asset_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "asset"
+    (root / "sub_dir").mkdir(parents=True)
+    (root / "a.txt").write_text("a")
+    (root / "sub_dir" / "b.txt").write_text("b")
+    _age(root)
+    return root
+
+
+class TestHashIndex:
+    def test_unchanged_directory_is_not_rehashed(self, hash_index_path: Path, asset_dir: Path) -> None:
+        first_hash = get_object_hash(asset_dir)
+        assert hash_index_path.is_file()
+
+        with patch("azure.ml._utils._asset_utils._get_dir_tree_hash") as mock_dir_hash:
+            assert get_object_hash(asset_dir) == first_hash
+            mock_dir_hash.assert_not_called()
+
+    def test_changed_file_invalidates_entry(self, hash_index_path: Path, asset_dir: Path) -> None:
+        first_hash = get_object_hash(asset_dir)
+        (asset_dir / "sub_dir" / "b.txt").write_text("changed")
+        _age(asset_dir)
+        assert get_object_hash(asset_dir) != first_hash
+
+    def test_ignore_file_change_invalidates_entry(self, hash_index_path: Path, asset_dir: Path) -> None:
+        (asset_dir / ".amlignore").write_text("a.txt\n")
+        _age(asset_dir)
+        first_hash = get_object_hash(asset_dir)
+        (asset_dir / "a.txt").write_text("ignored change")
+        _age(asset_dir)
+        assert get_object_hash(asset_dir) == first_hash
+
+        (asset_dir / ".amlignore").write_text("")
+        _age(asset_dir)
+        assert get_object_hash(asset_dir) != first_hash
+
+    def test_recently_modified_files_are_not_cached(self, hash_index_path: Path, asset_dir: Path) -> None:
+        (asset_dir / "a.txt").write_text("fresh")
+        assert get_directory_signature(asset_dir) is None
+        get_object_hash(asset_dir)
+        index = HashIndex(hash_index_path)
+        assert not any(key.startswith("md5-tree:") for key in index._entries)
+        assert not any(path.endswith("a.txt") for path in index._files)
+        assert any(path.endswith("b.txt") for path in index._files)
+
+    def test_only_changed_files_are_rehashed(self, hash_index_path: Path, tmp_path: Path) -> None:
+        root = tmp_path / "many_files"
+        root.mkdir()
+        for i in range(10):
+            (root / f"file_{i}.txt").write_text(str(i))
+        _age(root)
+        first_hash = get_object_hash(root)
+        index = HashIndex(hash_index_path)
+        # one entry for the tree, the file digests are kept apart
+        assert len(index) == 1
+        assert len(index._files) == 10
+
+        (root / "file_0.txt").write_text("changed")
+        _age(root / "file_0.txt")
+        with patch("azure.ml._utils._asset_utils._get_file_hash", wraps=_get_file_hash) as mock_file_hash:
+            assert get_object_hash(root) != first_hash
+            assert mock_file_hash.call_count == 1
+
+    def test_file_table_grows_with_tree(self, tmp_path: Path) -> None:
+        index = HashIndex(tmp_path / "index.json", max_file_entries=4)
+        signatures = {f"/tree/file_{i}": "signature" for i in range(10)}
+        assert index.get_file_digests(signatures) == {}
+        index.put_file_digests({path: (signature, "digest") for path, signature in signatures.items()})
+        index.save()
+
+        reloaded = HashIndex(tmp_path / "index.json", max_file_entries=4)
+        assert len(reloaded._files) == 10
+        # smaller batches do not raise the cap, so the oldest files are evicted
+        reloaded.put_file_digests({"/other/file": ("signature", "digest")})
+        reloaded.save()
+        files = HashIndex(tmp_path / "index.json")._files
+        assert len(files) == 4
+        assert "/other/file" in files
+
+    def test_disabled_index(self, hash_index_path: Path, asset_dir: Path, monkeypatch) -> None:  # type: ignore
+        monkeypatch.setenv(HASH_INDEX_DISABLE_ENV_VAR, "true")
+        get_object_hash(asset_dir)
+        assert not hash_index_path.exists()
+
+    def test_eviction_keeps_most_recent_entries(self, tmp_path: Path) -> None:
+        index = HashIndex(tmp_path / "index.json", max_entries=3)
+        for i in range(5):
+            index.put(f"key_{i}", "signature", f"digest_{i}")
+        index.get("key_0", "signature")
+        # entries are only evicted when the index is saved
+        assert len(index) == 5
+        index.save()
+
+        reloaded = HashIndex(tmp_path / "index.json", max_entries=3)
+        assert len(reloaded) == 3
+        assert reloaded.get("key_1", "signature") is None
+        assert reloaded.get("key_0", "signature") == "digest_0"
+        assert reloaded.get("key_4", "signature") == "digest_4"
+
+    def test_corrupt_index_file_is_ignored(self, tmp_path: Path) -> None:
+        index_path = tmp_path / "index.json"
+        index_path.write_text("{not json")
+        index = HashIndex(index_path)
+        assert len(index) == 0
+        index.put("key", "signature", "digest")
+        index.save()
+        assert HashIndex(index_path).get("key", "signature") == "digest"
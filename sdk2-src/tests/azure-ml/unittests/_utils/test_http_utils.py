@@ -0,0 +1,63 @@
+import time
+from unittest.mock import Mock
+
+from azure.core.credentials import AccessToken
+
+from azure.ml._utils._http_utils import CachedTokenCredential, get_shared_transport
+from azure.ml._utils._storage_utils import StorageClientPool
+from azure.ml._utils.utils import create_session_with_retry
+from azure.ml.constants import TOKEN_REFRESH_MARGIN_SECONDS
+
+SCOPE = "https://management.azure.com/.default"
+
+
+class TestCachedTokenCredential:
+    def test_token_is_acquired_once(self) -> None:
+        credential = Mock()
+        credential.get_token.return_value = AccessToken("token", int(time.time()) + 3600)
+        cached = CachedTokenCredential(credential)
+
+        assert cached.get_token(SCOPE).token == "token"
+        assert cached.get_token(SCOPE).token == "token"
+        credential.get_token.assert_called_once_with(SCOPE)
+
+    def test_token_is_refreshed_before_expiry(self) -> None:
+        credential = Mock()
+        credential.get_token.return_value = AccessToken("token", int(time.time()) + TOKEN_REFRESH_MARGIN_SECONDS - 1)
+        cached = CachedTokenCredential(credential)
+
+        cached.get_token(SCOPE)
+        cached.get_token(SCOPE)
+        assert credential.get_token.call_count == 2
+
+    def test_scopes_are_cached_separately(self) -> None:
+        credential = Mock()
+        credential.get_token.return_value = AccessToken("token", int(time.time()) + 3600)
+        cached = CachedTokenCredential(credential)
+
+        cached.get_token(SCOPE)
+        cached.get_token("https://storage.azure.com/.default")
+        assert credential.get_token.call_count == 2
+
+    def test_claims_are_passed_through(self) -> None:
+        credential = Mock()
+        credential.get_token.return_value = AccessToken("token", int(time.time()) + 3600)
+        cached = CachedTokenCredential(credential)
+
+        cached.get_token(SCOPE)
+        cached.get_token(SCOPE, claims="claims")
+        credential.get_token.assert_called_with(SCOPE, claims="claims")
+        assert credential.get_token.call_count == 2
+
+
+class TestSharedTransport:
+    def test_storage_clients_use_shared_transport(self) -> None:
+        assert StorageClientPool().transport is get_shared_transport()
+
+    def test_sessions_with_retry_share_connection_pool(self) -> None:
+        first = create_session_with_retry()
+        second = create_session_with_retry()
+
+        assert first is not second
+        assert first.get_adapter("https://host") is second.get_adapter("https://host")
+        assert create_session_with_retry(retry=5).get_adapter("https://host") is not first.get_adapter("https://host")
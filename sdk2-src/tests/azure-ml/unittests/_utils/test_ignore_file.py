@@ -0,0 +1,94 @@
+import logging
+import pytest
+from pathlib import Path
+
+from azure.ml._artifacts.constants import HASH_INDEX_DISABLE_ENV_VAR
+from azure.ml._utils._asset_utils import get_directory_upload_paths, get_object_hash
+from azure.ml._utils._ignore_file import IgnoreFile, get_ignore_file
+
+
+@pytest.fixture(autouse=True)
+def disable_hash_index(monkeypatch) -> None:  # type: ignore
+    monkeypatch.setenv(HASH_INDEX_DISABLE_ENV_VAR, "true")
+
+
+@pytest.fixture
+def code_dir(tmp_path: Path) -> Path:
+    root = tmp_path / "src"
+    for sub_dir in [".git", "__pycache__", "pkg/__pycache__", "data", "venv/lib"]:
+        (root / sub_dir).mkdir(parents=True)
+    for path in [
+        "train.py",
+        "pkg/model.py",
+        "pkg/__pycache__/model.cpython-37.pyc",
+        "__pycache__/train.cpython-37.pyc",
+        ".git/HEAD",
+        "data/dump.csv",
+        "data/keep.csv",
+        "venv/lib/site.py",
+        "debug.log",
+    ]:
+        (root / path).write_text(path)
+    (root / ".amlignore").write_text(
+        "# local state\n.git/\n__pycache__/\n*.log\n/data/*\n!/data/keep.csv\nvenv\n"
+    )
+    return root
+
+
+class TestIgnoreFile:
+    def test_patterns(self, tmp_path: Path) -> None:
+        (tmp_path / ".gitignore").write_text("*.pyc\n/build/\ndocs/**/*.md\n!important.pyc\n\\#notes\n")
+        ignore_file = IgnoreFile(tmp_path / ".gitignore")
+
+        assert ignore_file.is_excluded("a/b/c.pyc", is_dir=False)
+        assert not ignore_file.is_excluded("important.pyc", is_dir=False)
+        assert ignore_file.is_excluded("build", is_dir=True)
+        assert not ignore_file.is_excluded("build", is_dir=False)
+        assert not ignore_file.is_excluded("src/build", is_dir=True)
+        assert ignore_file.is_excluded("docs/a/b/readme.md", is_dir=False)
+        assert ignore_file.is_excluded("#notes", is_dir=False)
+        assert ignore_file.is_file_excluded(tmp_path / "build" / "out.txt")
+
+    def test_amlignore_takes_precedence(self, tmp_path: Path) -> None:
+        (tmp_path / ".gitignore").write_text("*.txt\n")
+        assert get_ignore_file(tmp_path, use_gitignore=True).path.name == ".gitignore"
+        (tmp_path / ".amlignore").write_text("*.csv\n")
+        assert get_ignore_file(tmp_path, use_gitignore=True).path.name == ".amlignore"
+        assert not get_ignore_file(tmp_path / "missing", use_gitignore=True).exists()
+
+    def test_gitignore_only_applies_when_asked(self, tmp_path: Path) -> None:
+        (tmp_path / ".gitignore").write_text("*.pt\n")
+        (tmp_path / "model.pt").write_text("weights")
+
+        assert not get_ignore_file(tmp_path).exists()
+        assert [remote for _, remote in get_directory_upload_paths(tmp_path, "")] == [".gitignore", "model.pt"]
+        code_ignore_file = get_ignore_file(tmp_path, use_gitignore=True)
+        assert [remote for _, remote in get_directory_upload_paths(tmp_path, "", code_ignore_file)] == [".gitignore"]
+        assert get_object_hash(tmp_path) != get_object_hash(tmp_path, ignore_file=code_ignore_file)
+
+    def test_upload_paths_skip_excluded_files(self, code_dir: Path) -> None:
+        uploaded = [remote for _, remote in get_directory_upload_paths(code_dir, "prefix/")]
+        assert uploaded == [
+            "prefix/.amlignore",
+            "prefix/data/keep.csv",
+            "prefix/pkg/model.py",
+            "prefix/train.py",
+        ]
+
+    def test_excluded_files_are_logged(self, code_dir: Path, caplog) -> None:  # type: ignore
+        with caplog.at_level(logging.INFO, logger="azure.ml._utils._asset_utils"):
+            get_directory_upload_paths(code_dir, "prefix/")
+        assert "Excluded 6 files and directories" in caplog.text
+        assert ".git/" in caplog.text and "data/dump.csv" in caplog.text
+
+    @pytest.mark.parametrize("compatibility_mode", [False, True])
+    def test_hash_ignores_excluded_files(self, code_dir: Path, compatibility_mode: bool) -> None:
+        original = get_object_hash(code_dir, compatibility_mode=compatibility_mode)
+
+        (code_dir / "venv" / "lib" / "site.py").write_text("changed")
+        (code_dir / "data" / "dump.csv").write_text("changed")
+        (code_dir / "new.log").write_text("new")
+        assert get_object_hash(code_dir, compatibility_mode=compatibility_mode) == original
+
+        (code_dir / "data" / "keep.csv").write_text("changed")
+        assert get_object_hash(code_dir, compatibility_mode=compatibility_mode) != original
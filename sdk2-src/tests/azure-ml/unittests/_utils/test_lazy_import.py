@@ -0,0 +1,32 @@
+import sys
+import types
+
+import pytest
+
+from azure.ml._utils._lazy_import import lazy_exports
+
+
+@pytest.fixture
+def lazy_package(monkeypatch) -> types.ModuleType:  # type: ignore
+    package = types.ModuleType("lazy_package")
+    package.__path__ = []
+    submodule = types.ModuleType("lazy_package.submodule")
+    submodule.Exported = object()
+    monkeypatch.setitem(sys.modules, "lazy_package", package)
+    monkeypatch.setitem(sys.modules, "lazy_package.submodule", submodule)
+    lazy_exports("lazy_package", {"Exported": ".submodule"})
+    return package
+
+
+class TestLazyExports:
+    def test_export_is_loaded_on_first_access(self, lazy_package: types.ModuleType) -> None:
+        assert "Exported" not in vars(lazy_package)
+        assert lazy_package.Exported is sys.modules["lazy_package.submodule"].Exported
+        assert "Exported" in vars(lazy_package)
+
+    def test_unknown_name_raises_attribute_error(self, lazy_package: types.ModuleType) -> None:
+        with pytest.raises(AttributeError):
+            lazy_package.Missing
+
+    def test_exports_are_listed(self, lazy_package: types.ModuleType) -> None:
+        assert "Exported" in dir(lazy_package)
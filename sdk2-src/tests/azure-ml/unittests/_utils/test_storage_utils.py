@@ -0,0 +1,47 @@
+import pytest
+
+from azure.ml._artifacts._default_storage_helper import DefaultStorageClient
+from azure.ml._artifacts._fileshare_storage_helper import FileStorageClient
+from azure.ml._utils import _storage_utils
+from azure.ml._utils._storage_utils import StorageClientPool, get_storage_client
+
+ACCOUNT_URL = "https://account.blob.core.windows.net"
+
+
+@pytest.fixture
+def storage_client_pool(monkeypatch) -> StorageClientPool:  # type: ignore
+    pool = StorageClientPool(max_size=2)
+    monkeypatch.setattr(_storage_utils, "_storage_client_pool", pool)
+    monkeypatch.setattr(FileStorageClient, "exists", lambda self, asset_id: True)
+    return pool
+
+
+class TestStorageClientPool:
+    def test_repeated_clients_share_sdk_client(self, storage_client_pool: StorageClientPool) -> None:
+        first = get_storage_client("key", "container", "account", "AzureBlob")
+        second = get_storage_client("key", "container", "account", "AzureBlob")
+
+        assert isinstance(first, DefaultStorageClient) and first is not second
+        assert first.service_client is second.service_client
+        assert len(storage_client_pool) == 1
+
+    def test_clients_share_transport(self, storage_client_pool: StorageClientPool) -> None:
+        blob_client = storage_client_pool.get_blob_service_client(ACCOUNT_URL, "container", "key")
+        other_container = storage_client_pool.get_blob_service_client(ACCOUNT_URL, "other", "key")
+        other_key = storage_client_pool.get_blob_service_client(ACCOUNT_URL, "container", "other key")
+
+        assert len({id(blob_client), id(other_container), id(other_key)}) == 3
+        assert blob_client._pipeline._transport is other_container._pipeline._transport
+        assert blob_client._pipeline._transport is storage_client_pool.transport
+
+    def test_pool_is_bounded(self, storage_client_pool: StorageClientPool) -> None:
+        first = storage_client_pool.get_blob_service_client(ACCOUNT_URL, "container_0", "key")
+        for i in range(1, 4):
+            storage_client_pool.get_blob_service_client(ACCOUNT_URL, f"container_{i}", "key")
+
+        assert len(storage_client_pool) == 2
+        assert storage_client_pool.get_blob_service_client(ACCOUNT_URL, "container_0", "key") is not first
+
+    def test_credentials_are_not_kept_in_keys(self, storage_client_pool: StorageClientPool) -> None:
+        storage_client_pool.get_share_directory_client("https://account.file.core.windows.net", "share", "secret key")
+        assert not any("secret key" in key for key in storage_client_pool._clients)
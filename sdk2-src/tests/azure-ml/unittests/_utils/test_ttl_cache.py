@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from azure.ml._utils._ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_entries_expire(self) -> None:
+        cache = TTLCache(ttl_seconds=10)
+        with patch("azure.ml._utils._ttl_cache.time.monotonic", return_value=100.0):
+            cache.put("key", "value")
+            assert cache.get("key") == "value"
+        with patch("azure.ml._utils._ttl_cache.time.monotonic", return_value=110.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = TTLCache(ttl_seconds=0)
+        loader = Mock(return_value="value")
+        cache.get_or_load("key", loader)
+        cache.get_or_load("key", loader)
+        assert loader.call_count == 2
+
+    def test_concurrent_loads_call_loader_once(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+
+        def loader() -> str:
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        threads = [threading.Thread(target=cache.get_or_load, args=("key", loader)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+        assert not cache._key_locks
+
+    def test_key_locks_are_released_after_loading(self) -> None:
+        cache = TTLCache(ttl_seconds=0)
+        for i in range(100):
+            cache.get_or_load(i, lambda: "value")
+        with pytest.raises(ValueError):
+            cache.get_or_load("failing", Mock(side_effect=ValueError()))
+        assert not cache._key_locks
+
+    def test_concurrent_async_loads_await_one_load(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+
+        async def loader() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def lookups() -> list:
+            return await asyncio.gather(*(cache.get_or_load_async("key", loader) for _ in range(8)))
+
+        assert asyncio.get_event_loop().run_until_complete(lookups()) == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_failed_async_load_is_not_cached(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        outcomes = [Exception("load failed"), "value"]
+
+        async def loader() -> str:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        loop = asyncio.get_event_loop()
+        with pytest.raises(Exception, match="load failed"):
+            loop.run_until_complete(cache.get_or_load_async("key", loader))
+        assert loop.run_until_complete(cache.get_or_load_async("key", loader)) == "value"
+
+    def test_invalidate(self) -> None:
+        cache = TTLCache(ttl_seconds=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        assert cache.get("a") is None and cache.get("b") == 2
+        cache.invalidate()
+        assert len(cache) == 0
@@ -1,4 +1,9 @@
+import pytest
+from unittest.mock import Mock
+
 from azure.ml import MLClient
+from azure.ml.constants import OperationTypes
+from azure.ml._workspace_dependent_operations import OperationsContainer
 
 
 class TestMachineLearningClient:
@@ -33,3 +38,31 @@ class TestMachineLearningClient:
         default_ws = "default"
         mock_machinelearning_client.default_workspace_name = default_ws
         assert default_ws == mock_machinelearning_client.default_workspace_name
+
+    def test_operation_groups_are_built_on_first_access(self, mock_machinelearning_client: MLClient) -> None:
+        built_operations = mock_machinelearning_client._operation_container.all_operations
+        assert len(built_operations) == 0
+
+        jobs = mock_machinelearning_client.jobs
+        assert mock_machinelearning_client.jobs is jobs
+        assert list(built_operations) == [OperationTypes.JOBS]
+
+    def test_operation_group_builds_its_dependencies(self, mock_machinelearning_client: MLClient) -> None:
+        code = mock_machinelearning_client.code
+        assert code._datastore_operation is mock_machinelearning_client.datastores
+
+
+class TestOperationsContainer:
+    def test_added_operation_replaces_lazy_one(self) -> None:
+        container = OperationsContainer()
+        factory = Mock()
+        container.add_lazy(OperationTypes.JOBS, factory)
+        operation = Mock()
+        container.add(OperationTypes.JOBS, operation)
+
+        assert container.all_operations[OperationTypes.JOBS] is operation
+        factory.assert_not_called()
+
+    def test_unknown_operation_raises(self) -> None:
+        with pytest.raises(KeyError):
+            OperationsContainer().all_operations[OperationTypes.JOBS]